@@ -0,0 +1,6 @@
+"""Benchmarks for the ATDF selector and SDK.
+
+Each benchmark module is runnable with ``python -m benchmarks.<name>`` and
+writes JSON results that can be compared across commits with
+``python -m benchmarks.compare``.
+"""
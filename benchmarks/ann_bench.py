@@ -0,0 +1,204 @@
+"""Recall-versus-latency benchmark for the vector store ANN indexes.
+
+Builds clustered, L2-normalized synthetic embeddings, computes the exact top-k
+with NumPy as ground truth and then measures, for every requested index type
+and every ``nprobes``/``refine_factor`` combination, recall@k and query latency
+through ``LanceDBBackend``. The exhaustive ``NumpyBackend`` and an unindexed
+LanceDB table are reported as baselines, so the output shows what an index
+buys at each catalog size. Without LanceDB installed only the NumPy baseline
+runs.
+
+Example::
+
+    python -m benchmarks.ann_bench --sizes 10000,100000 --dim 384 \\
+        --index-types IVF_PQ,IVF_HNSW_SQ --nprobes 10,20,50 \\
+        --refine-factors 0,10 --output benchmarks/results/ann.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from sdk.vector_search.backends import (
+    AnnIndexConfig,
+    LanceDBBackend,
+    NumpyBackend,
+    filter_columns,
+)
+
+from .common import int_list, latency_summary, run_metadata, write_results
+
+try:  # pragma: no cover - depends on the optional vector dependencies
+    import lancedb
+except ImportError:  # pragma: no cover
+    lancedb = None  # type: ignore
+
+
+def clustered_vectors(count: int, dim: int, *, clusters: int, seed: int) -> np.ndarray:
+    """Unit vectors drawn around ``clusters`` random centers."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    assignment = rng.integers(0, clusters, size=count)
+    noise = rng.standard_normal((count, dim)).astype(np.float32)
+    vectors = centers[assignment] + 0.35 * noise
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> List[List[int]]:
+    scores = queries @ vectors.T
+    best = np.argpartition(-scores, min(k, vectors.shape[0]) - 1, axis=1)[:, :k]
+    return [
+        row[np.argsort(-scores[index, row], kind="stable")].tolist()
+        for index, row in enumerate(best)
+    ]
+
+
+def records_for(vectors: np.ndarray) -> List[Dict[str, object]]:
+    return [
+        {
+            "id": str(position),
+            "name": str(position),
+            "description": "",
+            "parameters": "[]",
+            "vector": vector,
+            "raw_data": str(position),
+            "parent_id": str(position),
+            "field": "tool",
+            **filter_columns({}),
+        }
+        for position, vector in enumerate(vectors)
+    ]
+
+
+def measure(
+    backend, queries: np.ndarray, truth: Sequence[Sequence[int]], k: int, **params
+) -> Dict[str, object]:
+    durations: List[float] = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        rows = backend.search(query, k, **params)
+        durations.append(time.perf_counter() - start)
+        found = {int(row["payload"]) for row in rows}
+        hits += len(found.intersection(expected))
+    return {
+        f"recall_at_{k}": round(hits / (len(truth) * k), 4) if truth else 0.0,
+        "latency": latency_summary(durations),
+    }
+
+
+def bench_size(
+    size: int, args: argparse.Namespace, workdir: Path
+) -> List[Dict[str, object]]:
+    # Queries are held-out samples drawn around the same centers as the catalog
+    sample = clustered_vectors(
+        size + args.queries, args.dim, clusters=args.clusters, seed=args.seed
+    )
+    vectors, queries = sample[:size], sample[size:]
+    truth = exact_top_k(vectors, queries, args.k)
+    records = records_for(vectors)
+    base = {"benchmark": "ann", "size": size, "k": args.k, "precision": "float32"}
+    results: List[Dict[str, object]] = []
+
+    exact = NumpyBackend(str(workdir / f"numpy_{size}"), "bench")
+    exact.connect()
+    exact.create(records)
+    exact.flush()
+    entry = dict(base, mode="exact", backend="numpy", config="flat")
+    entry.update(measure(exact, queries, truth, args.k))
+    results.append(entry)
+
+    if lancedb is None:
+        return results
+
+    backend = LanceDBBackend(
+        str(workdir / f"lancedb_{size}"), "bench", connector=lancedb.connect
+    )
+    backend.connect()
+    backend.create(records)
+    entry = dict(base, mode="exact", backend="lancedb", config="flat")
+    entry.update(measure(backend, queries, truth, args.k))
+    results.append(entry)
+
+    for index_type in args.index_types.split(","):
+        backend.ann = AnnIndexConfig(
+            index_type=index_type, min_rows=0, background=False
+        )
+        start = time.perf_counter()
+        backend.build_index(wait=True)
+        build_seconds = round(time.perf_counter() - start, 4)
+        for nprobes in int_list(args.nprobes):
+            for refine_factor in int_list(args.refine_factors):
+                entry = dict(
+                    base,
+                    mode=backend.ann.index_type,
+                    backend="lancedb",
+                    config=f"nprobes={nprobes},refine_factor={refine_factor}",
+                    build_seconds=build_seconds,
+                )
+                entry.update(
+                    measure(
+                        backend,
+                        queries,
+                        truth,
+                        args.k,
+                        nprobes=nprobes,
+                        refine_factor=refine_factor or None,
+                    )
+                )
+                results.append(entry)
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000", help="Comma-separated row counts.")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension.")
+    parser.add_argument("--clusters", type=int, default=64, help="Synthetic topics.")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per size.")
+    parser.add_argument("--k", type=int, default=10, help="Cut-off for recall.")
+    parser.add_argument(
+        "--index-types",
+        default="IVF_PQ,IVF_HNSW_SQ",
+        help="Comma-separated LanceDB index types to build.",
+    )
+    parser.add_argument("--nprobes", default="10,20,50", help="nprobes values to try.")
+    parser.add_argument(
+        "--refine-factors", default="0,10", help="refine_factor values (0 = off)."
+    )
+    parser.add_argument("--seed", type=int, default=13, help="Generator seed.")
+    parser.add_argument("--workdir", type=str, help="Keep tables in this directory.")
+    parser.add_argument("--output", type=str, help="Write JSON results to this file.")
+    return parser
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    parameters = {key: value for key, value in vars(args).items() if key != "output"}
+    parameters["lancedb"] = lancedb is not None
+    payload: Dict[str, object] = {"meta": run_metadata("ann", parameters)}
+    results: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir or tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for size in int_list(args.sizes):
+            results.extend(bench_size(size, args, workdir))
+    payload["results"] = results
+    return payload
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    payload = run(args)
+    print(write_results(Path(args.output) if args.output else None, payload))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""Shared helpers for benchmark timing and JSON result files."""
+
+from __future__ import annotations
+
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (``pct`` in ``[0, 100]``) of ``samples``."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_summary(samples_seconds: Sequence[float]) -> Dict[str, float]:
+    """Summarize latencies (in seconds) as milliseconds."""
+    if not samples_seconds:
+        return {"samples": 0}
+    to_ms = 1000.0
+    return {
+        "samples": len(samples_seconds),
+        "mean_ms": round(sum(samples_seconds) / len(samples_seconds) * to_ms, 4),
+        "p50_ms": round(percentile(samples_seconds, 50) * to_ms, 4),
+        "p95_ms": round(percentile(samples_seconds, 95) * to_ms, 4),
+        "p99_ms": round(percentile(samples_seconds, 99) * to_ms, 4),
+        "max_ms": round(max(samples_seconds) * to_ms, 4),
+    }
+
+
+def int_list(value: str) -> List[int]:
+    """Parse a comma-separated option such as ``--sizes 1000,10000``."""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def time_calls(func: Callable[[], object], repeat: int) -> List[float]:
+    """Call ``func`` ``repeat`` times and return each duration in seconds."""
+    durations: List[float] = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def git_revision() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def run_metadata(benchmark: str, parameters: Dict[str, object]) -> Dict[str, object]:
+    """Describe the environment so results can be compared across commits."""
+    return {
+        "benchmark": benchmark,
+        "commit": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": parameters,
+    }
+
+
+def write_results(path: Optional[Path], payload: Dict[str, object]) -> str:
+    """Serialize ``payload`` as JSON, writing it to ``path`` when provided."""
+    text = json.dumps(payload, indent=2, ensure_ascii=False)
+    if path is not None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text + "\n", encoding="utf-8")
+    return text
+
+
+__all__ = [
+    "PROJECT_ROOT",
+    "percentile",
+    "latency_summary",
+    "int_list",
+    "time_calls",
+    "git_revision",
+    "run_metadata",
+    "write_results",
+]
@@ -0,0 +1,103 @@
+"""Compare two benchmark JSON files and flag regressions.
+
+Entries in ``results`` are matched on their identifying keys (``size``,
+``mode``, ``backend``...). Metrics ending in ``_ms``, ``_seconds`` or ``_mb``
+are treated as lower-is-better; ``*_per_second``, ``mrr``, ``ndcg*`` and
+``recall*`` as higher-is-better.
+
+Example::
+
+    python -m benchmarks.compare old.json new.json --threshold 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+IDENTITY_KEYS = ("benchmark", "size", "mode", "backend", "precision", "config")
+HIGHER_IS_BETTER = ("_per_second", "mrr", "ndcg", "recall", "hit_rate")
+LOWER_IS_BETTER = ("_ms", "_seconds", "_mb", "_bytes")
+
+
+def _identity(entry: Dict[str, object]) -> Tuple:
+    return tuple((key, entry[key]) for key in IDENTITY_KEYS if key in entry)
+
+
+def _flatten(value: object, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(value, dict):
+        for key, nested in value.items():
+            yield from _flatten(nested, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, float(value)
+
+
+def _direction(metric: str) -> int:
+    leaf = metric.rsplit(".", 1)[-1]
+    if any(token in leaf for token in HIGHER_IS_BETTER):
+        return 1
+    if leaf.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(
+    baseline: Dict[str, object], candidate: Dict[str, object], threshold: float
+) -> List[Dict[str, object]]:
+    """Return per-metric deltas; ``regression`` marks changes beyond ``threshold`` %."""
+    base_entries = {_identity(entry): entry for entry in baseline.get("results", [])}
+    rows: List[Dict[str, object]] = []
+    for entry in candidate.get("results", []):
+        identity = _identity(entry)
+        reference = base_entries.get(identity)
+        if reference is None:
+            continue
+        reference_metrics = dict(_flatten(reference))
+        for metric, value in _flatten(entry):
+            direction = _direction(metric)
+            old = reference_metrics.get(metric)
+            if direction == 0 or old is None or old == 0:
+                continue
+            change = (value - old) / abs(old) * 100.0
+            rows.append(
+                {
+                    "entry": dict(identity),
+                    "metric": metric,
+                    "baseline": old,
+                    "candidate": value,
+                    "change_pct": round(change, 2),
+                    "regression": change * direction < -threshold,
+                }
+            )
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark result files.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Percentage change tolerated before flagging a regression.",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    candidate = json.loads(args.candidate.read_text(encoding="utf-8"))
+    rows = compare(baseline, candidate, args.threshold)
+    for row in rows:
+        marker = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{json.dumps(row['entry']):<40} {row['metric']:<40} "
+            f"{row['baseline']:>12.4f} -> {row['candidate']:>12.4f} "
+            f"({row['change_pct']:+.2f}%) {marker}"
+        )
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
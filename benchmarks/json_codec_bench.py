@@ -0,0 +1,177 @@
+"""Throughput of the JSON codecs behind ``sdk.core.json_codec``.
+
+For every installed codec (``orjson`` and the stdlib ``json``) measures the
+hot paths that go through it: encoding descriptors (``raw_data`` and the
+catalog columns), decoding them, ``CatalogStorage.fetch_records`` over a
+SQLite catalog, and rendering a ``/catalog``-sized HTTP response. Each result
+records whether the codec round-trips to the same values as the stdlib, and
+the run checks that ``canonical_dumps`` (the ``version_hash`` input) is
+byte-identical to ``json.dumps(sort_keys=True, ensure_ascii=False)``.
+
+Example::
+
+    python -m benchmarks.json_codec_bench --sizes 1000,10000 \\
+        --output benchmarks/results/json_codec.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sdk.core import json_codec
+from selector.storage import CatalogStorage
+
+from .common import (
+    int_list,
+    latency_summary,
+    run_metadata,
+    time_calls,
+    write_results,
+)
+from .synthetic import iter_descriptors
+
+OPERATIONS = ("encode", "decode", "fetch_records", "response")
+
+
+def populate(storage: CatalogStorage, descriptors: Sequence[Dict[str, Any]]) -> None:
+    server_id = storage.register_server("bench://json-codec", "bench")
+    for descriptor in descriptors:
+        metadata = descriptor.get("metadata") or {}
+        storage.upsert_tool(
+            server_id,
+            descriptor["tool_id"],
+            descriptor,
+            description=descriptor["description"],
+            when_to_use=descriptor.get("when_to_use"),
+            languages=["en", *(descriptor.get("localization") or {})],
+            tags=list(metadata.get("tags", [])),
+        )
+
+
+def decoded(operation: str, output: Any) -> Any:
+    """Output of ``operation`` as plain values, decoded with the stdlib."""
+    if operation == "encode":
+        return [json.loads(text) for text in output]
+    if operation == "response":
+        return json.loads(output)
+    return output
+
+
+def canonical_matches(descriptors: Sequence[Dict[str, Any]]) -> bool:
+    return all(
+        json_codec.canonical_dumps(descriptor)
+        == json.dumps(descriptor, sort_keys=True, ensure_ascii=False)
+        for descriptor in descriptors
+    )
+
+
+def bench_size(
+    size: int, args: argparse.Namespace, workdir: Path
+) -> List[Dict[str, object]]:
+    descriptors: List[Dict[str, Any]] = list(iter_descriptors(size, seed=args.seed))
+    texts = [json.dumps(descriptor) for descriptor in descriptors]
+    response = {"count": size, "tools": descriptors}
+    storage = CatalogStorage(workdir / f"json_codec_{size}.db")
+    try:
+        populate(storage, descriptors)
+        records = storage.fetch_records()
+
+        operations: Dict[str, Callable[[json_codec.JsonCodec], Any]] = {
+            "encode": lambda codec: [codec.dumps(item) for item in descriptors],
+            "decode": lambda codec: [codec.loads(text) for text in texts],
+            "fetch_records": lambda codec: storage.fetch_records(),
+            "response": lambda codec: codec.dumps_bytes(response),
+        }
+        expected = {
+            "encode": descriptors,
+            "decode": descriptors,
+            "fetch_records": records,
+            "response": response,
+        }
+
+        results: List[Dict[str, object]] = []
+        for name in args.codecs.split(","):
+            codec = json_codec.make_codec(name)
+            previous = json_codec.set_codec(codec)
+            try:
+                for operation in args.operations.split(","):
+                    run_once = operations[operation]
+                    durations = time_calls(lambda: run_once(codec), args.repeat)
+                    best = min(durations)
+                    results.append(
+                        {
+                            "benchmark": "json_codec",
+                            "size": size,
+                            "codec": name,
+                            "operation": operation,
+                            "latency": latency_summary(durations),
+                            "items_per_second": (
+                                round(size / best, 1) if best else 0.0
+                            ),
+                            "identical": decoded(operation, run_once(codec))
+                            == expected[operation],
+                        }
+                    )
+            finally:
+                json_codec.set_codec(previous)
+        results.append(
+            {
+                "benchmark": "json_codec",
+                "size": size,
+                "operation": "canonical",
+                "identical": canonical_matches(descriptors),
+            }
+        )
+        return results
+    finally:
+        storage.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000", help="Comma-separated tool counts.")
+    parser.add_argument(
+        "--codecs",
+        default=",".join(json_codec.available_codecs()),
+        help="Comma-separated codecs (default: every installed codec).",
+    )
+    parser.add_argument(
+        "--operations",
+        default=",".join(OPERATIONS),
+        help=f"Comma-separated operations ({', '.join(OPERATIONS)}).",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case.")
+    parser.add_argument("--seed", type=int, default=13, help="Generator seed.")
+    parser.add_argument(
+        "--workdir",
+        type=str,
+        help="Directory for the SQLite catalogs (defaults to a temporary directory).",
+    )
+    parser.add_argument("--output", type=str, help="Write JSON results to this file.")
+    return parser
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    parameters = {key: value for key, value in vars(args).items() if key != "output"}
+    payload: Dict[str, object] = {"meta": run_metadata("json_codec", parameters)}
+    results: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory(dir=args.workdir) as tmp:
+        for size in int_list(args.sizes):
+            results.extend(bench_size(size, args, Path(tmp)))
+    payload["results"] = results
+    return payload
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    payload = run(args)
+    print(write_results(Path(args.output) if args.output else None, payload))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+"""Memory, latency and recall of quantized vector storage versus float32.
+
+Indexes the same clustered, L2-normalized synthetic embeddings used by
+``ann_bench`` into ``NumpyBackend`` once per precision (float32, float16 and
+int8 with per-row scales) and rescoring factor, then reports the bytes scanned
+per query, the bytes on disk, recall@k against the exact float32 top-k and
+query latency. ``rescore_factor=0`` measures the quantized scan alone; a
+positive factor re-ranks ``k * factor`` candidates with the float32 vectors.
+
+Example::
+
+    python -m benchmarks.quantization_bench --sizes 100000,400000 --dim 384 \\
+        --precisions float32,float16,int8 --rescore-factors 0,4 \\
+        --output benchmarks/results/quantization.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sdk.vector_search.backends import NumpyBackend
+
+from .ann_bench import clustered_vectors, exact_top_k, measure, records_for
+from .common import int_list, run_metadata, write_results
+
+
+def disk_bytes(directory: Path, table: str) -> int:
+    return sum(path.stat().st_size for path in directory.glob(f"{table}.vectors*.npy"))
+
+
+def bench_size(
+    size: int, args: argparse.Namespace, workdir: Path
+) -> List[Dict[str, object]]:
+    sample = clustered_vectors(
+        size + args.queries, args.dim, clusters=args.clusters, seed=args.seed
+    )
+    vectors, queries = sample[:size], sample[size:]
+    truth = exact_top_k(vectors, queries, args.k)
+    records = records_for(vectors)
+    results: List[Dict[str, object]] = []
+
+    for precision in args.precisions.split(","):
+        factors = [0] if precision == "float32" else int_list(args.rescore_factors)
+        for factor in factors:
+            directory = workdir / f"{precision}_{factor}_{size}"
+            backend = NumpyBackend(
+                str(directory), "bench", precision=precision, rescore_factor=factor
+            )
+            backend.connect()
+            start = time.perf_counter()
+            backend.create(records)
+            backend.flush()
+            entry: Dict[str, object] = {
+                "benchmark": "quantization",
+                "size": size,
+                "k": args.k,
+                "mode": "exact" if precision == "float32" else "quantized",
+                "backend": "numpy",
+                "precision": precision,
+                "config": f"rescore_factor={factor}",
+                "build_seconds": round(time.perf_counter() - start, 4),
+                "memory_bytes": backend.memory_bytes(),
+                "disk_bytes": disk_bytes(directory, "bench"),
+            }
+            entry.update(measure(backend, queries, truth, args.k))
+            results.append(entry)
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100000", help="Comma-separated row counts.")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension.")
+    parser.add_argument("--clusters", type=int, default=64, help="Synthetic topics.")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per size.")
+    parser.add_argument("--k", type=int, default=10, help="Cut-off for recall.")
+    parser.add_argument(
+        "--precisions",
+        default="float32,float16,int8",
+        help="Comma-separated storage precisions.",
+    )
+    parser.add_argument(
+        "--rescore-factors",
+        default="0,4",
+        help="Candidates re-ranked in float32, as a multiple of k (0 = off).",
+    )
+    parser.add_argument("--seed", type=int, default=13, help="Generator seed.")
+    parser.add_argument("--workdir", type=str, help="Keep tables in this directory.")
+    parser.add_argument("--output", type=str, help="Write JSON results to this file.")
+    return parser
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    parameters = {key: value for key, value in vars(args).items() if key != "output"}
+    payload: Dict[str, object] = {"meta": run_metadata("quantization", parameters)}
+    results: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir or tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for size in int_list(args.sizes):
+            results.extend(bench_size(size, args, workdir))
+    payload["results"] = results
+    return payload
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    payload = run(args)
+    print(write_results(Path(args.output) if args.output else None, payload))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,309 @@
+"""Relevance and latency regression harness for selector ranking modes.
+
+Runs a labeled query set against a catalog and reports, for every available
+ranking mode, MRR, nDCG@k and recall@k together with latency percentiles, so a
+speed optimization can be shown not to regress relevance. Everything runs
+offline against local descriptors.
+
+Labels are JSONL, one query per line::
+
+    {"query": "drill a hole in the wall", "language": "en",
+     "expected": ["hole_maker_v1"]}
+
+``expected`` lists relevant ``tool_id`` values (any source);
+``expected_prefix`` matches tool identifiers by prefix instead, and
+``sources`` restricts the query to the given catalog sources.
+
+Example::
+
+    python -m benchmarks.relevance --catalog schema/examples \\
+        --labels benchmarks/data/selector_queries.jsonl --k 5
+
+    # Synthetic catalog with generated labels
+    python -m benchmarks.relevance --synthetic 10000 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from selector.catalog import ATDFToolRecord, ToolCatalog
+from selector.ranker import RANKING_MODES, ToolRanker
+
+from .common import PROJECT_ROOT, latency_summary, run_metadata, write_results
+from .synthetic import LANGUAGES, sample_queries, write_catalog
+
+DEFAULT_CATALOG = PROJECT_ROOT / "schema" / "examples"
+DEFAULT_LABELS = PROJECT_ROOT / "benchmarks" / "data" / "selector_queries.jsonl"
+
+
+@dataclass
+class LabeledQuery:
+    """A query together with the tools considered relevant for it."""
+
+    query: str
+    expected: List[str] = field(default_factory=list)
+    expected_prefix: Optional[str] = None
+    language: Optional[str] = None
+    sources: Optional[List[str]] = None
+
+    def is_relevant(self, tool_id: str) -> bool:
+        if tool_id in self.expected:
+            return True
+        return bool(self.expected_prefix) and tool_id.startswith(self.expected_prefix)
+
+
+RankFunction = Callable[[LabeledQuery, int], List[str]]
+
+
+def load_labels(path: Path) -> List[LabeledQuery]:
+    """Parse a JSONL label file, skipping blank lines."""
+    labels: List[LabeledQuery] = []
+    with Path(path).open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            expected = item.get("expected") or []
+            if isinstance(expected, str):
+                expected = [expected]
+            if not item.get("query") or not (expected or item.get("expected_prefix")):
+                raise ValueError(
+                    f"{path}:{line_number}: 'query' and 'expected' are required"
+                )
+            labels.append(
+                LabeledQuery(
+                    query=item["query"],
+                    expected=list(expected),
+                    expected_prefix=item.get("expected_prefix"),
+                    language=item.get("language"),
+                    sources=item.get("sources"),
+                )
+            )
+    return labels
+
+
+def synthetic_labels(
+    count: int, *, languages: Sequence[str], seed: int
+) -> List[LabeledQuery]:
+    """Label generated queries with the action prefix of their tool ids."""
+    return [
+        LabeledQuery(
+            query=item["query"] or "",
+            expected_prefix=f"{item['expected_action']}_",
+            language=item.get("language"),
+        )
+        for item in sample_queries(count, languages=languages, seed=seed)
+    ]
+
+
+def build_modes(catalog: ToolCatalog) -> Dict[str, RankFunction]:
+    """Return the ranking modes available for ``catalog`` keyed by name."""
+    ranker = ToolRanker(catalog)
+
+    def make(mode: str) -> RankFunction:
+        def rank(label: LabeledQuery, k: int) -> List[str]:
+            return [
+                ranked.record.tool_id
+                for ranked in ranker.rank(
+                    label.query,
+                    top_n=k,
+                    preferred_language=label.language,
+                    sources=label.sources,
+                    mode=mode,
+                )
+            ]
+
+        return rank
+
+    return {mode: make(mode) for mode in RANKING_MODES}
+
+
+def reciprocal_rank(label: LabeledQuery, ranked: Sequence[str]) -> float:
+    for position, tool_id in enumerate(ranked, start=1):
+        if label.is_relevant(tool_id):
+            return 1.0 / position
+    return 0.0
+
+
+def ndcg(label: LabeledQuery, ranked: Sequence[str], k: int, relevant: int) -> float:
+    """Binary-gain nDCG@k; ``relevant`` is the number of relevant catalog tools."""
+    if relevant <= 0:
+        return 0.0
+    dcg = sum(
+        1.0 / math.log2(position + 1)
+        for position, tool_id in enumerate(ranked[:k], start=1)
+        if label.is_relevant(tool_id)
+    )
+    ideal = sum(
+        1.0 / math.log2(position + 1) for position in range(1, min(k, relevant) + 1)
+    )
+    return dcg / ideal
+
+
+def count_relevant(label: LabeledQuery, records: Sequence[ATDFToolRecord]) -> int:
+    sources = {value.lower() for value in label.sources} if label.sources else None
+    return sum(
+        1
+        for record in records
+        if label.is_relevant(record.tool_id)
+        and (sources is None or record.source.lower() in sources)
+    )
+
+
+def evaluate_mode(
+    rank: RankFunction,
+    labels: Sequence[LabeledQuery],
+    relevant_counts: Sequence[int],
+    *,
+    k: int,
+    repeat: int,
+) -> Dict[str, object]:
+    """Score one mode; relevance uses the first pass, latency every pass."""
+    durations: List[float] = []
+    rr_total = ndcg_total = recall_total = 0.0
+    misses: List[str] = []
+    for pass_index in range(max(1, repeat)):
+        for label, relevant in zip(labels, relevant_counts):
+            start = time.perf_counter()
+            ranked = rank(label, k)
+            durations.append(time.perf_counter() - start)
+            if pass_index:
+                continue
+            rr = reciprocal_rank(label, ranked)
+            rr_total += rr
+            ndcg_total += ndcg(label, ranked, k, relevant)
+            if relevant:
+                hits = sum(1 for tool_id in ranked[:k] if label.is_relevant(tool_id))
+                recall_total += hits / min(k, relevant)
+            if rr == 0.0:
+                misses.append(label.query)
+
+    total = len(labels) or 1
+    return {
+        "queries": len(labels),
+        "mrr": round(rr_total / total, 4),
+        f"ndcg_at_{k}": round(ndcg_total / total, 4),
+        f"recall_at_{k}": round(recall_total / total, 4),
+        "latency": latency_summary(durations),
+        "misses": misses,
+    }
+
+
+def evaluate(
+    catalog: ToolCatalog,
+    labels: Sequence[LabeledQuery],
+    *,
+    k: int = 5,
+    repeat: int = 3,
+    modes: Optional[Sequence[str]] = None,
+) -> List[Dict[str, object]]:
+    """Evaluate every requested mode (default: all available) on ``labels``."""
+    available = build_modes(catalog)
+    selected = list(modes) if modes else list(available)
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        raise ValueError(
+            f"Unknown ranking mode(s): {', '.join(unknown)}; "
+            f"available: {', '.join(available)}"
+        )
+
+    index = catalog.snapshot()
+    relevant_counts = [count_relevant(label, index.records) for label in labels]
+    results: List[Dict[str, object]] = []
+    for name in selected:
+        rank = available[name]
+        if labels:
+            rank(labels[0], k)  # warm up lazily built structures
+        entry: Dict[str, object] = {"mode": name, "size": len(index), "k": k}
+        entry.update(evaluate_mode(rank, labels, relevant_counts, k=k, repeat=repeat))
+        results.append(entry)
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--catalog",
+        type=Path,
+        default=DEFAULT_CATALOG,
+        help="Directory of ATDF descriptors to rank (ignored with --synthetic).",
+    )
+    parser.add_argument(
+        "--labels",
+        type=Path,
+        default=DEFAULT_LABELS,
+        help="JSONL file of labeled queries (ignored with --synthetic).",
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="Generate a synthetic catalog of this size with generated labels.",
+    )
+    parser.add_argument(
+        "--queries", type=int, default=100, help="Generated queries (--synthetic)."
+    )
+    parser.add_argument(
+        "--languages",
+        default=",".join(LANGUAGES),
+        help="Comma-separated languages for the synthetic catalog and queries.",
+    )
+    parser.add_argument("--k", type=int, default=5, help="Cut-off for nDCG/recall.")
+    parser.add_argument("--repeat", type=int, default=3, help="Latency passes.")
+    parser.add_argument(
+        "--modes",
+        type=str,
+        help="Comma-separated ranking modes (defaults to every available mode).",
+    )
+    parser.add_argument("--seed", type=int, default=13, help="Generator seed.")
+    parser.add_argument("--output", type=str, help="Write JSON results to this file.")
+    return parser
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    modes = [value for value in (args.modes or "").split(",") if value.strip()]
+    parameters = {
+        key: str(value) if isinstance(value, Path) else value
+        for key, value in vars(args).items()
+        if key not in {"output"}
+    }
+    payload: Dict[str, object] = {"meta": run_metadata("relevance", parameters)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = ToolCatalog()
+        if args.synthetic:
+            languages = args.languages.split(",")
+            server_dirs = write_catalog(
+                Path(tmp), args.synthetic, languages=languages, seed=args.seed
+            )
+            for server_dir in server_dirs:
+                catalog.load_directory(
+                    server_dir, server_label=f"bench://{server_dir.name}"
+                )
+            labels = synthetic_labels(args.queries, languages=languages, seed=args.seed)
+        else:
+            catalog.load_directory(args.catalog)
+            labels = load_labels(args.labels)
+        payload["results"] = evaluate(
+            catalog, labels, k=args.k, repeat=args.repeat, modes=modes or None
+        )
+    return payload
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    payload = run(args)
+    print(write_results(Path(args.output) if args.output else None, payload))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,273 @@
+"""Load-test and ranking benchmark for the ATDF tool selector.
+
+Generates synthetic catalogs of increasing size, then measures
+``ToolCatalog.load_directory`` time and memory, ``ToolRanker.rank`` latency
+percentiles (unfiltered and filtered by source) and ``/recommend`` throughput
+through an in-process ASGI client. Results are written as JSON so runs from
+different commits can be compared with ``python -m benchmarks.compare``.
+
+Example::
+
+    python -m benchmarks.selector_bench --sizes 1000,10000 \\
+        --output benchmarks/results/selector.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from selector.catalog import ToolCatalog
+from selector.ranker import ToolRanker
+from selector.storage import CatalogStorage
+
+from .common import int_list, latency_summary, run_metadata, write_results
+from .synthetic import LANGUAGES, sample_queries, seed_feedback, write_catalog
+
+MEGABYTE = 1024.0 * 1024.0
+
+
+def load_catalog(
+    server_dirs: Sequence[Path], storage: Optional[CatalogStorage]
+) -> ToolCatalog:
+    catalog = ToolCatalog(storage=storage)
+    for server_dir in server_dirs:
+        catalog.load_directory(server_dir, server_label=f"bench://{server_dir.name}")
+    return catalog
+
+
+def measure_memory(server_dirs: Sequence[Path]) -> Dict[str, float]:
+    """Trace Python allocations of an in-memory load plus snapshot build."""
+    tracemalloc.start()
+    try:
+        catalog = load_catalog(server_dirs, storage=None)
+        catalog.snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "retained_mb": round(current / MEGABYTE, 3),
+        "peak_mb": round(peak / MEGABYTE, 3),
+    }
+
+
+def measure_ranking(
+    ranker: ToolRanker,
+    queries: Sequence[Dict[str, Optional[str]]],
+    *,
+    repeat: int,
+    top_n: int,
+    sources: Optional[List[str]] = None,
+) -> Dict[str, float]:
+    durations: List[float] = []
+    for _ in range(max(1, repeat)):
+        for item in queries:
+            start = time.perf_counter()
+            ranker.rank(
+                item["query"] or "",
+                top_n=top_n,
+                preferred_language=item.get("language"),
+                sources=sources,
+            )
+            durations.append(time.perf_counter() - start)
+    return latency_summary(durations)
+
+
+def measure_endpoint(
+    catalog: ToolCatalog,
+    queries: Sequence[Dict[str, Optional[str]]],
+    *,
+    requests: int,
+    concurrency: int,
+    top_n: int,
+) -> Dict[str, float]:
+    """Drive ``POST /recommend`` through an in-process ASGI transport."""
+    import httpx
+
+    from selector import api
+
+    previous = (api._catalog, api._ranker)
+    api._catalog, api._ranker = catalog, ToolRanker(catalog)
+    payloads = [
+        {"query": item["query"], "language": item.get("language"), "top_n": top_n}
+        for item in queries
+    ]
+
+    async def run() -> Dict[str, float]:
+        durations: List[float] = []
+        failures = 0
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+
+            async def call(index: int) -> None:
+                nonlocal failures
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.request(
+                        "POST", "/recommend", json=payloads[index % len(payloads)]
+                    )
+                    durations.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        failures += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(call(index) for index in range(requests)))
+            elapsed = time.perf_counter() - started
+
+        summary = latency_summary(durations)
+        summary["failures"] = failures
+        summary["requests_per_second"] = (
+            round(requests / elapsed, 2) if elapsed else 0.0
+        )
+        return summary
+
+    try:
+        return asyncio.run(run())
+    finally:
+        api._catalog, api._ranker = previous
+
+
+def bench_size(size: int, args: argparse.Namespace, workdir: Path) -> Dict[str, object]:
+    languages = args.languages.split(",")
+    server_dirs = write_catalog(
+        workdir / f"catalog_{size}",
+        size,
+        servers=args.servers,
+        languages=languages,
+        seed=args.seed,
+    )
+
+    storage = None
+    if not args.no_storage:
+        storage = CatalogStorage(workdir / f"selector_{size}.db")
+
+    start = time.perf_counter()
+    catalog = load_catalog(server_dirs, storage)
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = catalog.snapshot()
+    snapshot_seconds = time.perf_counter() - start
+
+    feedback_events = 0
+    if storage:
+        feedback_events = seed_feedback(
+            storage,
+            [(record.source, record.tool_id) for record in index.records],
+            seed=args.seed,
+        )
+
+    queries = sample_queries(args.queries, languages=languages, seed=args.seed)
+    ranker = ToolRanker(catalog)
+    ranker.rank("warm up", top_n=args.top_n)
+
+    result: Dict[str, object] = {
+        "size": size,
+        "tools_loaded": len(index),
+        "feedback_events": feedback_events,
+        "load_seconds": round(load_seconds, 4),
+        "tools_per_second": (
+            round(len(index) / load_seconds, 2) if load_seconds else 0.0
+        ),
+        "snapshot_seconds": round(snapshot_seconds, 4),
+        "rank": measure_ranking(ranker, queries, repeat=args.repeat, top_n=args.top_n),
+        "rank_filtered": measure_ranking(
+            ranker,
+            queries,
+            repeat=args.repeat,
+            top_n=args.top_n,
+            sources=[index.records[0].source] if len(index) else None,
+        ),
+    }
+    if not args.skip_memory:
+        result["memory"] = measure_memory(server_dirs)
+    if args.requests > 0:
+        result["endpoint"] = measure_endpoint(
+            catalog,
+            queries,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            top_n=args.top_n,
+        )
+    if storage:
+        storage.close()
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000",
+        help="Comma-separated catalog sizes to generate (e.g. 1000,10000,100000).",
+    )
+    parser.add_argument(
+        "--languages",
+        default=",".join(LANGUAGES),
+        help="Comma-separated localization languages used by the generator.",
+    )
+    parser.add_argument("--servers", type=int, default=4, help="Synthetic servers.")
+    parser.add_argument("--queries", type=int, default=50, help="Distinct queries.")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over queries.")
+    parser.add_argument("--top-n", type=int, default=5, help="Results per query.")
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=200,
+        help="Requests sent to /recommend per size (0 disables the endpoint test).",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Concurrent /recommend requests."
+    )
+    parser.add_argument("--seed", type=int, default=13, help="Generator seed.")
+    parser.add_argument(
+        "--no-storage",
+        action="store_true",
+        help="Benchmark the in-memory catalog instead of the SQLite-backed one.",
+    )
+    parser.add_argument(
+        "--skip-memory",
+        action="store_true",
+        help="Skip the traced-allocation pass (halves the load cost).",
+    )
+    parser.add_argument(
+        "--workdir",
+        type=str,
+        help="Directory for generated catalogs (defaults to a temporary directory).",
+    )
+    parser.add_argument("--output", type=str, help="Write JSON results to this file.")
+    return parser
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    sizes = int_list(args.sizes)
+    parameters = {
+        key: value for key, value in vars(args).items() if key not in {"output"}
+    }
+    payload: Dict[str, object] = {
+        "meta": run_metadata("selector", parameters),
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory(dir=args.workdir) as tmp:
+        for size in sizes:
+            payload["results"].append(bench_size(size, args, Path(tmp)))
+    return payload
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    payload = run(args)
+    print(write_results(Path(args.output) if args.output else None, payload))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,483 @@
+"""Synthetic ATDF catalogs for load and ranking benchmarks.
+
+Descriptors follow the shape of ``schema/examples``: a v1 core (``tool_id``,
+``description``, ``when_to_use``, ``how_to_use``) and, for a share of the tools,
+v2 ``metadata`` and ``localization`` blocks. Texts come from a small
+multilingual phrasebook so that queries in any supported language have
+plausible matches.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+LANGUAGES = ("en", "es", "pt", "fr", "de")
+
+
+@dataclass(frozen=True)
+class Action:
+    """Reusable tool capability with localized texts."""
+
+    slug: str
+    category: str
+    tags: Sequence[str]
+    description: Dict[str, str]
+    when_to_use: Dict[str, str]
+    inputs: Sequence[str]
+
+
+ACTIONS: Sequence[Action] = (
+    Action(
+        "book_flight",
+        "travel",
+        ("travel", "flights", "booking"),
+        {
+            "en": "Books a flight between two airports",
+            "es": "Reserva un vuelo entre dos aeropuertos",
+            "pt": "Reserva um voo entre dois aeroportos",
+            "fr": "Réserve un vol entre deux aéroports",
+            "de": "Bucht einen Flug zwischen zwei Flughäfen",
+        },
+        {
+            "en": "Use when the user needs to book a plane ticket.",
+            "es": "Usar cuando el usuario necesita reservar un billete de avión.",
+            "pt": "Use quando o usuário precisa reservar uma passagem aérea.",
+            "fr": "Utiliser quand l'utilisateur doit réserver un billet d'avion.",
+            "de": "Verwenden, wenn der Nutzer ein Flugticket buchen muss.",
+        },
+        ("origin", "destination", "departure_date"),
+    ),
+    Action(
+        "reserve_hotel",
+        "travel",
+        ("travel", "hotels", "booking"),
+        {
+            "en": "Reserves a hotel room in a city",
+            "es": "Reserva una habitación de hotel en una ciudad",
+            "pt": "Reserva um quarto de hotel em uma cidade",
+            "fr": "Réserve une chambre d'hôtel dans une ville",
+            "de": "Reserviert ein Hotelzimmer in einer Stadt",
+        },
+        {
+            "en": "Use when the user wants to stay at a hotel.",
+            "es": "Usar cuando el usuario quiere alojarse en un hotel.",
+            "pt": "Use quando o usuário quer se hospedar em um hotel.",
+            "fr": "Utiliser quand l'utilisateur veut séjourner à l'hôtel.",
+            "de": "Verwenden, wenn der Nutzer in einem Hotel übernachten möchte.",
+        },
+        ("city", "check_in", "check_out"),
+    ),
+    Action(
+        "send_email",
+        "communication",
+        ("communication", "email", "messaging"),
+        {
+            "en": "Sends an email message to a recipient",
+            "es": "Envía un correo electrónico a un destinatario",
+            "pt": "Envia um e-mail para um destinatário",
+            "fr": "Envoie un courriel à un destinataire",
+            "de": "Sendet eine E-Mail an einen Empfänger",
+        },
+        {
+            "en": "Use when you need to email someone.",
+            "es": "Usar cuando necesites enviar un correo a alguien.",
+            "pt": "Use quando precisar enviar um e-mail a alguém.",
+            "fr": "Utiliser quand vous devez écrire un courriel à quelqu'un.",
+            "de": "Verwenden, wenn Sie jemandem eine E-Mail schreiben müssen.",
+        },
+        ("to", "subject", "body"),
+    ),
+    Action(
+        "translate_text",
+        "language",
+        ("language", "translation", "text"),
+        {
+            "en": "Translates text between different languages",
+            "es": "Traduce texto entre diferentes idiomas",
+            "pt": "Traduz texto entre diferentes idiomas",
+            "fr": "Traduit du texte entre différentes langues",
+            "de": "Übersetzt Text zwischen verschiedenen Sprachen",
+        },
+        {
+            "en": "Use when you need to translate text to another language.",
+            "es": "Usar cuando necesites traducir un texto a otro idioma.",
+            "pt": "Use quando precisar traduzir um texto para outro idioma.",
+            "fr": "Utiliser quand vous devez traduire un texte dans une autre langue.",
+            "de": (
+                "Verwenden, wenn Sie einen Text "
+                "in eine andere Sprache übersetzen müssen."
+            ),
+        },
+        ("source_text", "source_language", "target_language"),
+    ),
+    Action(
+        "drill_hole",
+        "construction",
+        ("construction", "drilling", "tool"),
+        {
+            "en": "Creates holes in various surfaces",
+            "es": "Crea agujeros en diversas superficies",
+            "pt": "Cria furos em várias superfícies",
+            "fr": "Perce des trous dans diverses surfaces",
+            "de": "Bohrt Löcher in verschiedene Oberflächen",
+        },
+        {
+            "en": "Use when you need to make a hole in a wall, wood or metal.",
+            "es": (
+                "Usar cuando necesites hacer un agujero "
+                "en una pared, madera o metal."
+            ),
+            "pt": "Use quando precisar fazer um furo em uma parede, madeira ou metal.",
+            "fr": "Utiliser pour percer un mur, du bois ou du métal.",
+            "de": "Verwenden, um ein Loch in Wand, Holz oder Metall zu bohren.",
+        },
+        ("diameter", "surface_type", "depth"),
+    ),
+    Action(
+        "paint_surface",
+        "construction",
+        ("construction", "painting", "decoration"),
+        {
+            "en": "Paints a surface with the selected color",
+            "es": "Pinta una superficie con el color seleccionado",
+            "pt": "Pinta uma superfície com a cor selecionada",
+            "fr": "Peint une surface avec la couleur choisie",
+            "de": "Streicht eine Oberfläche in der gewählten Farbe",
+        },
+        {
+            "en": "Use when a wall or object must be painted.",
+            "es": "Usar cuando hay que pintar una pared u objeto.",
+            "pt": "Use quando for preciso pintar uma parede ou objeto.",
+            "fr": "Utiliser quand un mur ou un objet doit être peint.",
+            "de": "Verwenden, wenn eine Wand oder ein Objekt gestrichen werden muss.",
+        },
+        ("color", "surface_type", "coats"),
+    ),
+    Action(
+        "get_weather",
+        "information",
+        ("weather", "forecast", "information"),
+        {
+            "en": "Returns the weather forecast for a location",
+            "es": "Devuelve el pronóstico del tiempo para una ubicación",
+            "pt": "Retorna a previsão do tempo para um local",
+            "fr": "Renvoie les prévisions météo d'un lieu",
+            "de": "Liefert die Wettervorhersage für einen Ort",
+        },
+        {
+            "en": "Use when the user asks about the weather.",
+            "es": "Usar cuando el usuario pregunta por el clima.",
+            "pt": "Use quando o usuário pergunta sobre o clima.",
+            "fr": "Utiliser quand l'utilisateur demande la météo.",
+            "de": "Verwenden, wenn der Nutzer nach dem Wetter fragt.",
+        },
+        ("location", "days"),
+    ),
+    Action(
+        "search_web",
+        "information",
+        ("search", "internet", "information"),
+        {
+            "en": "Searches the web for up-to-date information",
+            "es": "Busca información actualizada en internet",
+            "pt": "Pesquisa informações atualizadas na internet",
+            "fr": "Recherche des informations à jour sur internet",
+            "de": "Sucht aktuelle Informationen im Internet",
+        },
+        {
+            "en": "Use when you need recent facts from the internet.",
+            "es": "Usar cuando necesites datos recientes de internet.",
+            "pt": "Use quando precisar de dados recentes da internet.",
+            "fr": "Utiliser pour obtenir des faits récents sur internet.",
+            "de": "Verwenden, wenn aktuelle Fakten aus dem Internet nötig sind.",
+        },
+        ("query", "max_results"),
+    ),
+    Action(
+        "create_invoice",
+        "finance",
+        ("finance", "billing", "invoice"),
+        {
+            "en": "Creates an invoice for a customer order",
+            "es": "Crea una factura para el pedido de un cliente",
+            "pt": "Cria uma fatura para o pedido de um cliente",
+            "fr": "Crée une facture pour la commande d'un client",
+            "de": "Erstellt eine Rechnung für eine Kundenbestellung",
+        },
+        {
+            "en": "Use when an order must be billed.",
+            "es": "Usar cuando hay que facturar un pedido.",
+            "pt": "Use quando um pedido precisa ser faturado.",
+            "fr": "Utiliser quand une commande doit être facturée.",
+            "de": "Verwenden, wenn eine Bestellung abgerechnet werden muss.",
+        },
+        ("customer_id", "order_id", "currency"),
+    ),
+    Action(
+        "convert_currency",
+        "finance",
+        ("finance", "currency", "exchange"),
+        {
+            "en": "Converts an amount between currencies",
+            "es": "Convierte un importe entre monedas",
+            "pt": "Converte um valor entre moedas",
+            "fr": "Convertit un montant entre devises",
+            "de": "Rechnet einen Betrag zwischen Währungen um",
+        },
+        {
+            "en": "Use when prices must be shown in another currency.",
+            "es": "Usar cuando los precios deben mostrarse en otra moneda.",
+            "pt": "Use quando os preços devem aparecer em outra moeda.",
+            "fr": (
+                "Utiliser quand les prix doivent "
+                "être affichés dans une autre devise."
+            ),
+            "de": "Verwenden, wenn Preise in einer anderen Währung nötig sind.",
+        },
+        ("amount", "from_currency", "to_currency"),
+    ),
+    Action(
+        "schedule_meeting",
+        "productivity",
+        ("calendar", "meetings", "productivity"),
+        {
+            "en": "Schedules a meeting in the shared calendar",
+            "es": "Programa una reunión en el calendario compartido",
+            "pt": "Agenda uma reunião no calendário compartilhado",
+            "fr": "Planifie une réunion dans le calendrier partagé",
+            "de": "Plant ein Meeting im gemeinsamen Kalender",
+        },
+        {
+            "en": "Use when people need to meet at a given time.",
+            "es": "Usar cuando varias personas necesitan reunirse a una hora.",
+            "pt": "Use quando pessoas precisam se reunir em um horário.",
+            "fr": "Utiliser quand des personnes doivent se réunir à une heure donnée.",
+            "de": "Verwenden, wenn sich Personen zu einer Zeit treffen müssen.",
+        },
+        ("attendees", "start_time", "duration"),
+    ),
+    Action(
+        "summarize_document",
+        "language",
+        ("documents", "summary", "text"),
+        {
+            "en": "Summarizes a long document into key points",
+            "es": "Resume un documento largo en puntos clave",
+            "pt": "Resume um documento longo em pontos-chave",
+            "fr": "Résume un long document en points clés",
+            "de": "Fasst ein langes Dokument in Kernpunkten zusammen",
+        },
+        {
+            "en": "Use when the user needs a short summary of a text.",
+            "es": "Usar cuando el usuario necesita un resumen breve de un texto.",
+            "pt": "Use quando o usuário precisa de um resumo curto de um texto.",
+            "fr": "Utiliser quand l'utilisateur veut un court résumé d'un texte.",
+            "de": "Verwenden, wenn eine kurze Zusammenfassung eines Textes nötig ist.",
+        },
+        ("document", "max_points"),
+    ),
+)
+
+QUALIFIERS: Sequence[Dict[str, str]] = (
+    {"en": "", "es": "", "pt": "", "fr": "", "de": ""},
+    {
+        "en": "for enterprise accounts",
+        "es": "para cuentas empresariales",
+        "pt": "para contas empresariais",
+        "fr": "pour les comptes entreprise",
+        "de": "für Unternehmenskonten",
+    },
+    {
+        "en": "with audit logging",
+        "es": "con registro de auditoría",
+        "pt": "com registro de auditoria",
+        "fr": "avec journal d'audit",
+        "de": "mit Audit-Protokoll",
+    },
+    {
+        "en": "in sandbox mode",
+        "es": "en modo de pruebas",
+        "pt": "em modo de testes",
+        "fr": "en mode bac à sable",
+        "de": "im Testmodus",
+    },
+    {
+        "en": "through the legacy API",
+        "es": "mediante la API heredada",
+        "pt": "pela API legada",
+        "fr": "via l'API historique",
+        "de": "über die Legacy-API",
+    },
+)
+
+
+def iter_descriptors(
+    size: int,
+    *,
+    languages: Sequence[str] = LANGUAGES,
+    enhanced_ratio: float = 0.5,
+    seed: int = 13,
+) -> Iterator[Dict[str, object]]:
+    """Yield ``size`` deterministic ATDF descriptors."""
+    rng = random.Random(seed)
+    languages = [lang for lang in languages if lang in LANGUAGES] or ["en"]
+    for index in range(size):
+        action = ACTIONS[index % len(ACTIONS)]
+        qualifier = QUALIFIERS[(index // len(ACTIONS)) % len(QUALIFIERS)]
+        yield _build_descriptor(
+            index, action, qualifier, languages, enhanced_ratio, rng
+        )
+
+
+def write_catalog(
+    directory: Path,
+    size: int,
+    *,
+    servers: int = 4,
+    languages: Sequence[str] = LANGUAGES,
+    enhanced_ratio: float = 0.5,
+    seed: int = 13,
+) -> List[Path]:
+    """Write a synthetic catalog as one JSON file per tool.
+
+    Tools are spread round-robin across ``servers`` sub-directories so that
+    per-source filters can be exercised. Returns the server directories.
+    """
+    directory = Path(directory)
+    server_dirs = [
+        directory / f"server_{index:02d}" for index in range(max(1, servers))
+    ]
+    for server_dir in server_dirs:
+        server_dir.mkdir(parents=True, exist_ok=True)
+
+    descriptors = iter_descriptors(
+        size, languages=languages, enhanced_ratio=enhanced_ratio, seed=seed
+    )
+    for index, descriptor in enumerate(descriptors):
+        target = server_dirs[index % len(server_dirs)] / f"{descriptor['tool_id']}.json"
+        target.write_text(json.dumps(descriptor, ensure_ascii=False), encoding="utf-8")
+    return server_dirs
+
+
+def seed_feedback(
+    storage,
+    keys: Sequence[tuple],
+    *,
+    coverage: float = 0.2,
+    events_per_tool: int = 5,
+    error_rate: float = 0.3,
+    seed: int = 13,
+) -> int:
+    """Record random feedback events for a share of ``(server_url, tool_id)`` keys."""
+    rng = random.Random(seed)
+    events = 0
+    for server_url, tool_id in keys:
+        if rng.random() >= coverage:
+            continue
+        for _ in range(rng.randint(1, max(1, events_per_tool))):
+            outcome = "error" if rng.random() < error_rate else "success"
+            storage.record_feedback(
+                server_url=server_url, tool_id=tool_id, outcome=outcome
+            )
+            events += 1
+    return events
+
+
+def sample_queries(
+    count: int,
+    *,
+    languages: Sequence[str] = LANGUAGES,
+    seed: int = 29,
+) -> List[Dict[str, Optional[str]]]:
+    """Return ``count`` natural-language queries with their language code."""
+    rng = random.Random(seed)
+    languages = [lang for lang in languages if lang in LANGUAGES] or ["en"]
+    queries: List[Dict[str, Optional[str]]] = []
+    for _ in range(count):
+        action = rng.choice(ACTIONS)
+        language = rng.choice(languages)
+        queries.append(
+            {
+                "query": action.when_to_use[language],
+                "language": language,
+                "expected_action": action.slug,
+            }
+        )
+    return queries
+
+
+def _build_descriptor(
+    index: int,
+    action: Action,
+    qualifier: Dict[str, str],
+    languages: Sequence[str],
+    enhanced_ratio: float,
+    rng: random.Random,
+) -> Dict[str, object]:
+    def localized(texts: Dict[str, str], lang: str) -> str:
+        suffix = qualifier[lang]
+        return f"{texts[lang]} {suffix}".strip()
+
+    descriptor: Dict[str, object] = {
+        "tool_id": f"{action.slug}_{index:06d}",
+        "description": localized(action.description, "en"),
+        "when_to_use": action.when_to_use["en"],
+        "how_to_use": {
+            "inputs": [
+                {
+                    "name": name,
+                    "type": "string",
+                    "description": f"The {name.replace('_', ' ')}",
+                }
+                for name in action.inputs
+            ],
+            "outputs": {
+                "success": "The operation completed successfully.",
+                "failure": [
+                    {
+                        "code": "invalid_input",
+                        "description": "One of the inputs is not valid.",
+                    }
+                ],
+            },
+        },
+    }
+
+    if rng.random() < enhanced_ratio:
+        extra_tags = rng.sample(
+            ["beta", "internal", "public", "deprecated", "premium", "fast"], 2
+        )
+        descriptor["schema_version"] = "2.0.0"
+        descriptor["metadata"] = {
+            "version": f"1.{index % 10}.0",
+            "tags": list(action.tags) + extra_tags,
+            "category": action.category,
+        }
+        localized_languages = [lang for lang in languages if lang != "en"]
+        chosen = rng.sample(
+            localized_languages, k=rng.randint(0, len(localized_languages))
+        )
+        if chosen:
+            descriptor["localization"] = {
+                lang: {
+                    "description": localized(action.description, lang),
+                    "when_to_use": action.when_to_use[lang],
+                }
+                for lang in sorted(chosen)
+            }
+    return descriptor
+
+
+__all__ = [
+    "ACTIONS",
+    "LANGUAGES",
+    "QUALIFIERS",
+    "iter_descriptors",
+    "write_catalog",
+    "seed_feedback",
+    "sample_queries",
+]
@@ -59,7 +59,7 @@ def main():
     )
 
     # Añadir al SDK
-    sdk.tools.append(nueva_herramienta)
+    sdk.add_tool(nueva_herramienta)
 
     print(f"Herramienta creada: {nueva_herramienta.name}")
     print(f"ID: {nueva_herramienta.id}")
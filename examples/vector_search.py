@@ -188,10 +188,9 @@ def main():
         tools = create_sample_tools()
 
         # Añadir herramientas al SDK
+        # (add_tool también las indexa en el almacén vectorial)
         for tool in tools:
-            sdk.tools.append(tool)
-            if sdk.vector_store:
-                sdk.vector_store.add_tool(tool.to_dict())
+            sdk.add_tool(tool)
 
         print(f"Se han creado {len(tools)} herramientas de ejemplo")
 
@@ -9,12 +9,13 @@ esquema básico 1.x (`schema/atdf_schema.json`, legado v0.1) y con el esquema ex
 """
 
 import glob
+import itertools
 import json
 import logging
 import os
 import re
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import yaml  # type: ignore[import-untyped]
 
@@ -25,10 +26,12 @@ logging.basicConfig(
 logger = logging.getLogger("atdf_sdk")
 
 # Importaciones internas
+from sdk.core.facets import tool_facets
+from sdk.core.lexical_index import LexicalIndex, index_terms
 from sdk.core.schema import ATDFTool, ATDFToolParameter
 from sdk.core.utils import (
     create_tool_instance,
-    load_tools_from_directory,
+    iter_tools_from_directory,
     load_tools_from_file,
     validate_tool,
 )
@@ -41,6 +44,13 @@ try:
 except ImportError:
     VECTOR_SEARCH_AVAILABLE = False
 
+# Herramientas que ATDFSDK registra e indexa de cada vez al cargar un directorio
+LOAD_CHUNK_SIZE = 1000
+
+
+def _tool_key(tool: ATDFTool) -> Optional[str]:
+    return tool.id or tool.tool_id
+
 
 # Clase para compatibilidad con tests antiguos
 class ATDFToolbox:
@@ -50,11 +60,50 @@ class ATDFToolbox:
     """
 
     def __init__(self):
-        self.tools = []
+        self._tools: List[ATDFTool] = []
         self.vector_store = None
+        # Índice léxico alineado con ``self._tools`` (posición = índice en la
+        # lista); ``remove_tool`` lo invalida y se rehace al buscar
+        self._lexical_index = LexicalIndex()
+        self._lexical_stale = False
 
     def __len__(self):
-        return len(self.tools)
+        return len(self._tools)
+
+    @property
+    def tools(self) -> Tuple[ATDFTool, ...]:
+        """Herramientas cargadas; se modifican con ``add_tool`` y ``remove_tool``."""
+        return tuple(self._tools)
+
+    @staticmethod
+    def _tool_text(tool: ATDFTool) -> str:
+        """Texto indexado: identificadores, descripciones, etiquetas y parámetros."""
+        tags, category = tool_facets(tool)
+        parts: List[Any] = [
+            tool.name,
+            tool.tool_id if tool.tool_id != tool.name else None,
+            tool.description,
+            tool.when_to_use,
+            category,
+            *tags,
+        ]
+        for param in tool.parameters:
+            parts.extend([param.name, param.description])
+        return " ".join(str(part) for part in parts if part)
+
+    def _append_tool(self, tool: ATDFTool) -> None:
+        self._tools.append(tool)
+        if not self._lexical_stale:
+            self._lexical_index.add(self._tool_text(tool))
+
+    def _ensure_lexical_index(self) -> None:
+        """Rehacer el índice léxico si ``remove_tool`` movió posiciones."""
+        if not self._lexical_stale:
+            return
+        self._lexical_index.clear()
+        for tool in self._tools:
+            self._lexical_index.add(self._tool_text(tool))
+        self._lexical_stale = False
 
     def add_tool(
         self, tool_data: Union[Dict[str, Any], ATDFTool]
@@ -77,9 +126,18 @@ class ATDFToolbox:
                 "add_tool espera un diccionario o una instancia de ATDFTool"
             )
 
-        self.tools.append(tool)
+        self._append_tool(tool)
         return tool
 
+    def remove_tool(self, tool_id: str) -> bool:
+        """Quitar la primera herramienta con ese id; ``False`` si no está."""
+        for position, tool in enumerate(self._tools):
+            if _tool_key(tool) == tool_id:
+                del self._tools[position]
+                self._lexical_stale = True
+                return True
+        return False
+
     def set_vector_store(self, vector_store: "ATDFVectorStore") -> None:
         """Asociar un almacén vectorial al toolbox."""
 
@@ -90,41 +148,26 @@ class ATDFToolbox:
             return tool_like
         return ATDFTool(tool_like)
 
-    def _fallback_search(
+    def _lexical_search(
         self,
         query: str,
         *,
         limit: Optional[int] = None,
     ) -> List[Tuple[ATDFTool, float]]:
-        query_lower = query.lower()
-        matches: List[ATDFTool] = []
-
-        for tool in self.tools:
-            haystack = " ".join(
-                filter(
-                    None,
-                    [
-                        tool.name,
-                        tool.description,
-                        getattr(tool, "when_to_use", ""),
-                        " ".join(tag for tag in (tool.tags or [])),
-                    ],
-                )
-            ).lower()
-
-            if query_lower in haystack:
-                matches.append(tool)
-
-        selected: List[ATDFTool]
-        if matches:
-            selected = matches
-        else:
-            selected = self.tools.copy()
+        """Búsqueda BM25 sobre el índice léxico; solo devuelve coincidencias.
 
-        if limit is not None:
-            selected = selected[:limit]
+        Una consulta sin términos (vacía o solo signos) lista las primeras
+        herramientas con puntuación 0.0.
+        """
+        self._ensure_lexical_index()
+        if not index_terms(query):
+            selected = self._tools if limit is None else self._tools[:limit]
+            return [(tool, 0.0) for tool in selected]
 
-        return [(tool, 0.0) for tool in selected]
+        return [
+            (self._tools[position], score)
+            for position, score in self._lexical_index.search(query, limit)
+        ]
 
     def find_tools_by_text(
         self,
@@ -135,7 +178,13 @@ class ATDFToolbox:
         limit: Optional[int] = None,
         return_scores: bool = True,
     ) -> Union[List[Tuple[ATDFTool, float]], List[ATDFTool]]:
-        """Buscar herramientas mediante texto libre."""
+        """Buscar herramientas mediante texto libre.
+
+        Sin búsqueda vectorial (o si no devuelve nada) se usa el índice
+        léxico, que solo devuelve herramientas con algún término de la
+        consulta en común. Una consulta sin coincidencias devuelve una lista
+        vacía; antes se devolvían las primeras herramientas cargadas.
+        """
 
         if use_vector_search and self.vector_store is not None:
             options = {"language": language}
@@ -167,7 +216,7 @@ class ATDFToolbox:
             except Exception as exc:
                 logger.warning(f"Fallo en búsqueda vectorial: {exc}")
 
-        fallback = self._fallback_search(query, limit=limit)
+        fallback = self._lexical_search(query, limit=limit)
         return fallback if return_scores else [tool for tool, _ in fallback]
 
     def select_tool_for_task(
@@ -217,7 +266,7 @@ class ATDFToolbox:
                 if validate_tool(tool_data):
                     # Convertir a instancia de ATDFTool
                     tool = self._create_legacy_tool(tool_data)
-                    self.tools.append(tool)
+                    self._append_tool(tool)
 
             return True
         except Exception as e:
@@ -261,7 +310,9 @@ class ATDFToolbox:
 
 
 # Función para compatibilidad con tests antiguos
-def load_toolbox_from_directory(directory_path: Union[str, Path]) -> ATDFToolbox:
+def load_toolbox_from_directory(
+    directory_path: Union[str, Path], recursive: bool = False
+) -> ATDFToolbox:
     """Cargar todas las herramientas de un directorio en un ATDFToolbox."""
     toolbox = ATDFToolbox()
     directory_path = Path(directory_path)
@@ -270,12 +321,12 @@ def load_toolbox_from_directory(directory_path: Union[str, Path]) -> ATDFToolbox
         logger.error(f"Directorio no válido: {directory_path}")
         return toolbox
 
-    # Buscar archivos JSON y YAML en el directorio
-    for extension in [".json", ".yaml", ".yml"]:
-        file_paths = list(directory_path.glob(f"*{extension}"))
-
-        for file_path in file_paths:
-            toolbox.load_tool_from_file(file_path)
+    # Los archivos JSON y YAML se leen y se añaden de uno en uno
+    for tool_data in iter_tools_from_directory(directory_path, recursive=recursive):
+        try:
+            toolbox._append_tool(toolbox._create_legacy_tool(tool_data))
+        except Exception as e:
+            logger.error(f"Error al cargar herramienta desde archivo: {str(e)}")
 
     return toolbox
 
@@ -327,6 +378,8 @@ class ATDFSDK:
         vector_db_path: Optional[str] = None,
         embedding_model: str = "all-MiniLM-L6-v2",
         auto_load: bool = True,
+        lazy_indexing: bool = False,
+        index_batch_size: Optional[int] = None,
     ):
         """
         Inicializar el SDK de ATDF.
@@ -336,10 +389,21 @@ class ATDFSDK:
             vector_db_path: Ruta a la base de datos vectorial
             embedding_model: Modelo de embedding a utilizar
             auto_load: Cargar automáticamente herramientas del directorio
+            lazy_indexing: Posponer la indexación vectorial hasta la primera búsqueda
+            index_batch_size: Tamaño de lote para generar embeddings al indexar
         """
         self.tools_directory = Path(tools_directory) if tools_directory else None
-        self.tools: List[ATDFTool] = []
+        self._tools: List[ATDFTool] = []
         self.vector_store: Optional[ATDFVectorStore] = None
+        self.lazy_indexing = lazy_indexing
+        self.index_batch_size = index_batch_size
+        self._pending_index: List[ATDFTool] = []
+        # Índices por id, etiqueta y categoría (posiciones en ``self._tools``);
+        # ``remove_tool`` los invalida y se rehacen en la siguiente consulta
+        self._indexes_stale = False
+        self._positions_by_id: Dict[str, int] = {}
+        self._positions_by_tag: Dict[str, Dict[int, None]] = {}
+        self._positions_by_category: Dict[str, Dict[int, None]] = {}
 
         # Inicializar almacenamiento vectorial si está disponible
         if VECTOR_SEARCH_AVAILABLE:
@@ -383,61 +447,187 @@ class ATDFSDK:
         """
         # Usar la función de utilidad para cargar herramientas
         tool_dicts = load_tools_from_file(file_path)
-        loaded_tools = []
-
-        for tool_dict in tool_dicts:
-            try:
-                # Crear instancia de ATDFTool
-                tool = create_tool_instance(tool_dict)
-                loaded_tools.append(tool)
-
-                # Añadir al vector store si está disponible
-                if self.vector_store:
-                    self.vector_store.add_tool_sync(tool.to_dict())
-            except Exception as e:
-                logger.error(
-                    f"Error al procesar herramienta desde {file_path}: {str(e)}"
-                )
+        loaded_tools = self._create_tools(tool_dicts, f"desde {file_path}")
 
         # Añadir a la lista de herramientas cargadas
-        self.tools.extend(loaded_tools)
+        self._register_tools(loaded_tools)
+        self._schedule_indexing(loaded_tools)
 
         return loaded_tools
 
     def load_tools_from_directory(
-        self, directory_path: Union[str, Path]
+        self,
+        directory_path: Union[str, Path],
+        *,
+        recursive: bool = False,
+        workers: int = 0,
+        chunk_size: int = LOAD_CHUNK_SIZE,
     ) -> List[ATDFTool]:
         """
         Cargar herramientas desde todos los archivos JSON y YAML en un directorio.
 
         Args:
             directory_path: Ruta al directorio
+            recursive: Recorrer también los subdirectorios
+            workers: Hilos para leer los archivos en paralelo (0 para no usarlos)
+            chunk_size: Herramientas que se registran e indexan de cada vez
 
         Returns:
             Lista de herramientas cargadas
         """
-        # Usar la función de utilidad para cargar herramientas
-        tool_dicts = load_tools_from_directory(directory_path)
-        loaded_tools = []
+        loaded_tools: List[ATDFTool] = []
+        for chunk in self.iter_tools_from_directory(
+            directory_path,
+            recursive=recursive,
+            workers=workers,
+            chunk_size=chunk_size,
+        ):
+            loaded_tools.extend(chunk)
+        return loaded_tools
+
+    def iter_tools_from_directory(
+        self,
+        directory_path: Union[str, Path],
+        *,
+        recursive: bool = False,
+        workers: int = 0,
+        chunk_size: int = LOAD_CHUNK_SIZE,
+    ) -> Iterator[List[ATDFTool]]:
+        """
+        Cargar un directorio por bloques a medida que se leen sus archivos.
+
+        Cada bloque se registra (y se indexa, salvo con ``lazy_indexing``)
+        antes de entregarse, de modo que el SDK ya puede buscar entre las
+        herramientas cargadas mientras el resto del árbol sigue leyéndose.
+
+        Args:
+            directory_path: Ruta al directorio
+            recursive: Recorrer también los subdirectorios
+            workers: Hilos para leer los archivos en paralelo (0 para no usarlos)
+            chunk_size: Herramientas por bloque
+
+        Yields:
+            Listas de herramientas ya registradas en el SDK
+        """
+        # Las herramientas que entrega el generador ya están validadas
+        tool_dicts = iter_tools_from_directory(
+            directory_path, recursive=recursive, workers=workers
+        )
+        while True:
+            chunk = list(itertools.islice(tool_dicts, max(1, chunk_size)))
+            if not chunk:
+                return
+            loaded_tools = self._create_tools(
+                chunk, f"desde directorio {directory_path}"
+            )
+
+            # Añadir a la lista de herramientas cargadas
+            self._register_tools(loaded_tools)
+            self._schedule_indexing(loaded_tools)
+
+            yield loaded_tools
 
+    @staticmethod
+    def _create_tools(tool_dicts: List[Dict[str, Any]], origin: str) -> List[ATDFTool]:
+        """Crear las herramientas de ``tool_dicts`` omitiendo las no válidas."""
+        loaded_tools = []
         for tool_dict in tool_dicts:
             try:
                 # Crear instancia de ATDFTool
-                tool = create_tool_instance(tool_dict)
-                loaded_tools.append(tool)
-
-                # Añadir al vector store si está disponible
-                if self.vector_store:
-                    self.vector_store.add_tool_sync(tool.to_dict())
+                loaded_tools.append(create_tool_instance(tool_dict))
             except Exception as e:
-                logger.error(
-                    f"Error al procesar herramienta desde directorio {directory_path}: {str(e)}"
-                )
+                logger.error(f"Error al procesar herramienta {origin}: {str(e)}")
+        return loaded_tools
 
-        # Añadir a la lista de herramientas cargadas
-        self.tools.extend(loaded_tools)
+    def _index_position(self, position: int, add: bool = True) -> None:
+        tool = self._tools[position]
+        tags, category = tool_facets(tool)
+        for index, keys in (
+            (self._positions_by_tag, tags),
+            (self._positions_by_category, [category] if category else []),
+        ):
+            for key in keys:
+                if add:
+                    index.setdefault(key, {})[position] = None
+                else:
+                    index[key].pop(position, None)
+                    if not index[key]:
+                        del index[key]
+        key = _tool_key(tool)
+        if key is not None and add:
+            self._positions_by_id[key] = position
+
+    @property
+    def tools(self) -> Tuple[ATDFTool, ...]:
+        """Herramientas cargadas; se modifican con ``add_tool`` y ``remove_tool``."""
+        return tuple(self._tools)
+
+    def _ensure_indexes(self) -> None:
+        """Rehacer los índices si ``remove_tool`` movió posiciones."""
+        if not self._indexes_stale:
+            return
+        self._positions_by_id.clear()
+        self._positions_by_tag.clear()
+        self._positions_by_category.clear()
+        for position in range(len(self._tools)):
+            self._index_position(position)
+        self._indexes_stale = False
+
+    def _register_tools(self, tools: List[ATDFTool]) -> None:
+        """Añadir herramientas manteniendo los índices.
+
+        Un id ya cargado se sustituye en su posición original (la última
+        versión cargada prevalece), de modo que ``self.tools`` no contiene
+        ids repetidos y el orden de carga se conserva.
+        """
+        self._ensure_indexes()
+        for tool in tools:
+            key = _tool_key(tool)
+            position = self._positions_by_id.get(key) if key is not None else None
+            if position is None:
+                self._tools.append(tool)
+                position = len(self._tools) - 1
+            else:
+                logger.info(f"Herramienta '{key}' reemplazada por una nueva versión")
+                self._index_position(position, add=False)
+                self._tools[position] = tool
+            self._index_position(position)
+
+    def _schedule_indexing(self, tools: List[ATDFTool]) -> None:
+        """Encolar herramientas para el almacén vectorial y, salvo en modo
+        diferido, indexarlas de inmediato en una única pasada por lotes."""
+        if not self.vector_store or not tools:
+            return
+        self._pending_index.extend(tools)
+        if not self.lazy_indexing:
+            self.flush_index()
+
+    def flush_index(self) -> int:
+        """
+        Indexar en el almacén vectorial las herramientas pendientes.
 
-        return loaded_tools
+        Todas las herramientas encoladas se envían en una sola llamada a
+        ``upsert_tools`` (embeddings por lotes y caché en disco).
+
+        Returns:
+            Número de herramientas indexadas
+        """
+        if not self.vector_store or not self._pending_index:
+            return 0
+
+        pending = self._pending_index
+        try:
+            count = self.vector_store.upsert_tools_sync(
+                [tool.to_dict() for tool in pending],
+                batch_size=self.index_batch_size,
+            )
+        except Exception as e:
+            logger.error(f"Error al indexar herramientas en el vector store: {str(e)}")
+            return 0
+
+        self._pending_index = []
+        logger.info(f"Indexadas {count} herramientas en el vector store")
+        return count
 
     def search_tools(
         self, query: str, limit: int = 5, score_threshold: float = 0.6
@@ -462,6 +652,9 @@ class ATDFSDK:
                 "Asegúrate de instalar las dependencias: pip install lancedb sentence-transformers"
             )
 
+        # Indexar lo pendiente (modo diferido) antes de buscar
+        self.flush_index()
+
         # Realizar búsqueda vectorial
         results = self.vector_store.search_tools_sync(
             query, {"limit": limit, "score_threshold": score_threshold}
@@ -489,7 +682,7 @@ class ATDFSDK:
         Returns:
             Lista de herramientas
         """
-        return self.tools
+        return list(self._tools)
 
     def get_tool_by_id(self, tool_id: str) -> Optional[ATDFTool]:
         """
@@ -502,9 +695,10 @@ class ATDFSDK:
             Herramienta o None si no se encuentra
         """
         # Buscar primero en las herramientas cargadas
-        for tool in self.tools:
-            if tool.id == tool_id:
-                return tool
+        self._ensure_indexes()
+        position = self._positions_by_id.get(tool_id)
+        if position is not None:
+            return self._tools[position]
 
         # Si no se encuentra y está disponible la búsqueda vectorial
         if self.vector_store:
@@ -524,6 +718,8 @@ class ATDFSDK:
         """
         Crear una nueva herramienta ATDF.
 
+        Si ya hay una herramienta con el mismo id, la nueva la reemplaza.
+
         Args:
             **kwargs: Atributos de la herramienta (deben coincidir con ATDFTool en schema.py)
 
@@ -533,18 +729,59 @@ class ATDFSDK:
         try:
             # Usar la clase correcta importada de schema.py
             tool = ATDFTool(**kwargs)
-
-            # Añadir a la lista de herramientas
-            self.tools.append(tool)
-
-            # Añadir al vector store si está disponible
-            if self.vector_store:
-                self.vector_store.add_tool_sync(tool.to_dict())
-
-            return tool
         except Exception as e:
             logger.error(f"Error al crear herramienta: {str(e)}")
             raise  # Re-lanzar la excepción para que el usuario sepa que falló
+        return self.add_tool(tool)
+
+    def add_tool(self, tool: Union[Dict[str, Any], ATDFTool]) -> ATDFTool:
+        """
+        Añadir una herramienta (o su diccionario) al SDK.
+
+        Si ya hay una herramienta con el mismo id, la nueva la reemplaza.
+
+        Args:
+            tool: Instancia de ATDFTool o diccionario con sus datos
+
+        Returns:
+            Herramienta añadida
+        """
+        if not isinstance(tool, ATDFTool):
+            tool = create_tool_instance(tool)
+        self._register_tools([tool])
+        self._schedule_indexing([tool])
+        return tool
+
+    def remove_tool(self, tool_id: str) -> bool:
+        """
+        Quitar una herramienta del SDK y, si ya se indexó, del almacén vectorial.
+
+        Los índices por id, etiqueta y categoría se rehacen en la siguiente
+        consulta.
+
+        Args:
+            tool_id: ID de la herramienta
+
+        Returns:
+            True si la herramienta estaba cargada
+        """
+        self._ensure_indexes()
+        position = self._positions_by_id.get(tool_id)
+        if position is None:
+            return False
+        tool = self._tools.pop(position)
+        self._indexes_stale = True
+
+        pending = len(self._pending_index)
+        self._pending_index = [item for item in self._pending_index if item is not tool]
+        if self.vector_store and len(self._pending_index) == pending:
+            try:
+                self.vector_store.delete_tool_sync(tool_id)
+            except Exception as e:
+                logger.error(
+                    f"Error al eliminar la herramienta del vector store: {str(e)}"
+                )
+        return True
 
     def save_tools_to_file(
         self,
@@ -567,7 +804,7 @@ class ATDFSDK:
 
         # Usar todas las herramientas si no se especifican
         if tools is None:
-            tools = self.tools
+            tools = self._tools
 
         # Convertir herramientas a diccionarios
         tools_data = [tool.to_dict() for tool in tools]
@@ -603,24 +840,80 @@ class ATDFSDK:
         """
         # Usar todas las herramientas si no se especifican
         if tools is None:
-            tools = self.tools
+            tools = self._tools
 
         # Convertir herramientas a formato JSON Schema
         schemas = [tool.to_json_schema() for tool in tools]
 
         return schemas
 
-    def filter_tools(self, filter_func: Callable[[ATDFTool], bool]) -> List[ATDFTool]:
+    def get_tools_by_tag(self, tag: str) -> List[ATDFTool]:
         """
-        Filtrar herramientas utilizando una función personalizada.
+        Obtener las herramientas con una etiqueta (sin distinguir mayúsculas).
+
+        Args:
+            tag: Etiqueta buscada
+
+        Returns:
+            Lista de herramientas en orden de carga
+        """
+        return self.filter_tools(tags=[tag])
+
+    def get_tools_by_category(self, category: str) -> List[ATDFTool]:
+        """
+        Obtener las herramientas de una categoría (sin distinguir mayúsculas).
+
+        Args:
+            category: Categoría buscada
+
+        Returns:
+            Lista de herramientas en orden de carga
+        """
+        return self.filter_tools(category=category)
+
+    def filter_tools(
+        self,
+        filter_func: Optional[Callable[[ATDFTool], bool]] = None,
+        *,
+        tags: Optional[List[str]] = None,
+        category: Optional[str] = None,
+    ) -> List[ATDFTool]:
+        """
+        Filtrar herramientas por etiquetas, categoría o una función personalizada.
+
+        ``tags`` (cualquiera de ellas) y ``category`` se resuelven con los
+        índices del SDK; ``filter_func`` solo se evalúa sobre las herramientas
+        que ya cumplen esos filtros.
 
         Args:
             filter_func: Función que recibe una herramienta y devuelve un booleano
+            tags: Etiquetas aceptadas
+            category: Categoría requerida
 
         Returns:
-            Lista de herramientas filtradas
+            Lista de herramientas filtradas, en orden de carga
         """
-        return [tool for tool in self.tools if filter_func(tool)]
+        self._ensure_indexes()
+        positions: Optional[set] = None
+        if tags is not None:
+            positions = set()
+            for tag in tags:
+                positions.update(
+                    self._positions_by_tag.get(str(tag).strip().lower(), ())
+                )
+        if category is not None:
+            matches = self._positions_by_category.get(str(category).strip().lower(), {})
+            positions = (
+                set(matches) if positions is None else positions.intersection(matches)
+            )
+
+        if positions is None:
+            candidates = self._tools
+        else:
+            candidates = [self._tools[position] for position in sorted(positions)]
+        if filter_func is None:
+            return list(candidates)
+        return [tool for tool in candidates if filter_func(tool)]
 
 
 # Eliminar el bloque if __name__ == "__main__" si existía aquí
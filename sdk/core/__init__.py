@@ -5,9 +5,12 @@ Este módulo contiene las funcionalidades principales para trabajar con
 herramientas en formato ATDF, incluyendo definiciones de esquema y utilidades.
 """
 
+from .facets import facet_values, tool_facets
+from .lexical_index import LexicalIndex, index_terms
 from .schema import ATDFTool, ATDFToolParameter
 from .utils import (
     create_tool_instance,
+    iter_tools_from_directory,
     load_tools_from_directory,
     load_tools_from_file,
     validate_tool,
@@ -18,6 +21,11 @@ __all__ = [
     "ATDFToolParameter",
     "load_tools_from_file",
     "load_tools_from_directory",
+    "iter_tools_from_directory",
     "validate_tool",
     "create_tool_instance",
+    "facet_values",
+    "tool_facets",
+    "LexicalIndex",
+    "index_terms",
 ]
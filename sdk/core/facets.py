@@ -0,0 +1,37 @@
+"""
+Etiquetas y categoría de una herramienta para filtros e índices.
+
+El SDK, la caja de herramientas y los backends vectoriales leen estos campos
+igual: de primer nivel y de ``metadata``, en minúsculas y sin duplicados.
+"""
+
+from typing import Any, List, Mapping, Tuple
+
+
+def facet_values(value: Any) -> List[str]:
+    """Lista de valores en minúsculas y sin espacios de una cadena o iterable."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    return [str(item).strip().lower() for item in value if str(item).strip()]
+
+
+def tool_facets(tool: Any) -> Tuple[List[str], str]:
+    """Etiquetas y categoría (``""`` si no tiene) de una herramienta.
+
+    ``tool`` puede ser un diccionario o un ``ATDFTool``.
+    """
+    if isinstance(tool, Mapping):
+        tags, category, metadata = (
+            tool.get("tags"),
+            tool.get("category"),
+            tool.get("metadata"),
+        )
+    else:
+        tags, category, metadata = tool.tags, tool.category, tool.metadata
+    if not isinstance(metadata, Mapping):
+        metadata = {}
+    values = facet_values(tags) + facet_values(metadata.get("tags"))
+    categories = facet_values(category or metadata.get("category"))
+    return list(dict.fromkeys(values)), categories[0] if categories else ""
@@ -0,0 +1,47 @@
+"""
+Embeddings por *feature hashing* compartidos por el SDK y el selector.
+
+Este módulo necesita NumPy, por eso ``sdk.core`` no lo importa al cargarse.
+"""
+
+import zlib
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+
+from .lexical_index import tokenize
+
+
+class HashingEmbedder:
+    """
+    Embedder sin dependencias basado en *hashing* con signo.
+
+    Las palabras y los trigramas de caracteres se reparten en ``dimensions``
+    casillas con CRC32, así que los vectores son estables entre procesos y
+    plataformas. Los trigramas acercan formas flexionadas ("agujero" y
+    "agujeros").
+    """
+
+    def __init__(self, dimensions: int = 512) -> None:
+        self.dimensions = dimensions
+        self.name = f"hashing-{dimensions}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Una fila float32 L2-normalizada por texto."""
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                digest = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                matrix[row, digest % self.dimensions] += sign * weight
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    @staticmethod
+    def _features(text: str) -> Iterable[Tuple[str, float]]:
+        for token in tokenize(text):
+            yield f"w:{token}", 1.0
+            padded = f"#{token}#"
+            for start in range(len(padded) - 2):
+                yield f"c:{padded[start:start + 3]}", 0.5
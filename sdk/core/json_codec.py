@@ -0,0 +1,173 @@
+"""
+Codificación JSON intercambiable para las rutas más frecuentes del SDK y del
+selector.
+
+Si ``orjson`` está instalado se usa para codificar y decodificar; si no, la
+biblioteca estándar. Ambas producen JSON equivalente al decodificarlo, pero no
+idéntico byte a byte (``orjson`` no deja espacios tras ``,`` ni ``:``). Por eso
+``canonical_dumps``, cuya salida se usa para calcular los hashes de versión del
+catálogo, conserva siempre el formato de ``json.dumps``.
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Union
+
+try:  # pragma: no cover - depende del entorno
+    import orjson
+except ImportError:  # pragma: no cover - se usa el módulo json estándar
+    orjson = None
+
+JsonInput = Union[str, bytes, bytearray]
+
+
+class JsonCodec:
+    """
+    Codec de la biblioteca estándar y base de las demás implementaciones.
+
+    Las subclases deben devolver lo mismo que este codec al decodificar su
+    salida y admitir los mismos valores de entrada.
+    """
+
+    name = "json"
+
+    def dumps(self, value: Any, *, sort_keys: bool = False) -> str:
+        return json.dumps(value, ensure_ascii=False, sort_keys=sort_keys)
+
+    def dumps_bytes(self, value: Any, *, sort_keys: bool = False) -> bytes:
+        """UTF-8 compacto, el mismo formato que ``JSONResponse`` de Starlette."""
+        return json.dumps(
+            value,
+            ensure_ascii=False,
+            sort_keys=sort_keys,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def loads(self, data: JsonInput) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Codec basado en ``orjson``.
+
+    Los valores que ``orjson`` no admite (claves que no son cadenas, enteros
+    de más de 64 bits) y los literales que solo acepta ``json`` (``NaN``,
+    ``Infinity``) se delegan en la biblioteca estándar, así que los errores
+    son los mismos que con ``JsonCodec``. La única diferencia es que
+    ``orjson`` escribe ``NaN`` y los infinitos como ``null``.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson no está instalado: pip install orjson")
+
+    def dumps(self, value: Any, *, sort_keys: bool = False) -> str:
+        try:
+            return orjson.dumps(value, option=_orjson_option(sort_keys)).decode()
+        except TypeError:
+            return super().dumps(value, sort_keys=sort_keys)
+
+    def dumps_bytes(self, value: Any, *, sort_keys: bool = False) -> bytes:
+        try:
+            return orjson.dumps(value, option=_orjson_option(sort_keys))
+        except TypeError:
+            return super().dumps_bytes(value, sort_keys=sort_keys)
+
+    def loads(self, data: JsonInput) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+
+def _orjson_option(sort_keys: bool) -> int:
+    return orjson.OPT_SORT_KEYS if sort_keys else 0
+
+
+CODECS: Dict[str, Callable[[], JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "json": JsonCodec,
+}
+
+
+def make_codec(name: str) -> JsonCodec:
+    """
+    Crear un codec por nombre.
+
+    Raises:
+        ValueError: Si el nombre no está en ``CODECS``
+        ImportError: Si falta la dependencia del codec
+    """
+    try:
+        factory = CODECS[name]
+    except KeyError:
+        raise ValueError(
+            f"Codec JSON desconocido: {name} (disponibles: {', '.join(CODECS)})"
+        )
+    return factory()
+
+
+def available_codecs() -> List[str]:
+    """Nombres de los codecs cuyas dependencias están instaladas."""
+    names = []
+    for name in CODECS:
+        try:
+            make_codec(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+_codec: JsonCodec = make_codec(available_codecs()[0])
+
+
+def get_codec() -> JsonCodec:
+    """Codec activo."""
+    return _codec
+
+
+def set_codec(codec: Union[str, JsonCodec]) -> JsonCodec:
+    """
+    Cambiar el codec activo para todo el proceso.
+
+    Args:
+        codec: Nombre registrado en ``CODECS`` o una instancia de ``JsonCodec``
+            (por ejemplo, una basada en otra biblioteca)
+
+    Returns:
+        El codec que estaba activo, para poder restaurarlo
+    """
+    global _codec
+    previous = _codec
+    _codec = make_codec(codec) if isinstance(codec, str) else codec
+    return previous
+
+
+def dumps(value: Any, *, sort_keys: bool = False) -> str:
+    """Codificar ``value`` como texto JSON con el codec activo."""
+    return _codec.dumps(value, sort_keys=sort_keys)
+
+
+def dumps_bytes(value: Any, *, sort_keys: bool = False) -> bytes:
+    """Codificar ``value`` como JSON compacto en UTF-8 con el codec activo."""
+    return _codec.dumps_bytes(value, sort_keys=sort_keys)
+
+
+def loads(data: JsonInput) -> Any:
+    """Decodificar texto o bytes JSON con el codec activo."""
+    return _codec.loads(data)
+
+
+def canonical_dumps(value: Any) -> str:
+    """
+    Forma canónica de ``value``: claves ordenadas, sin escapar caracteres no
+    ASCII y con los separadores de ``json.dumps``.
+
+    No depende del codec activo, de modo que los hashes calculados sobre ella
+    no cambian al instalar o quitar ``orjson``.
+    """
+    return json.dumps(value, sort_keys=True, ensure_ascii=False)
@@ -0,0 +1,136 @@
+"""
+Índice léxico incremental para búsquedas de texto sin dependencias.
+
+El índice guarda, por término, las frecuencias en cada documento (listas de
+postings) y puntúa con BM25 en el momento de la consulta, de modo que añadir
+documentos no obliga a reconstruir nada y cada búsqueda solo recorre los
+postings de los términos consultados.
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+_WORD_PATTERN = re.compile(r"[\w-]+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Palabras en minúsculas, sin más normalización.
+
+    Conserva guiones y guiones bajos dentro de la palabra. Es la entrada de
+    ``HashingEmbedder`` y de TF-IDF, cuyos vectores no deben cambiar.
+    """
+    return [match.group(0).lower() for match in _WORD_PATTERN.finditer(text)]
+
+
+def index_terms(text: str) -> List[str]:
+    """
+    Términos normalizados de un texto, tal como se indexan y se consultan.
+
+    Se pasan a minúsculas, se eliminan las tildes, se separan también los
+    identificadores con guiones bajos y se quita la ``s`` final de las palabras
+    de más de tres letras, un plural muy básico que sirve para español e inglés.
+    """
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    terms = []
+    for match in _TOKEN_PATTERN.finditer(folded):
+        term = match.group(0)
+        if len(term) > 3 and term.endswith("s"):
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+
+def bm25_idf(df: int, size: int) -> float:
+    """IDF de BM25 en la variante que nunca es negativa (la de Lucene)."""
+    return math.log(1.0 + (size - df + 0.5) / (df + 0.5))
+
+
+class LexicalIndex:
+    """
+    Índice invertido con puntuación BM25 que admite altas incrementales.
+
+    Los documentos se identifican por su posición de alta (0, 1, 2...). Las
+    estadísticas globales (número de documentos y longitud media) se leen al
+    consultar, así que las puntuaciones siempre reflejan el índice completo.
+    """
+
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._lengths: List[int] = []
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, text: str) -> int:
+        """
+        Indexar un documento nuevo.
+
+        Args:
+            text: Texto del documento
+
+        Returns:
+            Posición asignada al documento
+        """
+        position = len(self._lengths)
+        terms = index_terms(text)
+        for term in terms:
+            counts = self._postings.setdefault(term, {})
+            counts[position] = counts.get(position, 0) + 1
+        self._lengths.append(len(terms))
+        self._total_length += len(terms)
+        return position
+
+    def clear(self) -> None:
+        """Vaciar el índice."""
+        self._postings.clear()
+        self._lengths.clear()
+        self._total_length = 0
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Buscar los documentos que contienen algún término de la consulta.
+
+        Args:
+            query: Texto libre; cada término suma su contribución BM25
+            limit: Número máximo de resultados (None para todos)
+
+        Returns:
+            Lista de tuplas (posición, puntuación) ordenada por puntuación
+            descendente y, a igualdad, por orden de alta
+        """
+        size = len(self._lengths)
+        if not size:
+            return []
+        average = self._total_length / size or 1.0
+
+        scores: Dict[int, float] = {}
+        for term in set(index_terms(query)):
+            counts = self._postings.get(term)
+            if not counts:
+                continue
+            idf = bm25_idf(len(counts), size)
+            for position, freq in counts.items():
+                norm = self.k1 * (
+                    1.0 - self.b + self.b * self._lengths[position] / average
+                )
+                scores[position] = scores.get(position, 0.0) + idf * freq * (
+                    self.k1 + 1.0
+                ) / (freq + norm)
+
+        ranked = ((-score, position) for position, score in scores.items())
+        if limit is not None:
+            best = heapq.nsmallest(max(0, limit), ranked)
+        else:
+            best = sorted(ranked)
+        return [(position, -negative) for negative, position in best]
@@ -8,20 +8,52 @@ y trabajar con herramientas ATDF.
 import json
 import logging
 import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import yaml  # type: ignore[import-untyped]
 
+from sdk.core import json_codec
 from sdk.core.schema import ATDFTool, ATDFToolParameter
 
 logger = logging.getLogger(__name__)
 
 
+# Cargador de PyYAML compilado con libyaml si está disponible
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+TOOL_FILE_EXTENSIONS = (".json", ".yaml", ".yml")
+
+
+def _parse_tool_file(file_path: Path) -> Any:
+    """Leer y decodificar un archivo JSON o YAML con el analizador más rápido."""
+    file_extension = file_path.suffix.lower()
+
+    if file_extension in [".json"]:
+        try:
+            return json_codec.loads(file_path.read_bytes())
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Error al decodificar JSON: {str(e)}")
+
+    elif file_extension in [".yaml", ".yml"]:
+        with open(file_path, "r", encoding="utf-8") as f:
+            try:
+                return yaml.load(f, Loader=_YAML_LOADER)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Error al decodificar YAML: {str(e)}")
+
+    raise ValueError(f"Formato de archivo no soportado: {file_extension}")
+
+
 def load_tools_from_file(file_path: Union[str, Path]) -> List[Dict[str, Any]]:
     """
     Cargar herramientas desde un archivo JSON o YAML.
 
+    Usa el codec de ``json_codec`` (``orjson`` si está instalado) y el
+    cargador C de PyYAML cuando está disponible.
+
     Args:
         file_path: Ruta al archivo
 
@@ -36,22 +68,7 @@ def load_tools_from_file(file_path: Union[str, Path]) -> List[Dict[str, Any]]:
     if not file_path.exists():
         raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        file_extension = file_path.suffix.lower()
-
-        if file_extension in [".json"]:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Error al decodificar JSON: {str(e)}")
-
-        elif file_extension in [".yaml", ".yml"]:
-            try:
-                data = yaml.safe_load(f)
-            except yaml.YAMLError as e:
-                raise ValueError(f"Error al decodificar YAML: {str(e)}")
-        else:
-            raise ValueError(f"Formato de archivo no soportado: {file_extension}")
+    data = _parse_tool_file(file_path)
 
     # Si es un objeto, convertirlo a lista
     if isinstance(data, dict):
@@ -69,35 +86,136 @@ def load_tools_from_file(file_path: Union[str, Path]) -> List[Dict[str, Any]]:
     return valid_tools
 
 
-def load_tools_from_directory(directory_path: Union[str, Path]) -> List[Dict[str, Any]]:
+def _iter_tool_files(
+    directory_path: Path, recursive: bool, extensions: Tuple[str, ...]
+) -> Iterator[Path]:
     """
-    Cargar herramientas desde todos los archivos JSON y YAML en un directorio.
+    Recorrer los archivos de herramientas sin listar antes el árbol completo.
+
+    Dentro de cada directorio se respeta el orden de ``extensions`` y, para
+    una misma extensión, el orden alfabético; los subdirectorios se visitan
+    después, también en orden alfabético.
+    """
+    rank = {extension: position for position, extension in enumerate(extensions)}
+    pending = [directory_path]
+    while pending:
+        current = pending.pop()
+        files: List[Tuple[int, str, Path]] = []
+        subdirectories: List[Path] = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if recursive:
+                            subdirectories.append(Path(entry.path))
+                        continue
+                    extension = os.path.splitext(entry.name)[1].lower()
+                    if extension in rank and entry.is_file():
+                        files.append((rank[extension], entry.name, Path(entry.path)))
+        except OSError as e:
+            logger.warning(f"Error al leer el directorio {current}: {str(e)}")
+            continue
+        for _, _, file_path in sorted(files):
+            yield file_path
+        pending.extend(sorted(subdirectories, reverse=True))
+
+
+def _load_file_safely(file_path: Path) -> List[Tuple[Path, Dict[str, Any]]]:
+    try:
+        return [(file_path, tool) for tool in load_tools_from_file(file_path)]
+    except Exception as e:
+        logger.warning(f"Error al cargar archivo {file_path}: {str(e)}")
+        return []
+
+
+def _iter_file_entries(
+    file_paths: Iterator[Path], workers: int
+) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+    if workers <= 0:
+        for file_path in file_paths:
+            yield from _load_file_safely(file_path)
+        return
+
+    # Ventana acotada de lecturas en curso: se entrega en el orden de los
+    # archivos sin esperar a que se haya leído todo el directorio.
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="atdf-loader"
+    ) as executor:
+        in_flight: Deque["Future[List[Tuple[Path, Dict[str, Any]]]]"] = deque()
+        for file_path in file_paths:
+            in_flight.append(executor.submit(_load_file_safely, file_path))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def iter_tools_from_directory(
+    directory_path: Union[str, Path],
+    *,
+    recursive: bool = False,
+    workers: int = 0,
+    extensions: Iterable[str] = TOOL_FILE_EXTENSIONS,
+    with_paths: bool = False,
+) -> Iterator[Any]:
+    """
+    Cargar herramientas de un directorio de forma incremental.
+
+    Cada herramienta válida se entrega en cuanto se lee su archivo, así que
+    quien consume el generador puede empezar a indexar o servir antes de que
+    termine el recorrido. Los archivos que no se pueden leer se registran y se
+    omiten, igual que en ``load_tools_from_directory``.
 
     Args:
         directory_path: Ruta al directorio
+        recursive: Recorrer también los subdirectorios
+        workers: Hilos para leer y decodificar archivos en paralelo (0 para
+            hacerlo en el hilo actual). El orden de entrega no cambia y solo
+            hay unos pocos archivos por hilo adelantados en memoria
+        extensions: Extensiones de archivo que se cargan
+        with_paths: Entregar tuplas ``(ruta, herramienta)`` con el archivo del
+            que procede cada herramienta
+
+    Yields:
+        Herramientas validadas en formato diccionario, o tuplas
+        ``(ruta, herramienta)`` si ``with_paths`` es True
 
-    Returns:
-        Lista de herramientas en formato diccionario
+    Raises:
+        NotADirectoryError: Si la ruta no es un directorio
     """
     directory_path = Path(directory_path)
 
     if not directory_path.exists() or not directory_path.is_dir():
         raise NotADirectoryError(f"Directorio no válido: {directory_path}")
 
-    tools = []
+    file_paths = _iter_tool_files(
+        directory_path,
+        recursive,
+        tuple(extension.lower() for extension in extensions),
+    )
 
-    # Buscar archivos JSON y YAML en el directorio
-    for extension in [".json", ".yaml", ".yml"]:
-        file_paths = list(directory_path.glob(f"*{extension}"))
+    entries = _iter_file_entries(file_paths, workers)
+    if with_paths:
+        yield from entries
+    else:
+        for _, tool in entries:
+            yield tool
 
-        for file_path in file_paths:
-            try:
-                file_tools = load_tools_from_file(file_path)
-                tools.extend(file_tools)
-            except Exception as e:
-                logger.warning(f"Error al cargar archivo {file_path}: {str(e)}")
 
-    return tools
+def load_tools_from_directory(
+    directory_path: Union[str, Path], recursive: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Cargar herramientas desde todos los archivos JSON y YAML en un directorio.
+
+    Args:
+        directory_path: Ruta al directorio
+        recursive: Recorrer también los subdirectorios
+
+    Returns:
+        Lista de herramientas en formato diccionario
+    """
+    return list(iter_tools_from_directory(directory_path, recursive=recursive))
 
 
 def validate_tool(tool_data: Dict[str, Any]) -> bool:
@@ -5,6 +5,32 @@ Este módulo proporciona funcionalidades para indexar y buscar
 herramientas ATDF utilizando búsqueda semántica.
 """
 
+from .backends import AnnIndexConfig, LanceDBBackend, NumpyBackend, VectorBackend
+from .embedding_cache import EmbeddingCache, QueryEmbeddingCache
+from .embeddings import (
+    EmbeddingProvider,
+    HashingProvider,
+    OnnxProvider,
+    SentenceTransformerProvider,
+    TfidfSvdProvider,
+    create_provider,
+)
+from .query_batcher import QueryBatcher
 from .vector_store import ATDFVectorStore
 
-__all__ = ["ATDFVectorStore"]
+__all__ = [
+    "ATDFVectorStore",
+    "EmbeddingCache",
+    "QueryEmbeddingCache",
+    "QueryBatcher",
+    "VectorBackend",
+    "LanceDBBackend",
+    "NumpyBackend",
+    "AnnIndexConfig",
+    "EmbeddingProvider",
+    "SentenceTransformerProvider",
+    "HashingProvider",
+    "TfidfSvdProvider",
+    "OnnxProvider",
+    "create_provider",
+]
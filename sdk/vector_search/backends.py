@@ -0,0 +1,1491 @@
+"""Backends de almacenamiento para ``ATDFVectorStore``.
+
+Un backend guarda los registros ya vectorizados (``id``, ``vector`` y el
+payload ``raw_data`` con la herramienta serializada) y resuelve búsquedas por
+similitud. ``LanceDBBackend`` delega en una tabla LanceDB; ``NumpyBackend`` no
+tiene dependencias adicionales y mantiene una matriz float32 contigua con los
+vectores normalizados, persistida como ``.npy`` que se abre mapeado en memoria.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from ..core import json_codec
+from ..core.facets import facet_values, tool_facets
+
+logger = logging.getLogger(__name__)
+
+# Fila devuelta por una búsqueda: {"payload": str | dict, "score": float | None}
+SearchRow = Dict[str, Any]
+
+ANN_INDEX_TYPES = ("IVF_PQ", "IVF_HNSW_SQ", "IVF_HNSW_PQ")
+
+# Código BCP-47 para herramientas sin idioma declarado; coinciden con cualquier
+# filtro de idioma para no ocultar catálogos antiguos.
+UNDETERMINED_LANGUAGE = "und"
+
+
+def filter_columns(tool: Dict[str, Any]) -> Dict[str, Any]:
+    """Columnas filtrables (``languages``, ``category``, ``tags``) de una herramienta.
+
+    Se consideran los campos de primer nivel, ``metadata`` y las claves de
+    ``localization``; todos los valores se guardan en minúsculas.
+    """
+
+    metadata = tool.get("metadata") if isinstance(tool.get("metadata"), dict) else {}
+    languages: List[str] = []
+    for source in (tool, metadata):
+        languages += facet_values(source.get("language"))
+        languages += facet_values(source.get("languages"))
+    localization = tool.get("localization")
+    if isinstance(localization, dict):
+        languages += facet_values(list(localization))
+    tags, category = tool_facets(tool)
+    return {
+        "languages": list(dict.fromkeys(languages)) or [UNDETERMINED_LANGUAGE],
+        "category": category,
+        "tags": tags,
+    }
+
+
+def parent_of(record: Dict[str, Any]) -> str:
+    """Herramienta a la que pertenece una fila (ella misma si no es hija)."""
+    return str(record.get("parent_id") or record["id"])
+
+
+def aggregate_rows(
+    rows: Sequence[SearchRow], weights: Optional[Dict[str, float]] = None
+) -> List[SearchRow]:
+    """Agrupar filas por herramienta quedándose con la mejor (max-sim).
+
+    Con ``weights`` la similitud de cada fila se multiplica antes por el peso
+    de su campo (``description``, ``when_to_use``, ``parameters``...; el
+    sufijo de idioma ``@es`` no cuenta). Las filas sin ``parent_id`` se
+    tratan como herramientas independientes.
+    """
+
+    best: Dict[Any, SearchRow] = {}
+    for position, row in enumerate(rows):
+        score = row.get("score")
+        if weights and score is not None:
+            field = str(row.get("field") or "").split("@", 1)[0]
+            score = float(score) * weights.get(field, 1.0)
+            row = dict(row, score=score)
+        key = row.get("parent_id") or ("row", position)
+        current = best.get(key)
+        if current is None or (
+            score is not None
+            and (current.get("score") is None or score > current["score"])
+        ):
+            best[key] = row
+    return sorted(
+        best.values(),
+        key=lambda row: -row["score"] if row.get("score") is not None else 0.0,
+    )
+
+
+@dataclass
+class SearchFilter:
+    """Filtros de búsqueda aplicados antes de puntuar (prefiltrado).
+
+    ``tags`` coincide si la herramienta tiene alguna de las etiquetas y
+    ``language`` incluye las herramientas sin idioma declarado. ``where`` es
+    una cláusula SQL adicional que solo entiende LanceDB.
+    """
+
+    language: Optional[str] = None
+    category: Optional[str] = None
+    tags: Sequence[str] = ()
+    where: Optional[str] = None
+
+    @classmethod
+    def coerce(cls, value: Union["SearchFilter", str, None]) -> "SearchFilter":
+        if isinstance(value, SearchFilter):
+            return value
+        if value is None or value.strip().lower() == "true":
+            return cls()
+        return cls(where=value)
+
+    def facets(self) -> Iterator[Tuple[str, List[str]]]:
+        if self.language:
+            yield "languages", facet_values(self.language) + [UNDETERMINED_LANGUAGE]
+        if self.category:
+            yield "category", facet_values(self.category)
+        tags = facet_values(self.tags)
+        if tags:
+            yield "tags", tags
+
+    def to_sql(self) -> Optional[str]:
+        clauses: List[str] = []
+        for name, values in self.facets():
+            quoted = ", ".join(_quote(value) for value in values)
+            if name == "category":
+                clauses.append(f"category IN ({quoted})")
+            else:
+                clauses.append(f"array_has_any({name}, [{quoted}])")
+        if self.where and self.where.strip().lower() != "true":
+            clauses.append(f"({self.where})")
+        return " AND ".join(clauses) or None
+
+
+@dataclass
+class AnnIndexConfig:
+    """Ciclo de vida del índice ANN de la tabla LanceDB.
+
+    Por debajo de ``min_rows`` la búsqueda exhaustiva es más rápida que
+    cualquier índice y no se crea ninguno. A partir de ahí se construye un
+    índice ``index_type`` y se reconstruye tras ``rebuild_after`` filas
+    escritas (las filas nuevas se buscan de forma exacta hasta entonces).
+    ``nprobes`` y ``refine_factor`` son los valores por defecto de cada
+    consulta y pueden ajustarse por búsqueda.
+    """
+
+    index_type: str = "IVF_PQ"
+    min_rows: int = 100_000
+    rebuild_after: int = 50_000
+    metric: str = "L2"
+    num_partitions: Optional[int] = None
+    num_sub_vectors: Optional[int] = None
+    hnsw_m: int = 20
+    hnsw_ef_construction: int = 300
+    nprobes: Optional[int] = None
+    refine_factor: Optional[int] = None
+    background: bool = True
+
+    def __post_init__(self) -> None:
+        if self.index_type == "HNSW":
+            self.index_type = "IVF_HNSW_SQ"
+        if self.index_type not in ANN_INDEX_TYPES:
+            raise ValueError(
+                f"Tipo de índice ANN desconocido: {self.index_type}. "
+                f"Opciones: {', '.join(ANN_INDEX_TYPES)}"
+            )
+
+    def partitions_for(self, rows: int) -> int:
+        return self.num_partitions or max(1, int(math.sqrt(rows)))
+
+    def sub_vectors_for(self, dimension: int) -> int:
+        """Subvectores PQ: divisor de ``dimension`` cercano a ``dimension / 8``."""
+        if self.num_sub_vectors:
+            return self.num_sub_vectors
+        target = max(1, dimension // 8)
+        for candidate in range(target, 0, -1):
+            if dimension % candidate == 0:
+                return candidate
+        return 1
+
+
+class VectorBackend(ABC):
+    """Interfaz común de almacenamiento y búsqueda de vectores."""
+
+    name = "base"
+
+    @abstractmethod
+    def connect(self) -> None:
+        """Abrir la conexión o el directorio de datos."""
+
+    @abstractmethod
+    def has_table(self) -> bool:
+        """Indicar si la colección de herramientas está lista para usarse."""
+
+    @abstractmethod
+    def ensure_table(self, dimension: Optional[int]) -> None:
+        """Abrir o crear la colección para vectores de ``dimension``."""
+
+    @abstractmethod
+    def create(self, records: Sequence[Dict[str, Any]]) -> None:
+        """Reemplazar la colección completa por ``records``."""
+
+    @abstractmethod
+    def replace(self, records: Sequence[Dict[str, Any]]) -> int:
+        """Insertar o sustituir en bloque las herramientas de ``records``.
+
+        Todas las filas previas de cada herramienta (``parent_id``) se
+        sustituyen, aunque la nueva versión tenga otro número de vectores.
+        """
+
+    @abstractmethod
+    def search(
+        self,
+        vector: np.ndarray,
+        limit: int,
+        filters: Union[SearchFilter, str, None] = None,
+        *,
+        min_score: Optional[float] = None,
+        nprobes: Optional[int] = None,
+        refine_factor: Optional[int] = None,
+    ) -> List[SearchRow]:
+        """Devolver hasta ``limit`` filas ordenadas por similitud.
+
+        Cada fila lleva ``payload``, ``score``, ``parent_id`` y ``field``; una
+        herramienta multivector puede aparecer varias veces (ver
+        ``aggregate_rows``). ``filters`` y ``min_score`` se aplican antes del
+        top-k, así que se devuelven ``limit`` filas siempre que existan
+        suficientes coincidencias. ``nprobes`` y ``refine_factor`` solo
+        afectan a backends con índice ANN.
+        """
+
+    @abstractmethod
+    def get(self, tool_id: str) -> Optional[Any]:
+        """Payload de la herramienta ``tool_id`` o ``None``."""
+
+    @abstractmethod
+    def delete(self, tool_id: str) -> bool:
+        """Eliminar la herramienta ``tool_id`` con todas sus filas."""
+
+    def delete_many(self, tool_ids: Iterable[str]) -> int:
+        """Eliminar varias herramientas; devuelve cuántas existían.
+
+        Por defecto llama a ``delete`` con cada una; los backends la sustituyen
+        por una sola escritura.
+        """
+        return sum(1 for tool_id in dict.fromkeys(tool_ids) if self.delete(tool_id))
+
+    @abstractmethod
+    def version_hashes(
+        self, tool_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, str]:
+        """Columna ``version_hash`` de cada herramienta (de todas sin ``tool_ids``).
+
+        Las herramientas que no vienen del catálogo tienen un hash vacío.
+        """
+
+    @abstractmethod
+    def count(self) -> int:
+        """Número de herramientas almacenadas (no de vectores)."""
+
+    @abstractmethod
+    def payloads(self) -> Iterator[Any]:
+        """Iterar los payloads de todas las herramientas, uno por herramienta."""
+
+    def build_index(self, *, wait: bool = True) -> bool:
+        """Construir (o reconstruir) el índice ANN; ``False`` si no aplica."""
+        return False
+
+    def index_status(self) -> Dict[str, Any]:
+        """Estado del índice ANN (tipo, filas indexadas, escrituras pendientes)."""
+        return {"index_type": None, "exact": True}
+
+    def flush(self) -> None:
+        """Persistir las escrituras pendientes (por defecto se escriben al momento)."""
+
+    # ------------------------------------------------------------------
+    # Metadatos de la colección (proveedor de embeddings, dimensión...)
+    @abstractmethod
+    def read_metadata(self) -> Dict[str, Any]:
+        """Metadatos guardados en la propia colección (vacío si no hay)."""
+
+    @abstractmethod
+    def write_metadata(self, metadata: Dict[str, Any]) -> None:
+        """Sustituir los metadatos guardados en la colección."""
+
+
+def _quote(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+# Columna con la herramienta serializada; junto con la herramienta y el campo
+# de cada fila es lo único que se lee en consultas
+PAYLOAD_COLUMN = "raw_data"
+RESULT_COLUMNS = [PAYLOAD_COLUMN, "parent_id", "field"]
+# La fila principal de cada herramienta es la que tiene su mismo id
+PRIMARY_ROWS = "id = parent_id"
+DEFAULT_SCAN_BATCH_SIZE = 1024
+# Clave de los metadatos del esquema Arrow con los metadatos de la colección
+SCHEMA_METADATA_KEY = "atdf"
+
+
+def _schema_metadata(schema: Any) -> Dict[str, Any]:
+    """Metadatos de la colección guardados en un esquema Arrow."""
+    stored = getattr(schema, "metadata", None)
+    if not isinstance(stored, dict):
+        return {}
+    raw = stored.get(SCHEMA_METADATA_KEY.encode()) or stored.get(SCHEMA_METADATA_KEY)
+    if not raw:
+        return {}
+    try:
+        return dict(json_codec.loads(raw))
+    except (TypeError, ValueError):
+        logger.warning("Metadatos ilegibles en el esquema de la tabla; se ignoran")
+        return {}
+
+
+def _arrow_columns(result: Any) -> Dict[str, List[Any]]:
+    """Columnas de una tabla o lote Arrow como listas Python, sin pasar por pandas."""
+    return {
+        name: result.column(index).to_pylist()
+        for index, name in enumerate(result.column_names)
+    }
+
+
+# ----------------------------------------------------------------------
+# Cuantización escalar
+VECTOR_PRECISIONS = ("float32", "float16", "int8")
+DEFAULT_RESCORE_FACTOR = 4
+# Filas convertidas a float32 por bloque al recorrer una matriz cuantizada;
+# bloques pequeños se quedan en caché entre la conversión y el producto
+SCAN_BLOCK_ROWS = 1024
+
+
+def quantize(
+    matrix: np.ndarray, precision: str
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Codificar filas float32 en ``precision``.
+
+    ``int8`` usa una escala por fila (máximo absoluto / 127), que se devuelve
+    junto a los códigos; ``float16`` no necesita escala.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if precision == "float16":
+        return matrix.astype(np.float16), None
+    if precision == "int8":
+        peaks = np.abs(matrix).max(axis=1) if len(matrix) else np.zeros(0)
+        scales = np.where(peaks > 0, peaks / 127.0, 1.0).astype(np.float32)
+        codes = np.rint(matrix / scales[:, None]).astype(np.int8)
+        return codes, scales
+    return matrix, None
+
+
+def dequantize(codes: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    """Aproximación float32 de ``codes`` (inversa de ``quantize``)."""
+    matrix = np.asarray(codes, dtype=np.float32)
+    return matrix * scales[:, None] if scales is not None else matrix
+
+
+def quantized_scores(
+    codes: np.ndarray,
+    scales: Optional[np.ndarray],
+    query: np.ndarray,
+    rows: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Productos escalares aproximados de ``query`` con las filas cuantizadas.
+
+    Los códigos se convierten a float32 por bloques de ``SCAN_BLOCK_ROWS`` para
+    no materializar la matriz completa en precisión simple.
+    """
+    total = codes.shape[0] if rows is None else len(rows)
+    scores = np.empty(total, dtype=np.float32)
+    for start in range(0, total, SCAN_BLOCK_ROWS):
+        stop = min(start + SCAN_BLOCK_ROWS, total)
+        block = codes[start:stop] if rows is None else codes[rows[start:stop]]
+        scores[start:stop] = np.asarray(block, dtype=np.float32) @ query
+    if scales is not None:
+        scores *= scales if rows is None else scales[rows]
+    return scores
+
+
+def _top(scores: np.ndarray, limit: int) -> np.ndarray:
+    """Posiciones de las ``limit`` puntuaciones más altas, ordenadas."""
+    if limit <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if limit < len(scores):
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        return best[np.argsort(-scores[best], kind="stable")]
+    return np.argsort(-scores, kind="stable")
+
+
+class LanceDBBackend(VectorBackend):
+    """Backend sobre una tabla LanceDB.
+
+    Con ``precision="float16"`` la columna ``vector`` se guarda en media
+    precisión. LanceDB no busca sobre vectores int8; para cuantizar más se
+    usan los índices ``IVF_PQ``/``IVF_HNSW_SQ`` y ``refine_factor`` para
+    reordenar con los vectores completos.
+    """
+
+    name = "lancedb"
+
+    def __init__(
+        self,
+        db_path: str,
+        table_name: str,
+        connector: Callable[[str], Any],
+        ann: Optional[AnnIndexConfig] = None,
+        precision: str = "float32",
+    ) -> None:
+        if precision not in ("float32", "float16"):
+            raise ValueError(
+                f"LanceDB solo admite vectores float32 o float16, no {precision}; "
+                "usa un índice IVF_PQ o IVF_HNSW_SQ para cuantizar más"
+            )
+        self.db_path = db_path
+        self.table_name = table_name
+        self._connector = connector
+        self.ann = ann
+        self.precision = precision
+        self.db: Any = None
+        self.table: Any = None
+        self.dimension: Optional[int] = None
+        self._index_lock = threading.Lock()
+        self._index_thread: Optional[threading.Thread] = None
+        self._indexed_type: Optional[str] = None
+        self._indexed_rows = 0
+        self._writes_since_index = 0
+        self.last_index_seconds: Optional[float] = None
+        self._metadata: Optional[Dict[str, Any]] = None
+
+    def connect(self) -> None:
+        if self.db is None:
+            self.db = self._connector(self.db_path)
+
+    def has_table(self) -> bool:
+        return self.table is not None
+
+    def _require_table(self) -> Any:
+        if self.table is None:
+            raise RuntimeError("La tabla LanceDB no está lista")
+        return self.table
+
+    def ensure_table(self, dimension: Optional[int]) -> None:
+        if self.db is None:
+            raise RuntimeError("La base de datos LanceDB no está inicializada")
+
+        if self.table_name in self.db.table_names():
+            self.table = self.db.open_table(self.table_name)
+            self.dimension = dimension
+            self._detect_index()
+            return
+
+        if dimension is None:
+            raise RuntimeError("La dimensión del embedding es desconocida")
+
+        init_data = [
+            {
+                "id": "_init_",
+                "name": "_init_",
+                "description": "_init_",
+                "parameters": [],
+                "vector": np.zeros(dimension, dtype=self.precision),
+                "raw_data": "{}",
+                "parent_id": "_init_",
+                "field": "_init_",
+                "version_hash": "",
+                "languages": [UNDETERMINED_LANGUAGE],
+                "category": "_init_",
+                "tags": ["_init_"],
+            }
+        ]
+
+        self.table = self.db.create_table(self.table_name, data=init_data)
+        self.dimension = dimension
+        # Limpiar el registro temporal utilizado para inferir el esquema
+        self.table.delete("id = '_init_'")
+        self._store_metadata()
+
+    def create(self, records: Sequence[Dict[str, Any]]) -> None:
+        if self.db is None:
+            raise RuntimeError("La base de datos LanceDB no está inicializada")
+
+        records = self._cast(records)
+        kwargs: Dict[str, Any] = {"data": records, "mode": "overwrite"}
+        schema = self._schema(len(records[0]["vector"])) if records else None
+        if schema is not None:
+            kwargs["schema"] = schema
+        self.table = self.db.create_table(self.table_name, **kwargs)
+        # La tabla sobrescrita no conserva índices
+        self._indexed_type = None
+        self._indexed_rows = 0
+        self._writes_since_index = 0
+        if records:
+            self.dimension = len(records[0]["vector"])
+        self._store_metadata()
+        self._maybe_index(len(records))
+
+    def replace(self, records: Sequence[Dict[str, Any]]) -> int:
+        table = self._require_table()
+        if not records:
+            return 0
+        parents = ", ".join(
+            _quote(parent) for parent in dict.fromkeys(map(parent_of, records))
+        )
+        table.delete(f"parent_id IN ({parents})")
+        table.add(self._cast(records))
+        self._writes_since_index += len(records)
+        if self.dimension is None:
+            self.dimension = len(records[0]["vector"])
+        self._maybe_index()
+        return len(records)
+
+    def _cast(self, records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.precision == "float32":
+            return list(records)
+        return [
+            dict(record, vector=np.asarray(record["vector"], dtype=self.precision))
+            for record in records
+        ]
+
+    def _schema(self, dimension: int) -> Any:
+        """Esquema Arrow explícito: las listas vacías no bastan para inferir tipos."""
+        try:
+            import pyarrow as pa
+        except ImportError:  # pragma: no cover - pyarrow llega con LanceDB
+            return None
+        element = pa.float16() if self.precision == "float16" else pa.float32()
+        return pa.schema(
+            [
+                pa.field("id", pa.string()),
+                pa.field("name", pa.string()),
+                pa.field("description", pa.string()),
+                pa.field("parameters", pa.string()),
+                pa.field("vector", pa.list_(element, dimension)),
+                pa.field("raw_data", pa.string()),
+                pa.field("parent_id", pa.string()),
+                pa.field("field", pa.string()),
+                pa.field("version_hash", pa.string()),
+                pa.field("languages", pa.list_(pa.string())),
+                pa.field("category", pa.string()),
+                pa.field("tags", pa.list_(pa.string())),
+            ]
+        )
+
+    # ------------------------------------------------------------------
+    # Metadatos: viajan en el esquema de la tabla, no en archivos aparte
+    def read_metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            table = self.table
+            if table is None:
+                if self.db is None or self.table_name not in self.db.table_names():
+                    return {}
+                table = self.db.open_table(self.table_name)
+            self._metadata = _schema_metadata(table.schema)
+        return dict(self._metadata)
+
+    def write_metadata(self, metadata: Dict[str, Any]) -> None:
+        metadata = dict(metadata)
+        if metadata == self._metadata:
+            return
+        self._metadata = metadata
+        # Sin tabla se guardan al crearla
+        if self.table is not None:
+            self._store_metadata()
+
+    def _store_metadata(self) -> None:
+        if not self._metadata or self.table is None:
+            return
+        try:
+            self.table.to_lance().replace_schema_metadata(
+                {SCHEMA_METADATA_KEY: json_codec.dumps(self._metadata)}
+            )
+        except (AttributeError, ImportError):
+            logger.warning(
+                "No se pueden guardar metadatos en el esquema de '%s'; "
+                "instala pylance para conservarlos entre procesos",
+                self.table_name,
+            )
+
+    # ------------------------------------------------------------------
+    # Índice ANN
+    def _detect_index(self) -> None:
+        list_indices = getattr(self.table, "list_indices", None)
+        if not callable(list_indices):
+            return
+        try:
+            indices = list(list_indices())
+        except Exception:  # pragma: no cover - depende de la versión de LanceDB
+            logger.debug("No se pudieron listar los índices de la tabla")
+            return
+        for index in indices:
+            columns = getattr(index, "columns", None) or []
+            if "vector" in columns:
+                self._indexed_type = str(getattr(index, "index_type", "ANN"))
+                count = self.row_count()
+                self._indexed_rows = count if isinstance(count, int) else 0
+                return
+
+    def _maybe_index(self, rows: Optional[int] = None) -> None:
+        config = self.ann
+        if config is None:
+            return
+        if self._indexed_type and self._writes_since_index < config.rebuild_after:
+            return
+        if rows is None:
+            count = self.row_count()
+            if not isinstance(count, int):
+                return
+            rows = count
+        if rows < config.min_rows:
+            return
+        self.build_index(wait=not config.background)
+
+    def build_index(self, *, wait: bool = True) -> bool:
+        """Construir el índice ANN configurado, en segundo plano si ``wait`` es falso.
+
+        Solo se ejecuta una construcción a la vez; las búsquedas siguen
+        funcionando durante la reconstrucción sobre la versión anterior.
+        """
+
+        if self.ann is None or self.table is None:
+            return False
+        running = self._index_thread
+        if running is not None and running.is_alive():
+            if wait:
+                running.join()
+            return True
+        if wait:
+            self._build_index()
+            return True
+
+        self._index_thread = threading.Thread(
+            target=self._build_index, name=f"ann-index-{self.table_name}", daemon=True
+        )
+        self._index_thread.start()
+        return True
+
+    def wait_for_index(self, timeout: Optional[float] = None) -> None:
+        thread = self._index_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _build_index(self) -> None:
+        config = self.ann
+        table = self.table
+        if config is None or table is None:
+            return
+        with self._index_lock:
+            count = self.row_count()
+            rows = count if isinstance(count, int) else 0
+            pending = self._writes_since_index
+            dimension = self.dimension or 0
+            params: Dict[str, Any] = {
+                "metric": config.metric,
+                "vector_column_name": "vector",
+                "replace": True,
+                "index_type": config.index_type,
+                "num_partitions": config.partitions_for(rows),
+            }
+            if config.index_type.endswith("PQ") and dimension:
+                params["num_sub_vectors"] = config.sub_vectors_for(dimension)
+            if "HNSW" in config.index_type:
+                params["m"] = config.hnsw_m
+                params["ef_construction"] = config.hnsw_ef_construction
+
+            started = time.perf_counter()
+            try:
+                table.create_index(**params)
+            except Exception:
+                logger.exception(
+                    "Falló la construcción del índice %s", config.index_type
+                )
+                return
+            self.last_index_seconds = round(time.perf_counter() - started, 4)
+            self._build_scalar_indices(table)
+            self._indexed_type = config.index_type
+            self._indexed_rows = rows
+            # Las escrituras concurrentes con la construcción cuentan para la siguiente
+            self._writes_since_index = max(0, self._writes_since_index - pending)
+            logger.info(
+                "Índice %s construido sobre %d filas en %.2fs",
+                config.index_type,
+                rows,
+                self.last_index_seconds,
+            )
+
+    @staticmethod
+    def _build_scalar_indices(table: Any) -> None:
+        """Índices escalares para que el prefiltrado no recorra la tabla."""
+        create = getattr(table, "create_scalar_index", None)
+        if not callable(create):
+            return
+        for column, index_type in (
+            ("parent_id", "BTREE"),
+            ("category", "BITMAP"),
+            ("languages", "LABEL_LIST"),
+            ("tags", "LABEL_LIST"),
+        ):
+            try:
+                create(column, index_type=index_type, replace=True)
+            except Exception:  # pragma: no cover - depende de la versión de LanceDB
+                logger.debug("No se pudo crear el índice escalar de %s", column)
+
+    def index_status(self) -> Dict[str, Any]:
+        thread = self._index_thread
+        return {
+            "index_type": self._indexed_type,
+            "exact": self._indexed_type is None,
+            "indexed_rows": self._indexed_rows,
+            "writes_since_index": self._writes_since_index,
+            "building": bool(thread is not None and thread.is_alive()),
+            "last_build_seconds": self.last_index_seconds,
+        }
+
+    # ------------------------------------------------------------------
+    # Lectura
+    def search(
+        self,
+        vector: np.ndarray,
+        limit: int,
+        filters: Union[SearchFilter, str, None] = None,
+        *,
+        min_score: Optional[float] = None,
+        nprobes: Optional[int] = None,
+        refine_factor: Optional[int] = None,
+    ) -> List[SearchRow]:
+        search = self._require_table().search(vector).limit(limit)
+        where = SearchFilter.coerce(filters).to_sql()
+        if where:
+            search = search.where(where, prefilter=True)
+        if min_score is not None and hasattr(search, "distance_range"):
+            # score = 1 - distancia / 2, así que el umbral acota la distancia
+            search = search.distance_range(upper_bound=2.0 * (1.0 - float(min_score)))
+        if self.ann is not None:
+            nprobes = nprobes if nprobes is not None else self.ann.nprobes
+            refine_factor = (
+                refine_factor if refine_factor is not None else self.ann.refine_factor
+            )
+        if nprobes:
+            search = search.nprobes(int(nprobes))
+        if refine_factor:
+            search = search.refine_factor(int(refine_factor))
+
+        # LanceDB añade siempre la columna _distance a las búsquedas vectoriales
+        columns = _arrow_columns(search.select(RESULT_COLUMNS).to_arrow())
+        payloads = columns.get(PAYLOAD_COLUMN, [])
+        missing = [None] * len(payloads)
+        return [
+            {
+                "payload": payload,
+                "score": (
+                    None if distance is None else 1.0 - min(float(distance), 2.0) / 2.0
+                ),
+                "parent_id": parent,
+                "field": field,
+            }
+            for payload, distance, parent, field in zip(
+                payloads,
+                columns.get("_distance") or missing,
+                columns.get("parent_id") or missing,
+                columns.get("field") or missing,
+            )
+        ]
+
+    def get(self, tool_id: str) -> Optional[Any]:
+        query = (
+            self._require_table()
+            .search()
+            .where(f"id = {_quote(tool_id)}")
+            .select([PAYLOAD_COLUMN])
+            .limit(1)
+        )
+        payloads = _arrow_columns(query.to_arrow()).get(PAYLOAD_COLUMN) or []
+        return payloads[0] if payloads else None
+
+    def delete(self, tool_id: str) -> bool:
+        # ``Table.delete`` no informa de las filas borradas: se cuentan antes
+        table = self._require_table()
+        predicate = f"parent_id = {_quote(tool_id)}"
+        if not table.count_rows(predicate):
+            return False
+        table.delete(predicate)
+        return True
+
+    def delete_many(self, tool_ids: Iterable[str]) -> int:
+        table = self._require_table()
+        parents = ", ".join(_quote(tool_id) for tool_id in dict.fromkeys(tool_ids))
+        if not parents:
+            return 0
+        predicate = f"parent_id IN ({parents})"
+        deleted = int(table.count_rows(f"{predicate} AND {PRIMARY_ROWS}"))
+        if deleted or table.count_rows(predicate):
+            table.delete(predicate)
+        return deleted
+
+    def version_hashes(
+        self, tool_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, str]:
+        table = self._require_table()
+        predicate = PRIMARY_ROWS
+        if tool_ids is not None:
+            parents = ", ".join(_quote(tool_id) for tool_id in dict.fromkeys(tool_ids))
+            if not parents:
+                return {}
+            predicate = f"{PRIMARY_ROWS} AND parent_id IN ({parents})"
+        rows = int(table.count_rows(predicate))
+        if not rows:
+            return {}
+        query = (
+            table.search()
+            .where(predicate)
+            .select(["parent_id", "version_hash"])
+            .limit(rows)
+        )
+        columns = _arrow_columns(query.to_arrow())
+        return {
+            str(parent): value or ""
+            for parent, value in zip(
+                columns.get("parent_id") or [], columns.get("version_hash") or []
+            )
+        }
+
+    def count(self) -> int:
+        return int(self._require_table().count_rows(PRIMARY_ROWS))
+
+    def row_count(self) -> int:
+        """Filas (vectores) de la tabla; es lo que dimensiona el índice ANN."""
+        return int(self._require_table().count_rows())
+
+    def payloads(self, batch_size: int = DEFAULT_SCAN_BATCH_SIZE) -> Iterator[Any]:
+        """Recorrer la tabla por lotes Arrow leyendo solo la columna del payload."""
+        table = self._require_table()
+        try:
+            batches = table.to_lance().to_batches(
+                columns=[PAYLOAD_COLUMN], filter=PRIMARY_ROWS, batch_size=batch_size
+            )
+        except (AttributeError, ImportError):
+            # Sin pylance: la tabla Arrow se lee completa pero solo con esas columnas
+            batches = (
+                table.to_arrow()
+                .select([PAYLOAD_COLUMN, "id", "parent_id"])
+                .to_batches(max_chunksize=batch_size)
+            )
+        for batch in batches:
+            columns = _arrow_columns(batch)
+            payloads = columns[PAYLOAD_COLUMN]
+            if "parent_id" not in columns:
+                yield from payloads
+                continue
+            for payload, row_id, parent in zip(
+                payloads, columns["id"], columns["parent_id"]
+            ):
+                if row_id == parent:
+                    yield payload
+
+
+# Fracción de filas borradas a partir de la cual se compacta la matriz
+COMPACT_RATIO = 0.25
+# Filas libres mínimas que se reservan cada vez que crece la matriz
+MIN_SPARE_ROWS = 64
+
+
+def _grow(array: Optional[np.ndarray], rows: int, capacity: int) -> Any:
+    """Copia escribible de las ``rows`` primeras filas con hueco para ``capacity``."""
+    if array is None:
+        return None
+    grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[:rows] = array[:rows]
+    return grown
+
+
+class NumpyBackend(VectorBackend):
+    """Backend en proceso basado en una matriz NumPy de vectores normalizados.
+
+    Los vectores se guardan como filas L2-normalizadas en una matriz
+    contigua, de modo que la similitud coseno con la consulta es un único
+    producto matriz-vector y el top-k se obtiene con ``argpartition``. La
+    colección se persiste en ``<tabla>.vectors.npy`` (abierto con ``mmap``
+    al cargar) y ``<tabla>.meta.json`` (ids, payloads, columnas de filtro y
+    de herramienta padre y los metadatos de la colección).
+    Los filtros estructurados se resuelven con índices invertidos por valor
+    antes de puntuar, igual que el prefiltrado de LanceDB.
+
+    Las escrituras no copian la colección: las filas nuevas ocupan la
+    capacidad libre al final de la matriz (que crece duplicándose), una
+    herramienta con las mismas filas y facetas se sobrescribe en su sitio y
+    los borrados solo marcan las filas como muertas; la matriz se compacta
+    cuando superan ``COMPACT_RATIO``. Nada se escribe a disco hasta
+    ``flush()``.
+
+    Con ``precision`` ``float16`` o ``int8`` (escala por fila) el recorrido
+    exhaustivo usa una copia cuantizada en ``<tabla>.vectors.<precision>.npy``.
+    Si ``rescore_factor`` es positivo se conserva también la matriz float32 y
+    los ``limit * rescore_factor`` mejores candidatos se vuelven a puntuar con
+    ella; con ``0`` solo se guarda la copia cuantizada.
+    """
+
+    name = "numpy"
+
+    def __init__(
+        self,
+        db_path: Optional[str],
+        table_name: str,
+        *,
+        precision: str = "float32",
+        rescore_factor: int = DEFAULT_RESCORE_FACTOR,
+    ) -> None:
+        if precision not in VECTOR_PRECISIONS:
+            raise ValueError(
+                f"Precisión de vectores desconocida: {precision}. "
+                f"Opciones: {', '.join(VECTOR_PRECISIONS)}"
+            )
+        self.db_path = db_path
+        self.table_name = table_name
+        self.precision = precision
+        self.rescore_factor = max(0, int(rescore_factor))
+        self._ids: List[str] = []
+        self._payloads: List[str] = []
+        self._columns: List[Dict[str, Any]] = []
+        self._size = 0
+        self._live = np.zeros(0, dtype=bool)
+        self._dead = 0
+        # Filas de cada herramienta y fila principal (la de su mismo id)
+        self._rows: Dict[str, List[int]] = {}
+        self._primary: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._facet_rows: Dict[Tuple[str, str], np.ndarray] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._dimension = 0
+        self._metadata: Optional[Dict[str, Any]] = None
+        self._ready = False
+        self._dirty = False
+        # Las búsquedas puntúan fuera del cerrojo sobre una instantánea (filas
+        # hasta ``_size`` y máscara de vivas). Añadir filas o marcarlas como
+        # muertas no la altera; sobrescribir en sitio solo se hace sin
+        # búsquedas en curso (``_readers``) y compactar crea matrices nuevas.
+        self._readers = 0
+        self._lock = threading.RLock()
+
+    @property
+    def _keeps_float32(self) -> bool:
+        return self.precision == "float32" or self.rescore_factor > 0
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    def _path(self, suffix: str) -> Optional[Path]:
+        if not self.db_path:
+            return None
+        return Path(self.db_path) / f"{self.table_name}.{suffix}"
+
+    @property
+    def _vectors_path(self) -> Optional[Path]:
+        return self._path("vectors.npy")
+
+    @property
+    def _meta_path(self) -> Optional[Path]:
+        return self._path("meta.json")
+
+    def _codes_path(self, precision: str) -> Optional[Path]:
+        return self._path(f"vectors.{precision}.npy")
+
+    def connect(self) -> None:
+        if self.db_path:
+            Path(self.db_path).mkdir(parents=True, exist_ok=True)
+
+    def has_table(self) -> bool:
+        return self._ready
+
+    def _load_vectors(self, meta: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Matriz float32 persistida o la aproximación de la copia cuantizada."""
+        vectors_path = self._vectors_path
+        if vectors_path is not None and vectors_path.exists():
+            return np.load(vectors_path, mmap_mode="r")
+        stored = meta.get("precision", "float32")
+        codes_path = self._codes_path(stored)
+        if stored == "float32" or codes_path is None or not codes_path.exists():
+            return None
+        scales_path = self._path("scales.npy")
+        scales = np.load(scales_path) if stored == "int8" and scales_path else None
+        return dequantize(np.load(codes_path, mmap_mode="r"), scales)
+
+    def _load_codes(self, meta: Dict[str, Any]) -> Tuple[Any, Any]:
+        codes_path = self._codes_path(self.precision)
+        scales_path = self._path("scales.npy")
+        if (
+            meta.get("precision") == self.precision
+            and codes_path is not None
+            and codes_path.exists()
+            and (self.precision != "int8" or (scales_path and scales_path.exists()))
+        ):
+            codes = np.load(codes_path, mmap_mode="r")
+            scales = np.load(scales_path) if self.precision == "int8" else None
+            return codes, scales
+        return None, None
+
+    def ensure_table(self, dimension: Optional[int]) -> None:
+        with self._lock:
+            if self._ready:
+                return
+            meta_path = self._meta_path
+            if meta_path and meta_path.exists():
+                meta = json_codec.loads(meta_path.read_bytes())
+                self._metadata = dict(meta.get("metadata") or {})
+                matrix = self._load_vectors(meta)
+                if matrix is not None and (
+                    dimension is None or matrix.shape[1] == dimension
+                ):
+                    ids = meta.get("ids", [])
+                    self._set_rows(
+                        ids,
+                        meta.get("payloads", []),
+                        meta.get("columns") or [filter_columns({}) for _ in ids],
+                        matrix,
+                        self._load_codes(meta),
+                    )
+                    self._ready = True
+                    if meta.get("precision", "float32") != self.precision:
+                        self._save()
+                    return
+                if matrix is not None:
+                    logger.warning(
+                        "Dimensión persistida %s distinta de %s; "
+                        "se recrea la colección",
+                        matrix.shape[1],
+                        dimension,
+                    )
+
+            if dimension is None:
+                raise RuntimeError("La dimensión del embedding es desconocida")
+            self._set_rows([], [], [], np.zeros((0, dimension), dtype=np.float32))
+            self._ready = True
+
+    def _set_rows(
+        self,
+        ids: List[str],
+        payloads: List[str],
+        columns: List[Dict[str, Any]],
+        matrix: np.ndarray,
+        codes: Tuple[Any, Any] = (None, None),
+    ) -> None:
+        """Sustituir la colección completa (carga, ``create`` y compactación).
+
+        Se crean listas y matrices nuevas, así que las búsquedas en curso
+        siguen usando su instantánea.
+        """
+        self._ids = list(ids)
+        self._payloads = list(payloads)
+        self._columns = list(columns)
+        self._size = len(self._ids)
+        self._live = np.ones(self._size, dtype=bool)
+        self._dead = 0
+        self._rows = {}
+        self._primary = {}
+        self._postings = {"languages": {}, "category": {}, "tags": {}}
+        self._facet_rows = {}
+        for row in range(self._size):
+            self._index_row(row)
+        self._dimension = int(matrix.shape[1])
+        if self.precision == "float32":
+            self._codes, self._scales = None, None
+        elif codes[0] is not None:
+            self._codes, self._scales = codes
+        else:
+            self._codes, self._scales = quantize(matrix, self.precision)
+        self._matrix = matrix if self._keeps_float32 else None
+
+    def _save(self) -> None:
+        meta_path = self._meta_path
+        if meta_path is None:
+            return
+        size = self._size
+        arrays: List[Tuple[Optional[Path], Optional[np.ndarray]]] = [
+            (self._vectors_path, self._matrix),
+            (self._codes_path(self.precision), self._codes),
+            (self._path("scales.npy"), self._scales),
+        ]
+        for path, array in arrays:
+            if path is None or array is None:
+                continue
+            tmp_path = path.with_suffix(".tmp.npy")
+            np.save(tmp_path, np.ascontiguousarray(array[:size]))
+            os.replace(tmp_path, path)
+        tmp_meta = meta_path.with_suffix(".tmp")
+        tmp_meta.write_text(
+            json_codec.dumps(
+                {
+                    "ids": self._ids,
+                    "payloads": self._payloads,
+                    "columns": self._columns,
+                    "precision": self.precision,
+                    "metadata": self._metadata or {},
+                }
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_meta, meta_path)
+
+    def flush(self) -> None:
+        """Compactar las filas borradas y persistir la colección si cambió."""
+        with self._lock:
+            if not self._dirty:
+                return
+            if self._dead:
+                self._compact()
+            self._save()
+            self._dirty = False
+
+    def read_metadata(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._metadata is None:
+                meta_path = self._meta_path
+                if meta_path is None or not meta_path.exists():
+                    return {}
+                meta = json_codec.loads(meta_path.read_bytes())
+                self._metadata = dict(meta.get("metadata") or {})
+            return dict(self._metadata)
+
+    def write_metadata(self, metadata: Dict[str, Any]) -> None:
+        with self._lock:
+            metadata = dict(metadata)
+            if metadata == self._metadata:
+                return
+            self._metadata = metadata
+            # Sin colección abierta se guardan con la próxima escritura
+            if self._ready:
+                self._dirty = True
+
+    def memory_bytes(self) -> int:
+        """Bytes de los vectores que recorre cada búsqueda (sin el reordenado)."""
+        scanned = self._codes if self._codes is not None else self._matrix
+        size = self._size
+        total = 0 if scanned is None else int(scanned[:size].nbytes)
+        return total + (0 if self._scales is None else int(self._scales[:size].nbytes))
+
+    # ------------------------------------------------------------------
+    # Escritura
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(vectors / norms)
+
+    @staticmethod
+    def _payload_of(record: Dict[str, Any]) -> str:
+        payload = record.get("raw_data")
+        return payload if isinstance(payload, str) else json_codec.dumps(payload)
+
+    @staticmethod
+    def _columns_of(record: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "languages": list(record.get("languages") or [UNDETERMINED_LANGUAGE]),
+            "category": record.get("category") or "",
+            "tags": list(record.get("tags") or []),
+            "parent_id": parent_of(record),
+            "field": record.get("field") or "",
+            "version_hash": record.get("version_hash") or "",
+        }
+
+    def _require_ready(self) -> None:
+        if not self._ready:
+            raise RuntimeError("La colección NumPy no está lista")
+
+    def _index_row(self, row: int) -> None:
+        """Registrar la fila ``row`` en su herramienta y en los índices de filtro."""
+        row_id, columns = self._ids[row], self._columns[row]
+        # Las colecciones anteriores a las filas hijas no guardan parent_id
+        parent = str(columns.get("parent_id") or row_id)
+        self._rows.setdefault(parent, []).append(row)
+        if row_id == parent:
+            self._primary[parent] = row
+        values = [("languages", value) for value in columns.get("languages") or []]
+        values += [("tags", value) for value in columns.get("tags") or []]
+        if columns.get("category"):
+            values.append(("category", columns["category"]))
+        for name, value in values:
+            self._postings[name].setdefault(value, []).append(row)
+            self._facet_rows.pop((name, value), None)
+
+    def _reserve(self, extra: int) -> None:
+        """Garantizar matrices escribibles con hueco para ``extra`` filas más.
+
+        Las matrices cargadas con ``mmap`` son de solo lectura y la primera
+        escritura las copia a memoria. La capacidad se duplica al crecer, así
+        que añadir filas cuesta O(1) amortizado.
+        """
+        arrays = [array for array in (self._matrix, self._codes) if array is not None]
+        capacity = arrays[0].shape[0] if arrays else 0
+        required = self._size + extra
+        if required <= capacity and all(array.flags.writeable for array in arrays):
+            return
+        capacity = max(required, 2 * capacity, self._size + MIN_SPARE_ROWS)
+        self._matrix = _grow(self._matrix, self._size, capacity)
+        self._codes = _grow(self._codes, self._size, capacity)
+        self._scales = _grow(self._scales, self._size, capacity)
+        self._live = _grow(self._live, self._size, capacity)
+
+    def _put_vectors(self, rows: Any, vectors: np.ndarray) -> None:
+        """Escribir ``vectors`` normalizados en las filas ``rows`` ya reservadas."""
+        if self._matrix is not None:
+            self._matrix[rows] = vectors
+        if self._codes is not None:
+            codes, scales = quantize(vectors, self.precision)
+            self._codes[rows] = codes
+            if self._scales is not None:
+                self._scales[rows] = scales
+
+    def _append(self, records: Sequence[Dict[str, Any]], vectors: np.ndarray) -> None:
+        self._reserve(len(records))
+        start, stop = self._size, self._size + len(records)
+        self._put_vectors(slice(start, stop), vectors)
+        for record in records:
+            self._ids.append(str(record["id"]))
+            self._payloads.append(self._payload_of(record))
+            self._columns.append(self._columns_of(record))
+        self._live[start:stop] = True
+        self._size = stop
+        for row in range(start, stop):
+            self._index_row(row)
+
+    def _overwrite(
+        self,
+        rows: List[int],
+        records: Sequence[Dict[str, Any]],
+        vectors: np.ndarray,
+    ) -> bool:
+        """Sobrescribir en sitio las filas de una herramienta, si es posible.
+
+        Solo se hace sin búsquedas en curso y cuando la nueva versión tiene
+        las mismas filas y facetas, de modo que los índices siguen valiendo.
+        """
+        if self._readers or len(rows) != len(records):
+            return False
+        columns = [self._columns_of(record) for record in records]
+        for row, record, new in zip(rows, records, columns):
+            old = self._columns[row]
+            if self._ids[row] != str(record["id"]) or any(
+                old.get(name) != new[name] for name in ("languages", "category", "tags")
+            ):
+                return False
+        self._reserve(0)
+        self._put_vectors(rows, vectors)
+        for row, record, new in zip(rows, records, columns):
+            self._payloads[row] = self._payload_of(record)
+            self._columns[row] = new
+        return True
+
+    def _tombstone(self, parent: str) -> bool:
+        rows = self._rows.pop(parent, None)
+        if not rows:
+            return False
+        self._primary.pop(parent, None)
+        self._live[rows] = False
+        self._dead += len(rows)
+        return True
+
+    def _compact(self) -> None:
+        """Reconstruir la colección sin las filas borradas."""
+        keep = np.flatnonzero(self._live[: self._size])
+        if self._matrix is not None:
+            matrix = np.asarray(self._matrix[keep], dtype=np.float32)
+        else:
+            matrix = np.zeros((0, self._dimension), dtype=np.float32)
+        codes: Tuple[Any, Any] = (None, None)
+        if self._codes is not None:
+            scales = None if self._scales is None else self._scales[keep]
+            codes = (np.asarray(self._codes[keep]), scales)
+        self._set_rows(
+            [self._ids[row] for row in keep],
+            [self._payloads[row] for row in keep],
+            [self._columns[row] for row in keep],
+            matrix,
+            codes,
+        )
+
+    def _maybe_compact(self) -> None:
+        if self._dead > COMPACT_RATIO * self._size:
+            self._compact()
+
+    def create(self, records: Sequence[Dict[str, Any]]) -> None:
+        with self._lock:
+            records = list(records)
+            if records:
+                matrix = self._normalize(
+                    np.stack([record["vector"] for record in records])
+                )
+            else:
+                matrix = np.zeros((0, self._dimension), dtype=np.float32)
+            self._set_rows(
+                [str(record["id"]) for record in records],
+                [self._payload_of(record) for record in records],
+                [self._columns_of(record) for record in records],
+                matrix,
+            )
+            self._ready = True
+            self._dirty = True
+
+    def replace(self, records: Sequence[Dict[str, Any]]) -> int:
+        with self._lock:
+            self._require_ready()
+            if not records:
+                return 0
+            vectors = self._normalize(
+                np.stack([record["vector"] for record in records])
+            )
+            groups: Dict[str, List[int]] = {}
+            for index, record in enumerate(records):
+                groups.setdefault(parent_of(record), []).append(index)
+            appended: List[int] = []
+            for parent, indices in groups.items():
+                rows = self._rows.get(parent)
+                if rows and self._overwrite(
+                    rows, [records[index] for index in indices], vectors[indices]
+                ):
+                    continue
+                self._tombstone(parent)
+                appended.extend(indices)
+            if appended:
+                self._append([records[index] for index in appended], vectors[appended])
+            self._dirty = True
+            self._maybe_compact()
+            return len(records)
+
+    def delete(self, tool_id: str) -> bool:
+        return self.delete_many([tool_id]) > 0
+
+    def delete_many(self, tool_ids: Iterable[str]) -> int:
+        with self._lock:
+            self._require_ready()
+            deleted = sum(
+                1 for tool_id in dict.fromkeys(tool_ids) if self._tombstone(tool_id)
+            )
+            if deleted:
+                self._dirty = True
+                self._maybe_compact()
+            return deleted
+
+    # ------------------------------------------------------------------
+    # Lectura
+    def _candidates(self, filters: SearchFilter) -> Optional[np.ndarray]:
+        """Filas que cumplen ``filters`` o ``None`` si no restringen nada.
+
+        Las filas de cada valor se convierten a array bajo demanda y se
+        reutilizan hasta que ese valor recibe filas nuevas; pueden incluir
+        filas borradas, que se descartan con la máscara de vivas.
+        """
+        selected: Optional[np.ndarray] = None
+        for name, values in filters.facets():
+            arrays = []
+            for value in values:
+                rows = self._facet_rows.get((name, value))
+                if rows is None:
+                    rows = np.asarray(
+                        self._postings[name].get(value, []), dtype=np.int64
+                    )
+                    self._facet_rows[(name, value)] = rows
+                arrays.append(rows)
+            rows = np.unique(np.concatenate(arrays))
+            selected = rows if selected is None else np.intersect1d(selected, rows)
+        return selected
+
+    def search(
+        self,
+        vector: np.ndarray,
+        limit: int,
+        filters: Optional[SearchFilter] = None,
+        *,
+        min_score: Optional[float] = None,
+        nprobes: Optional[int] = None,
+        refine_factor: Optional[int] = None,
+    ) -> List[SearchRow]:
+        filters = SearchFilter.coerce(filters)
+        if filters.where:
+            logger.debug("El backend NumPy ignora el filtro SQL: %s", filters.where)
+        with self._lock:
+            self._require_ready()
+            size = self._size
+            if not size or limit <= 0:
+                return []
+            matrix, codes, scales = self._matrix, self._codes, self._scales
+            payloads, columns = self._payloads, self._columns
+            live = self._live[:size].copy() if self._dead else None
+            rows = self._candidates(filters)
+            self._readers += 1
+        try:
+            # El producto y el top-k se calculan fuera del cerrojo
+            query = self._normalize(vector)[0]
+            if live is not None:
+                rows = np.flatnonzero(live) if rows is None else rows[live[rows]]
+            positions = np.arange(size) if rows is None else rows
+            if codes is None:
+                scanned = matrix[:size] if rows is None else np.asarray(matrix[rows])
+                scores = scanned @ query if len(positions) else np.zeros(0)
+            else:
+                if scales is not None:
+                    scales = scales[:size]
+                scores = quantized_scores(codes[:size], scales, query, rows)
+                if matrix is not None and len(scores):
+                    # Reordenar en float32 los mejores candidatos aproximados
+                    shortlist = _top(scores, limit * self.rescore_factor)
+                    positions = positions[shortlist]
+                    scores = np.asarray(matrix[positions], dtype=np.float32) @ query
+        finally:
+            with self._lock:
+                self._readers -= 1
+        if min_score is not None:
+            keep = scores >= min_score
+            scores, positions = scores[keep], positions[keep]
+        best = _top(scores, limit)
+        return [
+            {
+                "payload": payloads[row],
+                "score": float(scores[index]),
+                "parent_id": columns[row].get("parent_id"),
+                "field": columns[row].get("field"),
+            }
+            for index, row in ((index, positions[index]) for index in best.tolist())
+        ]
+
+    def get(self, tool_id: str) -> Optional[Any]:
+        with self._lock:
+            self._require_ready()
+            row = self._primary.get(tool_id)
+            return None if row is None else self._payloads[row]
+
+    def version_hashes(
+        self, tool_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, str]:
+        with self._lock:
+            self._require_ready()
+            if tool_ids is None:
+                rows: Iterable[int] = self._primary.values()
+            else:
+                found = (self._primary.get(tool_id) for tool_id in tool_ids)
+                rows = [row for row in found if row is not None]
+            return {
+                self._ids[row]: self._columns[row].get("version_hash") or ""
+                for row in rows
+            }
+
+    def count(self) -> int:
+        with self._lock:
+            self._require_ready()
+            return len(self._primary)
+
+    def payloads(self) -> Iterator[Any]:
+        with self._lock:
+            self._require_ready()
+            payloads = self._payloads
+            return iter([payloads[row] for row in self._primary.values()])
+
+
+__all__ = [
+    "ANN_INDEX_TYPES",
+    "AnnIndexConfig",
+    "SearchFilter",
+    "UNDETERMINED_LANGUAGE",
+    "filter_columns",
+    "parent_of",
+    "VECTOR_PRECISIONS",
+    "quantize",
+    "dequantize",
+    "quantized_scores",
+    "aggregate_rows",
+    "VectorBackend",
+    "LanceDBBackend",
+    "NumpyBackend",
+    "SearchRow",
+]
@@ -0,0 +1,292 @@
+"""Cachés de embeddings: persistente para herramientas y LRU para consultas."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 200_000
+DEFAULT_QUERY_CACHE_SIZE = 1024
+_INITIAL_CAPACITY = 1024
+_INDEX_VERSION = 1
+
+
+class EmbeddingCache:
+    """Guardar vectores float32 en disco para no recalcular embeddings.
+
+    Cada combinación de modelo y dimensión vive en su propio subdirectorio con
+    una matriz ``vectors.npy`` abierta como *memory map* y un ``index.json``
+    que asocia el hash SHA-256 del texto (junto con modelo y dimensión) a su
+    fila. Cuando se supera ``max_entries`` se descartan las entradas usadas
+    hace más tiempo y sus filas se reutilizan.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        model_name: str,
+        dimension: int,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.model_name = model_name
+        self.dimension = int(dimension)
+        self.max_entries = max(1, int(max_entries))
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name).strip("_") or "model"
+        self.directory = Path(directory) / f"{slug}-{self.dimension}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / "vectors.npy"
+        self._index_path = self.directory / "index.json"
+
+        self._entries: Dict[str, List[int]] = {}
+        self._free: List[int] = []
+        self._tick = 0
+        self._matrix: Optional[np.memmap] = None
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Claves y persistencia
+    def key_for(self, text: str) -> str:
+        payload = f"{self.model_name}\x1f{self.dimension}\x1f{text}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def _load(self) -> None:
+        if self._index_path.exists() and self._vectors_path.exists():
+            try:
+                index = json.loads(self._index_path.read_text(encoding="utf-8"))
+                matrix = np.load(self._vectors_path, mmap_mode="r+")
+            except (OSError, ValueError) as exc:
+                logger.warning("Caché de embeddings ilegible, se reinicia: %s", exc)
+            else:
+                if (
+                    index.get("version") == _INDEX_VERSION
+                    and matrix.ndim == 2
+                    and matrix.shape[1] == self.dimension
+                ):
+                    self._matrix = matrix
+                    self._entries = {
+                        key: [int(row), int(tick)]
+                        for key, (row, tick) in index.get("entries", {}).items()
+                    }
+                    self._free = [int(row) for row in index.get("free", [])]
+                    self._tick = int(index.get("tick", 0))
+                    return
+                logger.warning("Caché de embeddings incompatible, se reinicia")
+        self._matrix = self._allocate(_INITIAL_CAPACITY)
+        self._entries = {}
+        self._free = []
+        self._dirty = True
+
+    def _allocate(self, capacity: int) -> np.memmap:
+        return np.lib.format.open_memmap(
+            self._vectors_path,
+            mode="w+",
+            dtype=np.float32,
+            shape=(capacity, self.dimension),
+        )
+
+    def _grow(self, required: int) -> None:
+        assert self._matrix is not None
+        capacity = self._matrix.shape[0]
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        current = np.array(self._matrix)
+        self._matrix = None
+        self._matrix = self._allocate(capacity)
+        self._matrix[: current.shape[0]] = current
+
+    def flush(self) -> None:
+        """Persistir la matriz y el índice si hubo cambios."""
+        if not self._dirty or self._matrix is None:
+            return
+        self._matrix.flush()
+        payload = {
+            "version": _INDEX_VERSION,
+            "model": self.model_name,
+            "dimension": self.dimension,
+            "tick": self._tick,
+            "entries": self._entries,
+            "free": self._free,
+        }
+        tmp_path = self._index_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, self._index_path)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Consulta y almacenamiento
+    def lookup(self, texts: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+        """Devolver la matriz (n, dim) con los aciertos y los índices ausentes."""
+        assert self._matrix is not None
+        result = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        missing: List[int] = []
+        for position, text in enumerate(texts):
+            entry = self._entries.get(self.key_for(text))
+            if entry is None:
+                missing.append(position)
+                continue
+            self._tick += 1
+            entry[1] = self._tick
+            result[position] = self._matrix[entry[0]]
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if len(missing) < len(texts):
+            self._dirty = True
+        return result, missing
+
+    def store(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Guardar ``vectors`` (una fila por texto) y aplicar la expulsión LRU."""
+        assert self._matrix is not None
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+        if vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"Dimensión {vectors.shape[1]} distinta de la de la caché "
+                f"({self.dimension})"
+            )
+        for text, vector in zip(texts, vectors):
+            key = self.key_for(text)
+            entry = self._entries.get(key)
+            if entry is None:
+                row = self._free.pop() if self._free else len(self._entries)
+                self._grow(row + 1)
+                entry = [row, 0]
+                self._entries[key] = entry
+            self._tick += 1
+            entry[1] = self._tick
+            self._matrix[entry[0]] = vector
+        self._dirty = True
+        self.evict()
+
+    def evict(self, max_entries: Optional[int] = None) -> int:
+        """Descartar las entradas menos usadas hasta quedar en ``max_entries``."""
+        limit = self.max_entries if max_entries is None else max(0, int(max_entries))
+        overflow = len(self._entries) - limit
+        if overflow <= 0:
+            return 0
+        oldest = sorted(self._entries.items(), key=lambda item: item[1][1])[:overflow]
+        for key, (row, _tick) in oldest:
+            del self._entries[key]
+            self._free.append(row)
+        self.evictions += overflow
+        self._dirty = True
+        return overflow
+
+    def clear(self) -> None:
+        """Vaciar la caché conservando el archivo de vectores."""
+        if self._matrix is None:
+            return
+        self._free = list(range(self._matrix.shape[0] - 1, -1, -1))
+        self._entries = {}
+        self._dirty = True
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """Tamaño, ocupación en disco y tasa de aciertos de la caché."""
+        lookups = self.hits + self.misses
+        size_bytes = 0
+        for path in (self._vectors_path, self._index_path):
+            if path.exists():
+                size_bytes += path.stat().st_size
+        return {
+            "entries": len(self._entries),
+            "capacity": int(self._matrix.shape[0]) if self._matrix is not None else 0,
+            "max_entries": self.max_entries,
+            "dimension": self.dimension,
+            "size_bytes": size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class QueryEmbeddingCache:
+    """LRU acotada en memoria para embeddings de consultas.
+
+    Las claves son ``(modelo, consulta normalizada)``; la normalización pasa a
+    minúsculas y colapsa espacios. Es segura entre hilos para que las APIs
+    síncrona y asíncrona del almacén compartan la misma instancia.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_QUERY_CACHE_SIZE) -> None:
+        self.max_size = max(0, int(max_size))
+        self._items: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def key_for(self, model_name: str, query: str) -> Tuple[str, str]:
+        return (model_name, self.normalize(query))
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._items.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: Hashable, vector: np.ndarray) -> np.ndarray:
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        if self.max_size == 0:
+            return vector
+        with self._lock:
+            self._items[key] = vector
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+__all__ = [
+    "EmbeddingCache",
+    "QueryEmbeddingCache",
+    "DEFAULT_MAX_ENTRIES",
+    "DEFAULT_QUERY_CACHE_SIZE",
+]
@@ -0,0 +1,445 @@
+"""Proveedores de embeddings para ``ATDFVectorStore``.
+
+Además de ``sentence-transformers`` se incluyen proveedores ligeros pensados
+para despliegues en CPU sin conexión:
+
+* ``HashingProvider``: *hashing trick* sobre palabras y trigramas de
+  caracteres; no necesita entrenamiento ni dependencias.
+* ``TfidfSvdProvider``: TF-IDF ajustado sobre el catálogo y proyectado a
+  ``dimension`` componentes con SVD aleatorizada, todo en NumPy.
+* ``OnnxProvider``: modelo de frases exportado a ONNX (``onnxruntime`` y
+  ``tokenizers`` opcionales) con *mean pooling*.
+
+Todos devuelven filas float32 L2-normalizadas y exponen ``embed`` además de
+``encode``, por lo que también cumplen el protocolo ``Embedder`` del selector.
+La descripción de cada proveedor (``describe``) se guarda en los metadatos de
+la tabla para detectar índices y consultas con vectores incompatibles.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core.hashing import HashingEmbedder
+from ..core.lexical_index import tokenize
+
+EMBEDDING_PROVIDERS = ("sentence-transformers", "hashing", "tfidf", "onnx")
+
+
+def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+class EmbeddingProvider(ABC):
+    """Interfaz común de los generadores de embeddings."""
+
+    kind = "base"
+    requires_fit = False
+
+    def __init__(self) -> None:
+        self.dimension: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        """Identificador estable del espacio vectorial (claves de caché)."""
+        return f"{self.kind}-{self.dimension}"
+
+    @property
+    def fitted(self) -> bool:
+        return True
+
+    def load(self) -> None:
+        """Preparar recursos costosos (modelos, sesiones); idempotente."""
+
+    def fit(self, texts: Sequence[str]) -> None:
+        """Ajustar el proveedor sobre el catálogo (solo si ``requires_fit``)."""
+
+    @abstractmethod
+    def encode(self, texts: Sequence[str], *, batch_size: int = 64) -> np.ndarray:
+        """Devolver una matriz float32 (n, dimension) con filas normalizadas."""
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return self.encode(list(texts))
+
+    def describe(self) -> Dict[str, Any]:
+        return {"provider": self.kind, "name": self.name, "dimension": self.dimension}
+
+    def save_state(self, prefix: str) -> None:
+        """Persistir el estado ajustado junto a la tabla (``prefix`` sin extensión)."""
+
+    def load_state(self, prefix: str) -> bool:
+        """Recuperar el estado guardado con ``save_state``; ``False`` si no existe."""
+        return not self.requires_fit
+
+
+class SentenceTransformerProvider(EmbeddingProvider):
+    """Modelo de ``sentence-transformers`` cargado bajo demanda."""
+
+    kind = "sentence-transformers"
+
+    def __init__(self, model_name: str, factory: Callable[[str], Any]) -> None:
+        super().__init__()
+        self.model_name = model_name
+        self._factory = factory
+        self.model: Any = None
+
+    @property
+    def name(self) -> str:
+        return self.model_name
+
+    def load(self) -> None:
+        if self.model is None:
+            self.model = self._factory(self.model_name)
+            self.dimension = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: Sequence[str], *, batch_size: int = 64) -> np.ndarray:
+        self.load()
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+        return _l2_normalize(vectors)
+
+
+class HashingProvider(EmbeddingProvider):
+    """Vectorizador por *hashing* con signo sobre palabras y trigramas.
+
+    Envuelve ``sdk.core.hashing.HashingEmbedder``, así que el almacén
+    vectorial y el selector producen los mismos vectores. Usa CRC32, de modo
+    que son estables entre procesos y plataformas; los trigramas acercan
+    formas flexionadas ("correo"/"correos").
+    """
+
+    kind = "hashing"
+
+    def __init__(self, dimension: int = 512) -> None:
+        super().__init__()
+        self.dimension = int(dimension)
+        self._embedder = HashingEmbedder(self.dimension)
+
+    def encode(self, texts: Sequence[str], *, batch_size: int = 64) -> np.ndarray:
+        return np.ascontiguousarray(self._embedder.embed(list(texts)), dtype=np.float32)
+
+
+class TfidfSvdProvider(EmbeddingProvider):
+    """TF-IDF sublineal ajustado sobre el catálogo y reducido con SVD.
+
+    La SVD truncada se calcula con el método aleatorizado de Halko et al. sobre
+    una matriz dispersa CSR construida a mano, por lo que no requiere SciPy ni
+    scikit-learn. El nombre incluye una huella del ajuste: reajustar sobre otro
+    catálogo produce un espacio vectorial distinto y no reutiliza la caché.
+    """
+
+    kind = "tfidf"
+    requires_fit = True
+
+    def __init__(
+        self,
+        dimension: int = 256,
+        *,
+        max_features: int = 50_000,
+        min_df: int = 1,
+        seed: int = 13,
+    ) -> None:
+        super().__init__()
+        self.target_dimension = int(dimension)
+        self.max_features = int(max_features)
+        self.min_df = max(1, int(min_df))
+        self.seed = seed
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.components = np.zeros((0, 0), dtype=np.float32)
+        self.fingerprint = ""
+
+    @property
+    def name(self) -> str:
+        return f"tfidf-{self.dimension}-{self.fingerprint[:12]}"
+
+    @property
+    def fitted(self) -> bool:
+        return bool(self.vocabulary)
+
+    # ------------------------------------------------------------------
+    # Ajuste
+    def fit(self, texts: Sequence[str]) -> None:
+        documents = [tokenize(text) for text in texts]
+        df: Dict[str, int] = {}
+        for tokens in documents:
+            for token in set(tokens):
+                df[token] = df.get(token, 0) + 1
+        terms = [term for term, freq in df.items() if freq >= self.min_df]
+        terms.sort(key=lambda term: (-df[term], term))
+        terms = sorted(terms[: self.max_features])
+        if not terms:
+            raise ValueError("No hay términos suficientes para ajustar TF-IDF")
+
+        self.vocabulary = {term: index for index, term in enumerate(terms)}
+        total = len(documents)
+        self.idf = np.array(
+            [np.log((1.0 + total) / (1.0 + df[term])) + 1.0 for term in terms],
+            dtype=np.float32,
+        )
+        matrix = self._tfidf(documents)
+        rank = max(1, min(self.target_dimension, total, len(terms)))
+        self.components = self._randomized_svd(matrix, rank)
+        self.dimension = rank
+        digest = hashlib.sha256()
+        for term in terms:
+            digest.update(term.encode("utf-8") + b"\x1f")
+        digest.update(self.components.tobytes())
+        self.fingerprint = digest.hexdigest()
+
+    def _tfidf(
+        self, documents: Sequence[Sequence[str]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Matriz CSR ``(indptr, indices, data)`` con filas L2-normalizadas."""
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for tokens in documents:
+            counts: Dict[int, int] = {}
+            for token in tokens:
+                column = self.vocabulary.get(token)
+                if column is not None:
+                    counts[column] = counts.get(column, 0) + 1
+            columns = sorted(counts)
+            weights = np.array(
+                [
+                    (1.0 + np.log(counts[column])) * self.idf[column]
+                    for column in columns
+                ],
+                dtype=np.float32,
+            )
+            norm = float(np.linalg.norm(weights)) if len(weights) else 0.0
+            indices.extend(columns)
+            data.extend((weights / norm if norm else weights).tolist())
+            indptr.append(len(indices))
+        return (
+            np.asarray(indptr, dtype=np.int64),
+            np.asarray(indices, dtype=np.int64),
+            np.asarray(data, dtype=np.float32),
+        )
+
+    @staticmethod
+    def _rows_of(indptr: np.ndarray) -> np.ndarray:
+        return np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+    def _dot(
+        self, csr: Tuple[np.ndarray, np.ndarray, np.ndarray], dense: np.ndarray
+    ) -> np.ndarray:
+        """``X @ dense`` para X en formato CSR."""
+        indptr, indices, data = csr
+        out = np.zeros((len(indptr) - 1, dense.shape[1]), dtype=np.float32)
+        if not len(data):
+            return out
+        products = data[:, None] * dense[indices]
+        # Las filas CSR son contiguas: reduceat suma cada tramo no vacío
+        starts = indptr[:-1]
+        filled = np.flatnonzero(np.diff(indptr) > 0)
+        out[filled] = np.add.reduceat(products, starts[filled], axis=0)
+        return out
+
+    def _dot_transposed(
+        self, csr: Tuple[np.ndarray, np.ndarray, np.ndarray], dense: np.ndarray
+    ) -> np.ndarray:
+        """``X.T @ dense`` para X en formato CSR."""
+        indptr, indices, data = csr
+        out = np.zeros((len(self.vocabulary), dense.shape[1]), dtype=np.float32)
+        np.add.at(out, indices, data[:, None] * dense[self._rows_of(indptr)])
+        return out
+
+    def _randomized_svd(
+        self, csr: Tuple[np.ndarray, np.ndarray, np.ndarray], rank: int
+    ) -> np.ndarray:
+        """Vectores singulares derechos (términos x rank) de la matriz TF-IDF."""
+        rng = np.random.default_rng(self.seed)
+        width = min(rank + 10, len(self.vocabulary))
+        omega = rng.standard_normal((len(self.vocabulary), width)).astype(np.float32)
+        basis, _ = np.linalg.qr(self._dot(csr, omega))
+        for _ in range(2):  # iteraciones de potencia para un espectro plano
+            basis, _ = np.linalg.qr(self._dot_transposed(csr, basis))
+            basis, _ = np.linalg.qr(self._dot(csr, basis))
+        small = self._dot_transposed(csr, basis).T  # (width, términos)
+        _, _, vt = np.linalg.svd(small, full_matrices=False)
+        return np.ascontiguousarray(vt[:rank].T, dtype=np.float32)
+
+    # ------------------------------------------------------------------
+    # Codificación y persistencia
+    def encode(self, texts: Sequence[str], *, batch_size: int = 64) -> np.ndarray:
+        if not self.fitted:
+            raise RuntimeError(
+                "El proveedor TF-IDF debe ajustarse sobre el catálogo antes de usarse"
+            )
+        csr = self._tfidf([tokenize(text) for text in texts])
+        return _l2_normalize(self._dot(csr, self.components))
+
+    def describe(self) -> Dict[str, Any]:
+        description = super().describe()
+        description["fingerprint"] = self.fingerprint
+        return description
+
+    def save_state(self, prefix: str) -> None:
+        terms = sorted(self.vocabulary, key=self.vocabulary.__getitem__)
+        tmp_path = f"{prefix}.tfidf.tmp.npz"
+        np.savez(
+            tmp_path,
+            idf=self.idf,
+            components=self.components,
+            header=np.array(
+                json.dumps({"terms": terms, "fingerprint": self.fingerprint})
+            ),
+        )
+        os.replace(tmp_path, f"{prefix}.tfidf.npz")
+
+    def load_state(self, prefix: str) -> bool:
+        path = Path(f"{prefix}.tfidf.npz")
+        if not path.exists():
+            return False
+        with np.load(path) as state:
+            header = json.loads(str(state["header"]))
+            self.idf = state["idf"].astype(np.float32)
+            self.components = state["components"].astype(np.float32)
+        self.vocabulary = {term: index for index, term in enumerate(header["terms"])}
+        self.fingerprint = header["fingerprint"]
+        self.dimension = int(self.components.shape[1])
+        return True
+
+
+class OnnxProvider(EmbeddingProvider):
+    """Modelo de frases exportado a ONNX, ejecutado con ``onnxruntime``.
+
+    ``model_path`` es el archivo ``.onnx`` o un directorio que contenga
+    ``model.onnx`` y ``tokenizer.json``. Las salidas se agregan con *mean
+    pooling* sobre la máscara de atención, igual que ``all-MiniLM-L6-v2``.
+    """
+
+    kind = "onnx"
+
+    def __init__(
+        self,
+        model_path: str,
+        *,
+        tokenizer_path: Optional[str] = None,
+        max_length: int = 256,
+    ) -> None:
+        super().__init__()
+        path = Path(model_path)
+        self.model_path = path / "model.onnx" if path.is_dir() else path
+        self.tokenizer_path = Path(
+            tokenizer_path or self.model_path.parent / "tokenizer.json"
+        )
+        self.max_length = int(max_length)
+        self._session: Any = None
+        self._tokenizer: Any = None
+
+    @property
+    def name(self) -> str:
+        return f"onnx-{self.model_path.stem}-{self.dimension}"
+
+    def load(self) -> None:
+        if self._session is not None:
+            return
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as exc:  # pragma: no cover - depende del entorno
+            raise ImportError(
+                "El proveedor ONNX necesita dependencias opcionales. "
+                "Instálalas con: pip install onnxruntime tokenizers"
+            ) from exc
+
+        self._tokenizer = Tokenizer.from_file(str(self.tokenizer_path))
+        self._tokenizer.enable_truncation(max_length=self.max_length)
+        self._tokenizer.enable_padding()
+        self._session = onnxruntime.InferenceSession(
+            str(self.model_path), providers=["CPUExecutionProvider"]
+        )
+        self.dimension = int(self._run(["dimension"]).shape[1])
+
+    def _run(self, texts: Sequence[str]) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(list(texts))
+        ids = np.array([item.ids for item in encodings], dtype=np.int64)
+        mask = np.array([item.attention_mask for item in encodings], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        inputs = {item.name for item in self._session.get_inputs()}
+        if "token_type_ids" in inputs:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        hidden = self._session.run(
+            None, {k: v for k, v in feeds.items() if k in inputs}
+        )[0]
+        weights = mask[..., None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.clip(
+            weights.sum(axis=1), 1e-9, None
+        )
+        return _l2_normalize(pooled)
+
+    def encode(self, texts: Sequence[str], *, batch_size: int = 64) -> np.ndarray:
+        self.load()
+        if not texts:
+            return np.zeros((0, self.dimension or 0), dtype=np.float32)
+        size = max(1, int(batch_size))
+        return np.vstack(
+            [
+                self._run(texts[start : start + size])
+                for start in range(0, len(texts), size)
+            ]
+        )
+
+
+def create_provider(
+    provider: Union[str, EmbeddingProvider],
+    *,
+    model_name: str,
+    factory: Optional[Callable[[str], Any]] = None,
+    **options: Any,
+) -> EmbeddingProvider:
+    """Construir un proveedor a partir de su nombre (ver ``EMBEDDING_PROVIDERS``).
+
+    ``model_name`` es el modelo de ``sentence-transformers`` o la ruta del
+    modelo ONNX; ``options`` se pasa al constructor del proveedor.
+    """
+
+    if isinstance(provider, EmbeddingProvider):
+        return provider
+    if provider == "sentence-transformers":
+        if factory is None:
+            raise ImportError(
+                "El modelo de embeddings no está disponible. "
+                "Instálalo con: pip install sentence-transformers"
+            )
+        return SentenceTransformerProvider(model_name, factory)
+    if provider == "hashing":
+        return HashingProvider(**options)
+    if provider == "tfidf":
+        return TfidfSvdProvider(**options)
+    if provider == "onnx":
+        return OnnxProvider(model_name, **options)
+    raise ValueError(
+        f"Proveedor de embeddings desconocido: {provider}. "
+        f"Opciones: {', '.join(EMBEDDING_PROVIDERS)}"
+    )
+
+
+__all__ = [
+    "EMBEDDING_PROVIDERS",
+    "EmbeddingProvider",
+    "SentenceTransformerProvider",
+    "HashingProvider",
+    "TfidfSvdProvider",
+    "OnnxProvider",
+    "create_provider",
+]
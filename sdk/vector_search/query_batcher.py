@@ -0,0 +1,105 @@
+"""Agrupación de consultas concurrentes en lotes de embeddings."""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from concurrent.futures import Executor
+from typing import (
+    Callable,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+DEFAULT_BATCH_WINDOW = 0.002
+
+# Función de codificación: lista de textos -> matriz (n, dim)
+EncodeFunction = Callable[[List[str]], np.ndarray]
+_Pending = List[Tuple[str, "asyncio.Future[np.ndarray]"]]
+
+
+class QueryBatcher:
+    """Codificar juntas las consultas que llegan en la misma ventana de tiempo.
+
+    Cada consulta queda pendiente como mucho ``window`` segundos (o hasta
+    reunir ``max_batch``) y después todas las pendientes se codifican en una
+    sola llamada a ``encode`` ejecutada en ``executor``, de modo que el bucle
+    de eventos nunca ejecuta el modelo. Las colas son independientes por bucle
+    para poder compartir el lote entre la API asíncrona y la síncrona.
+    """
+
+    def __init__(
+        self,
+        encode: EncodeFunction,
+        executor: Callable[[], Optional[Executor]],
+        *,
+        window: float = DEFAULT_BATCH_WINDOW,
+        max_batch: int = 64,
+    ) -> None:
+        self._encode = encode
+        self._executor = executor
+        self.window = max(0.0, float(window))
+        self.max_batch = max(1, int(max_batch))
+        # Bucle -> consultas pendientes y temporizador de vaciado
+        self._pending: MutableMapping[asyncio.AbstractEventLoop, _Pending] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._timers: MutableMapping[asyncio.AbstractEventLoop, asyncio.TimerHandle] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.batches = 0
+        self.queries = 0
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Vector de ``text``, calculado junto al resto de consultas del lote."""
+
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[np.ndarray]" = loop.create_future()
+        pending = self._pending.setdefault(loop, [])
+        pending.append((text, future))
+        if len(pending) >= self.max_batch:
+            self._flush(loop)
+        elif loop not in self._timers:
+            self._timers[loop] = loop.call_later(self.window, self._flush, loop)
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        timer = self._timers.pop(loop, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(loop, None)
+        if not batch:
+            return
+
+        # Las consultas repetidas dentro del lote se codifican una sola vez
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        self.batches += 1
+        self.queries += len(batch)
+        task = loop.run_in_executor(self._executor(), self._encode, texts)
+        task.add_done_callback(lambda done: self._resolve(batch, texts, done))
+
+    @staticmethod
+    def _resolve(
+        batch: _Pending, texts: Sequence[str], done: "asyncio.Future[np.ndarray]"
+    ) -> None:
+        error = None if done.cancelled() else done.exception()
+        if done.cancelled() or error is not None:
+            for _, future in batch:
+                if not future.done():
+                    if error is None:
+                        future.cancel()
+                    else:
+                        future.set_exception(error)
+            return
+
+        vectors = np.asarray(done.result(), dtype=np.float32).reshape(len(texts), -1)
+        rows: Dict[str, np.ndarray] = dict(zip(texts, vectors))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(rows[text])
@@ -3,29 +3,143 @@
 from __future__ import annotations
 
 import asyncio
-import inspect
+import functools
+import itertools
 import json
 import logging
+import os
 import tempfile
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 
+from ..core import json_codec
+from .backends import (
+    DEFAULT_RESCORE_FACTOR,
+    AnnIndexConfig,
+    LanceDBBackend,
+    NumpyBackend,
+    SearchFilter,
+    VectorBackend,
+    aggregate_rows,
+    filter_columns,
+    parent_of,
+)
+from .embedding_cache import (
+    DEFAULT_MAX_ENTRIES,
+    DEFAULT_QUERY_CACHE_SIZE,
+    EmbeddingCache,
+    QueryEmbeddingCache,
+)
+from .embeddings import EmbeddingProvider, create_provider
+from .query_batcher import DEFAULT_BATCH_WINDOW, QueryBatcher
+
 # Importación opcional de dependencias
 try:  # pragma: no cover - import guard exercised via unit tests
     import lancedb
-    import sentence_transformers
     from lancedb.table import Table
-
-    VECTOR_SEARCH_AVAILABLE = True
-except ImportError:  # pragma: no cover - ejecutado cuando faltan dependencias
-    VECTOR_SEARCH_AVAILABLE = False
+except ImportError:  # pragma: no cover - ejecutado cuando falta LanceDB
     lancedb = None  # type: ignore
-    sentence_transformers = None  # type: ignore
     Table = Any  # type: ignore
 
+try:  # pragma: no cover - import guard exercised via unit tests
+    import sentence_transformers
+except ImportError:  # pragma: no cover - ejecutado cuando falta el modelo
+    sentence_transformers = None  # type: ignore
+
+VECTOR_SEARCH_AVAILABLE = lancedb is not None and sentence_transformers is not None
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 64
+VECTOR_BACKENDS = ("auto", "lancedb", "numpy")
+# Versión del esquema de registros; la 2 añade las columnas languages,
+# category y tags usadas por el prefiltrado, la 3 parent_id y field para
+# guardar varios vectores por herramienta y la 4 version_hash, el hash del
+# catálogo con el que se sincronizó cada herramienta.
+RECORD_SCHEMA_VERSION = 4
+# Campo de la fila única en modo de un vector por herramienta
+SINGLE_VECTOR_FIELD = "tool"
+# Filas pedidas por herramienta en modo multivector antes de agrupar
+MULTI_VECTOR_FANOUT = 4
+# Herramientas decodificadas por cada lectura delegada en ``iter_tools``
+ITER_CHUNK_SIZE = 256
+# Clave de los metadatos de la tabla con el estado de ``sync_from_catalog``
+CATALOG_SYNC_KEY = "catalog_sync"
+# Identificadores por consulta ``IN (...)`` al leer el catálogo SQLite
+CATALOG_SYNC_CHUNK = 500
+
+# Callback de progreso: (herramientas procesadas, total)
+ProgressCallback = Callable[[int, int], None]
+
+
+class _BridgeLoop:
+    """Bucle de eventos en un hilo de fondo para la API síncrona.
+
+    Se arranca una sola vez por proceso (de nuevo tras un ``fork``) y todas
+    las llamadas ``*_sync`` envían su corrutina a él, de modo que no se crea
+    ni se destruye un bucle por llamada y las operaciones sobre el backend
+    quedan serializadas en un único hilo.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if (
+                self._loop is None
+                or self._pid != os.getpid()
+                or self._thread is None
+                or not self._thread.is_alive()
+            ):
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def serve() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                thread = threading.Thread(
+                    target=serve, name="atdf-vector-store-loop", daemon=True
+                )
+                thread.start()
+                ready.wait()
+                self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            return self._loop
+
+    def run(self, coroutine):
+        loop = self._start()
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError(
+                "Los métodos *_sync no pueden llamarse desde el propio bucle del "
+                "almacén vectorial; usa la variante asíncrona"
+            )
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+
+_BRIDGE_LOOP = _BridgeLoop()
+
 
 class ATDFVectorStore:
     """Administrar embeddings y búsqueda semántica de herramientas ATDF."""
@@ -35,16 +149,54 @@ class ATDFVectorStore:
         model_name: str = "all-MiniLM-L6-v2",
         db_path: Optional[str] = None,
         table_name: str = "tools",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cache_dir: Optional[str] = None,
+        use_cache: bool = True,
+        cache_max_entries: int = DEFAULT_MAX_ENTRIES,
+        query_cache_size: int = DEFAULT_QUERY_CACHE_SIZE,
+        backend: str = "auto",
+        embedding_provider: Union[str, EmbeddingProvider] = "sentence-transformers",
+        provider_options: Optional[Dict[str, Any]] = None,
+        ann_index: Union[AnnIndexConfig, Dict[str, Any], bool] = True,
+        search_workers: Optional[int] = None,
+        query_batch_window: float = DEFAULT_BATCH_WINDOW,
+        multi_vector: bool = False,
+        field_weights: Optional[Dict[str, float]] = None,
+        precision: str = "float32",
+        rescore_factor: int = DEFAULT_RESCORE_FACTOR,
     ) -> None:
-        if not VECTOR_SEARCH_AVAILABLE:
+        if backend not in VECTOR_BACKENDS:
+            raise ValueError(
+                f"Backend vectorial desconocido: {backend}. "
+                f"Opciones: {', '.join(VECTOR_BACKENDS)}"
+            )
+        if backend == "auto":
+            backend = "lancedb" if lancedb is not None else "numpy"
+        if backend == "lancedb" and lancedb is None:
             raise ImportError(
                 "Las dependencias para búsqueda vectorial no están instaladas. "
                 "Instálalas con: pip install lancedb sentence-transformers"
             )
+        self.provider = create_provider(
+            embedding_provider,
+            model_name=model_name,
+            factory=(
+                (lambda name: sentence_transformers.SentenceTransformer(name))
+                if sentence_transformers is not None
+                else None
+            ),
+            **(provider_options or {}),
+        )
 
         self.model_name = model_name
         self.table_name = table_name
+        self.batch_size = max(1, int(batch_size))
         self.has_dependencies = True
+        self.last_index_stats: Dict[str, float] = {}
+        self.last_sync_stats: Dict[str, Any] = {}
+        # Un vector por campo e idioma (filas hijas) y pesos por campo al agrupar
+        self.multi_vector = multi_vector
+        self.field_weights = dict(field_weights or {})
 
         if db_path is None:
             self._temp_dir = tempfile.TemporaryDirectory()
@@ -55,16 +207,82 @@ class ATDFVectorStore:
             self._temp_dir = None
             self._is_temp = False
 
-        self.model: Optional[sentence_transformers.SentenceTransformer] = None
-        self.embedding_dim: Optional[int] = None
-        self.db = None
-        self.table: Optional[Table] = None
+        # La caché de embeddings vive junto a la base persistente salvo que
+        # se indique otro directorio; con bases temporales no tiene sentido.
+        if cache_dir is None and not self._is_temp:
+            cache_dir = os.path.join(self.db_path, "embedding_cache")
+        self.cache_dir = cache_dir if use_cache else None
+        self.cache_max_entries = cache_max_entries
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        self.query_cache = QueryEmbeddingCache(query_cache_size)
+
+        # Los embeddings y las lecturas se ejecutan en un pool de hilos para no
+        # bloquear el bucle; las consultas concurrentes se codifican por lotes.
+        self.search_workers = max(1, int(search_workers or os.cpu_count() or 1))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.query_batcher = QueryBatcher(
+            self._encode_queries,
+            self._get_executor,
+            window=query_batch_window,
+            max_batch=self.batch_size,
+        )
+
+        self.embedding_dim: Optional[int] = self.provider.dimension
+        self._provider_ready = False
+        self.backend: VectorBackend
+        if backend == "numpy":
+            self.backend = NumpyBackend(
+                self.db_path,
+                table_name,
+                precision=precision,
+                rescore_factor=rescore_factor,
+            )
+        else:
+            if isinstance(ann_index, dict):
+                ann_index = AnnIndexConfig(**ann_index)
+            elif ann_index is True:
+                ann_index = AnnIndexConfig()
+            self.backend = LanceDBBackend(
+                self.db_path,
+                table_name,
+                connector=lambda path: lancedb.connect(path),
+                ann=ann_index or None,
+                precision=precision,
+            )
         self.initialized = False
 
+    @property
+    def model(self) -> Any:
+        """Modelo de ``sentence-transformers`` cargado, si se usa ese proveedor."""
+        return getattr(self.provider, "model", None)
+
+    @property
+    def embedding_name(self) -> str:
+        """Identificador del espacio vectorial (claves de caché y metadatos)."""
+        return self.provider.name
+
+    # Acceso directo a la conexión y la tabla LanceDB (compatibilidad)
+    @property
+    def db(self) -> Any:
+        return getattr(self.backend, "db", None)
+
+    @db.setter
+    def db(self, value: Any) -> None:
+        self.backend.db = value  # type: ignore[attr-defined]
+
+    @property
+    def table(self) -> Optional[Table]:
+        return getattr(self.backend, "table", None)
+
+    @table.setter
+    def table(self, value: Optional[Table]) -> None:
+        self.backend.table = value  # type: ignore[attr-defined]
+
     # ------------------------------------------------------------------
     # Ciclo de vida
     async def initialize(self) -> bool:
-        """Inicializar el modelo de embeddings y la conexión LanceDB."""
+        """Inicializar el modelo de embeddings y la conexión del backend."""
 
         if self.initialized:
             return True
@@ -76,44 +294,72 @@ class ATDFVectorStore:
         return True
 
     async def _ensure_model(self) -> None:
-        if self.model is not None:
+        if self._provider_ready:
             return
 
-        self.model = sentence_transformers.SentenceTransformer(self.model_name)
-        self.embedding_dim = self.model.get_sentence_embedding_dimension()
-
-    async def _ensure_database(self) -> None:
-        if self.db is not None:
+        self.provider.load()
+        if self.provider.requires_fit and not self.provider.fitted:
+            self.provider.load_state(self._provider_state_prefix)
+        if self.provider.dimension is not None:
+            self.embedding_dim = self.provider.dimension
+        self._provider_ready = True
+
+    @property
+    def _provider_state_prefix(self) -> str:
+        return os.path.join(self.db_path, self.table_name)
+
+    def _embedding_metadata(self) -> Dict[str, Any]:
+        metadata = self.provider.describe()
+        if metadata.get("dimension") is None:
+            metadata["dimension"] = self.embedding_dim
+        metadata["schema_version"] = RECORD_SCHEMA_VERSION
+        return metadata
+
+    def _check_embedding_metadata(self) -> None:
+        """Impedir mezclar vectores de proveedores o dimensiones distintos."""
+
+        stored = self.backend.read_metadata()
+        if not stored:
             return
+        current = self._embedding_metadata()
+        # Las tablas LanceDB anteriores no tienen las columnas de filtro; el
+        # backend NumPy completa los valores por defecto al cargar.
+        if (
+            self.backend.name == "lancedb"
+            and stored.get("schema_version", 1) < RECORD_SCHEMA_VERSION
+        ):
+            raise ValueError(
+                f"La tabla '{self.table_name}' usa un esquema anterior sin columnas "
+                "de filtro; reconstrúyela con create_from_tools"
+            )
+        for key in ("provider", "name", "dimension"):
+            if stored.get(key) is None or current.get(key) is None:
+                continue
+            if stored[key] != current[key]:
+                raise ValueError(
+                    f"La tabla '{self.table_name}' se indexó con {stored.get('name')} "
+                    f"({stored.get('provider')}, dimensión {stored.get('dimension')}) "
+                    f"y el proveedor actual es {current.get('name')} "
+                    f"({current.get('provider')}, "
+                    f"dimensión {current.get('dimension')}); "
+                    "reconstrúyela con create_from_tools"
+                )
+
+    def _fit_provider(self, texts: Sequence[str]) -> None:
+        self.provider.fit(texts)
+        self.embedding_dim = self.provider.dimension
+        if self.db_path:
+            os.makedirs(self.db_path, exist_ok=True)
+            self.provider.save_state(self._provider_state_prefix)
 
-        self.db = lancedb.connect(self.db_path)
+    async def _ensure_database(self) -> None:
+        self.backend.connect()
 
     async def _ensure_table(self) -> None:
-        if self.db is None:
-            raise RuntimeError("La base de datos LanceDB no está inicializada")
-
-        if self.table_name in self.db.table_names():
-            self.table = self.db.open_table(self.table_name)
-            return
-
-        if self.embedding_dim is None:
-            raise RuntimeError("La dimensión del embedding es desconocida")
-
-        init_vector = np.zeros(self.embedding_dim, dtype=np.float32)
-        init_data = [
-            {
-                "id": "_init_",
-                "name": "_init_",
-                "description": "_init_",
-                "parameters": [],
-                "vector": init_vector,
-                "raw_data": "{}",
-            }
-        ]
-
-        self.table = self.db.create_table(self.table_name, data=init_data)
-        # Limpiar el registro temporal utilizado para infiriar el esquema
-        self.table.delete("id = '_init_'")
+        self._check_embedding_metadata()
+        self.backend.ensure_table(self.embedding_dim)
+        if not self.backend.read_metadata():
+            self.backend.write_metadata(self._embedding_metadata())
 
     # ------------------------------------------------------------------
     # Utilidades internas
@@ -170,64 +416,255 @@ class ATDFVectorStore:
 
         return text
 
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.search_workers,
+                    thread_name_prefix="atdf-vector-store",
+                )
+            return self._executor
+
+    async def _offload(self, function: Callable[..., Any], *args: Any, **kwargs: Any):
+        """Ejecutar una llamada bloqueante en el pool sin ocupar el bucle."""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), functools.partial(function, *args, **kwargs)
+        )
+
+    @staticmethod
+    def _field_texts(tool: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Textos por campo e idioma para el modo multivector.
+
+        El primero (``description``, con el nombre) es la fila principal de la
+        herramienta; ``when_to_use`` y ``parameters`` van en filas propias y
+        cada traducción de ``localization`` añade ``description@<idioma>`` y
+        ``when_to_use@<idioma>``.
+        """
+
+        name = tool["name"]
+        fields = [("description", f"{name}: {tool.get('description', '')}")]
+        if tool.get("when_to_use"):
+            fields.append(("when_to_use", str(tool["when_to_use"])))
+
+        parameters = tool.get("parameters") or []
+        if not parameters and isinstance(tool.get("how_to_use"), dict):
+            parameters = tool["how_to_use"].get("inputs") or []
+        described = [
+            f"{param.get('name', '')}: {param.get('description', '')}"
+            for param in parameters
+            if isinstance(param, dict)
+        ]
+        if described:
+            fields.append(("parameters", " ".join(described)))
+
+        localization = tool.get("localization")
+        if isinstance(localization, dict):
+            for language, texts in localization.items():
+                if not isinstance(texts, dict):
+                    continue
+                if texts.get("description"):
+                    fields.append(
+                        (f"description@{language}", f"{name}: {texts['description']}")
+                    )
+                if texts.get("when_to_use"):
+                    fields.append(
+                        (f"when_to_use@{language}", str(texts["when_to_use"]))
+                    )
+        return fields
+
     async def _embed_text(self, text: str) -> np.ndarray:
-        if self.model is None:
-            await self._ensure_model()
+        await self._ensure_model()
 
-        embedding = self._generate_embedding(text)
-        if inspect.isawaitable(embedding):
-            embedding = await embedding  # type: ignore[assignment]
+        embedding = await self.query_batcher.embed(text)
+        return np.asarray(embedding, dtype=np.float32).reshape(-1)
 
-        return np.asarray(embedding, dtype=np.float32)
+    async def _embed_query(self, query: str) -> np.ndarray:
+        """Embedding de una consulta, reutilizando la LRU de consultas."""
 
-    def _generate_embedding(self, text: str):
-        if self.model is None:
-            raise RuntimeError("El modelo de embeddings no está inicializado")
+        key = self.query_cache.key_for(self.embedding_name, query)
+        cached = self.query_cache.get(key)
+        if cached is not None:
+            return cached
+        return self.query_cache.put(key, await self._embed_text(query))
 
-        return self.model.encode(text, show_progress_bar=False)
+    def _encode_queries(self, texts: List[str]) -> np.ndarray:
+        return self.provider.encode(texts, batch_size=len(texts))
 
-    async def _prepare_record(self, tool: Any) -> Dict[str, Any]:
+    async def _embed_texts(
+        self,
+        texts: Sequence[str],
+        *,
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> np.ndarray:
+        """Generar embeddings por lotes; devuelve una matriz float32 (n, dim)."""
+
+        await self._ensure_model()
+
+        size = max(1, int(batch_size or self.batch_size))
+        total = len(texts)
+        cache = self._get_embedding_cache()
+        if cache is not None:
+            cached, missing = cache.lookup(texts)
+        else:
+            cached, missing = None, list(range(total))
+
+        pending = [texts[position] for position in missing]
+        chunks: List[np.ndarray] = []
+        done = total - len(pending)
+        for start in range(0, len(pending), size):
+            batch = pending[start : start + size]
+            embeddings = await self._offload(self._generate_embeddings, batch, size)
+            chunks.append(
+                np.asarray(embeddings, dtype=np.float32).reshape(len(batch), -1)
+            )
+            done += len(batch)
+            if progress is not None:
+                progress(done, total)
+
+        if progress is not None and not pending and total:
+            progress(total, total)
+
+        encoded = (
+            np.vstack(chunks)
+            if chunks
+            else np.zeros((0, self.embedding_dim or 0), dtype=np.float32)
+        )
+        if cache is None:
+            return encoded
+
+        if pending:
+            cache.store(pending, encoded)
+            cached[missing] = encoded
+        cache.flush()
+        return cached
+
+    def _get_embedding_cache(self) -> Optional[EmbeddingCache]:
+        if not self.cache_dir or not self.embedding_dim:
+            return None
+        # Un reajuste del proveedor (TF-IDF) cambia el nombre del espacio vectorial
+        if (
+            self.embedding_cache is None
+            or self.embedding_cache.model_name != self.embedding_name
+        ):
+            self.embedding_cache = EmbeddingCache(
+                self.cache_dir,
+                self.embedding_name,
+                self.embedding_dim,
+                max_entries=self.cache_max_entries,
+            )
+        return self.embedding_cache
+
+    def _generate_embeddings(self, texts: List[str], batch_size: int):
+        return self.provider.encode(texts, batch_size=batch_size)
+
+    def _prepare_normalized(self, tool: Any) -> Dict[str, Any]:
         normalized = self._normalize_tool(tool)
         tool_id = normalized.get("id") or normalized.get("tool_id")
         if not tool_id:
             tool_id = normalized["name"].lower().replace(" ", "_")
             normalized["id"] = tool_id
             normalized.setdefault("tool_id", tool_id)
+        return normalized
 
-        text_repr = self._create_text_representation(normalized)
-        vector = await self._embed_text(text_repr)
-
+    def _build_record(
+        self,
+        normalized: Dict[str, Any],
+        vector: np.ndarray,
+        field: str = SINGLE_VECTOR_FIELD,
+        primary: bool = True,
+        version_hash: str = "",
+    ) -> Dict[str, Any]:
+        tool_id = normalized.get("id") or normalized.get("tool_id")
         return {
-            "id": tool_id,
+            "id": tool_id if primary else f"{tool_id}#{field}",
             "name": normalized["name"],
             "description": normalized.get("description", ""),
-            "parameters": normalized.get("parameters", []),
+            "parameters": json_codec.dumps(normalized.get("parameters", [])),
             "vector": vector,
-            "raw_data": json.dumps(normalized),
+            "raw_data": json_codec.dumps(normalized),
+            "parent_id": tool_id,
+            "field": field,
+            "version_hash": version_hash,
+            **filter_columns(normalized),
         }
 
+    async def _prepare_record(self, tool: Any) -> Dict[str, Any]:
+        normalized = self._prepare_normalized(tool)
+        text_repr = self._create_text_representation(normalized)
+        vector = await self._embed_text(text_repr)
+        return self._build_record(normalized, vector)
+
+    async def _prepare_records(
+        self,
+        tools: Sequence[Any],
+        *,
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        fit: bool = False,
+        version_hashes: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Normalizar y vectorizar varias herramientas con embeddings por lotes.
+
+        Con ``fit`` (o si el proveedor aún no está ajustado) los proveedores
+        que lo requieren, como TF-IDF, se ajustan primero sobre estos textos.
+        ``version_hashes`` da el hash del catálogo de cada herramienta por id.
+        """
+
+        normalized = [self._prepare_normalized(tool) for tool in tools]
+        if self.multi_vector:
+            rows = [
+                (item, field, position == 0, text)
+                for item in normalized
+                for position, (field, text) in enumerate(self._field_texts(item))
+            ]
+        else:
+            rows = [
+                (
+                    item,
+                    SINGLE_VECTOR_FIELD,
+                    True,
+                    self._create_text_representation(item),
+                )
+                for item in normalized
+            ]
+        texts = [text for _, _, _, text in rows]
+        if self.provider.requires_fit and (fit or not self.provider.fitted):
+            self._fit_provider(texts)
+        vectors = await self._embed_texts(
+            texts, batch_size=batch_size, progress=progress
+        )
+        hashes = version_hashes or {}
+        return [
+            self._build_record(
+                item,
+                vector,
+                field,
+                primary,
+                hashes.get(item.get("id") or item.get("tool_id"), ""),
+            )
+            for (item, field, primary, _), vector in zip(rows, vectors)
+        ]
+
     async def _ensure_ready(self, require_table: bool = True) -> None:
         if not self.initialized:
             await self.initialize()
-        if require_table and self.table is None:
+        if require_table and not self.backend.has_table():
             await self._ensure_table()
 
     # ------------------------------------------------------------------
     # Compatibilidad síncrona
     def _run_blocking(self, coroutine):
-        try:
-            return asyncio.run(coroutine)
-        except RuntimeError as exc:
-            if "asyncio.run() cannot be called from a running event loop" not in str(
-                exc
-            ):
-                raise
+        """Ejecutar ``coroutine`` en el bucle de fondo y esperar su resultado.
+
+        El hilo llamante solo espera el resultado: no se crea un bucle por
+        llamada y, dentro de un bucle ya en marcha, la corrutina no se anida
+        en él.
+        """
 
-        loop = asyncio.new_event_loop()
-        try:
-            return loop.run_until_complete(coroutine)
-        finally:
-            loop.close()
+        return _BRIDGE_LOOP.run(coroutine)
 
     def initialize_sync(self) -> bool:
         """Inicializar el almacén vectorial desde un contexto síncrono."""
@@ -236,67 +673,255 @@ class ATDFVectorStore:
 
     # ------------------------------------------------------------------
     # Operaciones públicas
-    async def create_from_tools(self, tools: Sequence[Any]) -> bool:
+    async def create_from_tools(
+        self,
+        tools: Sequence[Any],
+        *,
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> bool:
+        """Reconstruir la tabla a partir de ``tools`` con embeddings por lotes.
+
+        Los textos se codifican en lotes de ``batch_size`` (por defecto el del
+        almacén) y la tabla se escribe con una única llamada a ``create_table``.
+        ``progress`` recibe ``(procesadas, total)`` tras cada lote; las
+        métricas de la última indexación quedan en ``last_index_stats``.
+        """
+
         await self._ensure_ready(require_table=False)
 
         if not tools:
             return False
 
-        records: List[Dict[str, Any]] = []
-        for tool in tools:
-            record = await self._prepare_record(tool)
-            records.append(record)
+        started = time.perf_counter()
+        records = await self._prepare_records(
+            tools, batch_size=batch_size, progress=progress, fit=True
+        )
 
         if not records:
             return False
 
-        if self.db is None:
-            raise RuntimeError("La base de datos LanceDB no está inicializada")
-
-        self.table = self.db.create_table(
-            self.table_name, data=records, mode="overwrite"
+        self.backend.create(records)
+        self.backend.write_metadata(self._embedding_metadata())
+        self.backend.flush()
+
+        elapsed = time.perf_counter() - started
+        size = max(1, int(batch_size or self.batch_size))
+        indexed = len({parent_of(record) for record in records})
+        self.last_index_stats = {
+            "tools": indexed,
+            "vectors": len(records),
+            "batches": -(-len(records) // size),
+            "seconds": round(elapsed, 4),
+            "tools_per_second": round(indexed / elapsed, 2) if elapsed else 0.0,
+        }
+        logger.info(
+            "Indexadas %d herramientas en %.2fs (%.1f herramientas/s)",
+            indexed,
+            elapsed,
+            self.last_index_stats["tools_per_second"],
         )
         return True
 
     async def add_tool(self, tool: Any) -> bool:
         await self._ensure_ready()
 
-        if self.table is None:
-            raise RuntimeError("La tabla LanceDB no está lista")
+        if self.multi_vector:
+            records = await self._prepare_records([tool])
+        else:
+            records = [await self._prepare_record(tool)]
+        self._replace_records(records)
+        return True
+
+    async def upsert_tools(
+        self,
+        tools: Iterable[Any],
+        *,
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        version_hashes: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """Insertar o reemplazar varias herramientas en bloque.
+
+        Los embeddings se generan por lotes (pasando por la caché) y el backend
+        recibe siempre una única escritura; en LanceDB son dos operaciones, un
+        ``delete`` de los ids afectados y un ``add``, sin importar cuántas
+        herramientas se indiquen. Si un id se repite, prevalece la última
+        aparición. ``version_hashes`` (por id) se guarda en la columna
+        ``version_hash``; ``sync_from_catalog`` la usa para detectar cambios.
+        """
 
-        record = await self._prepare_record(tool)
+        await self._ensure_ready(require_table=False)
 
-        existing = self.table.search().where(f"id = '{record['id']}'").limit(1)
+        tools = list(tools)
+        if not tools:
+            return 0
 
-        if hasattr(existing, "to_pandas"):
-            existing_df = existing.to_pandas()
-        elif hasattr(existing, "to_df"):
-            existing_df = existing.to_df()
-        else:
-            existing_df = existing
+        records = await self._prepare_records(
+            tools,
+            batch_size=batch_size,
+            progress=progress,
+            version_hashes=version_hashes,
+        )
+        # La tabla se abre después de vectorizar: un proveedor recién ajustado
+        # es el que fija la dimensión
+        if not self.backend.has_table():
+            await self._ensure_table()
+        return self._replace_records(records)
+
+    def _replace_records(self, records: Sequence[Dict[str, Any]]) -> int:
+        # Cada fila principal abre una nueva versión de su herramienta, así que
+        # si una herramienta se repite solo se conservan las filas de la última
+        unique: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            parent = parent_of(record)
+            if str(record["id"]) == parent:
+                unique[parent] = [record]
+            else:
+                unique.setdefault(parent, []).append(record)
+        if not unique:
+            return 0
+        self.backend.replace([row for rows in unique.values() for row in rows])
+        return len(unique)
+
+    async def add_tools(self, tools: Iterable[Any]) -> int:
+        return await self.upsert_tools(tools)
+
+    async def sync_from_catalog(
+        self,
+        storage: Any,
+        *,
+        server_urls: Optional[Sequence[str]] = None,
+        full: bool = False,
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Sincronizar la tabla con la tabla ``tools`` de un ``CatalogStorage``.
+
+        Cada fila guarda en la columna ``version_hash`` el hash del catálogo
+        con el que se vectorizó, y la sincronización compara el catálogo con
+        la propia tabla: solo se vuelven a vectorizar las herramientas cuyo
+        hash cambió y se borran las desactivadas. La revisión del catálogo
+        queda como marca de agua en los metadatos de la tabla, de modo que la
+        siguiente llamada solo lee las filas modificadas desde entonces (y no
+        lee nada si no hubo cambios). ``full`` compara el catálogo completo;
+        ``create_from_tools`` reescribe los metadatos y fuerza esa comparación.
+        Las herramientas añadidas fuera del catálogo (sin ``version_hash``) no
+        se borran. Si un ``tool_id`` está activo en varios servidores se indexa
+        el del primero por URL.
+        """
 
-        has_existing = False
-        if hasattr(existing_df, "empty"):
-            has_existing = not bool(existing_df.empty)
+        await self._ensure_ready(require_table=False)
+
+        started = time.perf_counter()
+        servers = sorted(server_urls or [])
+        state = dict(self.backend.read_metadata().get(CATALOG_SYNC_KEY) or {})
+        # Un proveedor sin ajustar fija la dimensión al vectorizar: hasta
+        # entonces no hay tabla que comparar
+        if state or self.provider.fitted:
+            await self._ensure_ready()
+        # Al cambiar de servidores se compara todo: lo que queda fuera se borra
+        if state.get("servers", []) != servers:
+            full = True
+        watermark = None if full else state.get("watermark")
+        revision = await self._offload(storage.catalog_revision)
+
+        stats: Dict[str, Any] = {"upserted": 0, "deleted": 0, "watermark": revision}
+        if watermark == revision:
+            stats.update(unchanged=self.backend.count(), seconds=0.0)
+            self.last_sync_stats = stats
+            return stats
+
+        rows = await self._offload(
+            storage.fetch_versions,
+            since_revision=watermark,
+            server_urls=servers or None,
+        )
+        indexed = self.backend.has_table()
+        if watermark is None:
+            synced = self.backend.version_hashes() if indexed else {}
+            synced = {tool_id: value for tool_id, value in synced.items() if value}
+            touched = set(synced) | {row["tool_id"] for row in rows}
         else:
-            try:
-                has_existing = len(existing_df) > 0  # type: ignore[arg-type]
-            except TypeError:
-                has_existing = False
+            # Una fila cambiada puede ocultar otra activa del mismo tool_id en
+            # otro servidor: se releen todas las filas de esos identificadores
+            touched = {row["tool_id"] for row in rows}
+            synced = self.backend.version_hashes(touched) if indexed else {}
+            rows = []
+            ordered = sorted(touched)
+            for start in range(0, len(ordered), CATALOG_SYNC_CHUNK):
+                rows += await self._offload(
+                    storage.fetch_versions,
+                    server_urls=servers or None,
+                    tool_ids=ordered[start : start + CATALOG_SYNC_CHUNK],
+                )
+            rows.sort(key=lambda row: (row["source"], row["tool_id"]))
+
+        current: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            if row["active"]:
+                current.setdefault(row["tool_id"], row)
+        removed = sorted(
+            tool_id
+            for tool_id in touched
+            if synced.get(tool_id) and tool_id not in current
+        )
+        changed = sorted(
+            tool_id
+            for tool_id, row in current.items()
+            if synced.get(tool_id) != row["version_hash"]
+        )
 
-        if has_existing:
-            self.table.delete(f"id = '{record['id']}'")
+        tools, hashes = await self._fetch_catalog_tools(
+            storage, servers, changed, current
+        )
+        if tools:
+            stats["upserted"] = await self.upsert_tools(
+                tools,
+                batch_size=batch_size,
+                progress=progress,
+                version_hashes=hashes,
+            )
+        elif not self.backend.has_table():
+            await self._ensure_table()
+        stats["deleted"] = self.backend.delete_many(removed)
 
-        self.table.add([record])
-        return True
+        metadata = self.backend.read_metadata() or self._embedding_metadata()
+        metadata[CATALOG_SYNC_KEY] = {
+            "watermark": revision,
+            "servers": servers,
+            "synced_at": time.time(),
+        }
+        self.backend.write_metadata(metadata)
+        self.backend.flush()
 
-    async def add_tools(self, tools: Iterable[Any]) -> int:
-        count = 0
-        for tool in tools:
-            added = await self.add_tool(tool)
-            if added:
-                count += 1
-        return count
+        stats.update(
+            unchanged=self.backend.count() - stats["upserted"],
+            seconds=round(time.perf_counter() - started, 4),
+        )
+        self.last_sync_stats = stats
+        logger.info(
+            "Catálogo sincronizado hasta la revisión %d: %d actualizadas, "
+            "%d eliminadas, %d sin cambios",
+            revision,
+            stats["upserted"],
+            stats["deleted"],
+            stats["unchanged"],
+        )
+        return stats
+
+    def _decode_payload(self, payload: Any) -> Optional[Dict[str, Any]]:
+        if isinstance(payload, str):
+            try:
+                tool_data = json_codec.loads(payload)
+            except json.JSONDecodeError:
+                logger.debug("No se pudo decodificar el payload de la herramienta")
+                return None
+        elif isinstance(payload, dict):
+            tool_data = payload
+        else:
+            return None
+        return self._normalize_tool(tool_data)
 
     async def search_tools(
         self,
@@ -305,33 +930,33 @@ class ATDFVectorStore:
     ) -> List[Dict[str, Any]]:
         await self._ensure_ready()
 
-        if self.table is None:
-            raise RuntimeError("La tabla LanceDB no está lista")
-
         options = options or {}
         limit = int(options.get("limit", 5))
         score_threshold = options.get("score_threshold")
 
-        query_vector = await self._embed_text(query)
-
-        search = self.table.search(query_vector).limit(limit)
+        query_vector = await self._embed_query(query)
 
-        filter_clause = options.get("filter")
-        if not filter_clause and options.get("language"):
-            filter_clause = "true"
-
-        if filter_clause:
-            search = search.where(filter_clause)
+        filters = SearchFilter(
+            language=options.get("language"),
+            category=options.get("category"),
+            tags=options.get("tags") or (),
+            where=options.get("filter"),
+        )
 
-        results_df = search.to_df() if hasattr(search, "to_df") else search.to_pandas()
+        rows = await self._offload(
+            self._search_rows,
+            query_vector,
+            limit,
+            filters,
+            # Con pesos por campo el umbral se aplica a la puntuación ponderada
+            min_score=None if self.field_weights else score_threshold,
+            nprobes=options.get("nprobes"),
+            refine_factor=options.get("refine_factor"),
+        )
 
         matches: List[Dict[str, Any]] = []
-        for _, row in results_df.iterrows():
+        for row in rows:
             score = row.get("score")
-            if score is None and "_distance" in row:
-                distance = float(row["_distance"])
-                score = 1.0 - min(distance, 2.0) / 2.0
-
             if score is not None:
                 try:
                     score_value = float(score)
@@ -350,24 +975,34 @@ class ATDFVectorStore:
             ):
                 continue
 
-            payload = row.get("raw_data") or row.get("data")
-            if isinstance(payload, str):
-                try:
-                    tool_data = json.loads(payload)
-                except json.JSONDecodeError:
-                    logger.debug("No se pudo decodificar el payload de la herramienta")
-                    continue
-            elif isinstance(payload, dict):
-                tool_data = payload
-            else:
+            tool_data = self._decode_payload(row.get("payload"))
+            if tool_data is None:
                 continue
-
-            tool_data = self._normalize_tool(tool_data)
             tool_data["score"] = score_value
             matches.append(tool_data)
 
         return matches
 
+    def _search_rows(
+        self, vector: np.ndarray, limit: int, filters: SearchFilter, **params: Any
+    ) -> List[Dict[str, Any]]:
+        """Top-``limit`` herramientas agrupando sus filas por ``parent_id``.
+
+        Se piden más filas que herramientas (``MULTI_VECTOR_FANOUT`` por cada
+        una en modo multivector) y, si al agrupar no se llega a ``limit``
+        herramientas distintas, la consulta se repite con el doble de filas.
+        """
+
+        if limit <= 0:
+            return []
+        fetch = limit * (MULTI_VECTOR_FANOUT if self.multi_vector else 1)
+        while True:
+            rows = self.backend.search(vector, fetch, filters, **params)
+            tools = aggregate_rows(rows, self.field_weights)
+            if len(tools) >= limit or len(rows) < fetch:
+                return tools[:limit]
+            fetch *= 2
+
     async def find_best_tool(
         self,
         query: str,
@@ -382,133 +1017,102 @@ class ATDFVectorStore:
     async def count_tools(self) -> int:
         await self._ensure_ready()
 
-        if self.table is None:
-            raise RuntimeError("La tabla LanceDB no está lista")
-
-        count_method = getattr(self.table, "count_rows", None)
-        if callable(count_method):
-            try:
-                count = count_method()
-                if inspect.isawaitable(count):
-                    count = await count  # type: ignore[assignment]
-                return int(count)
-            except (TypeError, ValueError):
-                logger.debug("No se pudo obtener el conteo via count_rows")
-
-        try:
-            if hasattr(self.table, "__len__"):
-                return int(len(self.table))  # type: ignore[arg-type]
-        except TypeError:
-            logger.debug("No se pudo obtener el conteo via len(table)")
-
-        raw_results = None
-        if hasattr(self.table, "to_pandas"):
-            raw_results = self.table.to_pandas()
-        elif hasattr(self.table, "to_df"):
-            raw_results = self.table.to_df()
-
-        if raw_results is not None:
-            try:
-                return int(len(raw_results))
-            except TypeError:
-                try:
-                    return int(raw_results.shape[0])  # type: ignore[index]
-                except (AttributeError, TypeError):
-                    logger.debug("No se pudo obtener el conteo del dataframe")
-
-        all_tools = await self.get_all_tools()
-        return len(all_tools)
+        return await self._offload(self.backend.count)
 
-    async def get_all_tools(self) -> List[Dict[str, Any]]:
-        await self._ensure_ready()
+    def _decode_payloads(self) -> Iterator[Dict[str, Any]]:
+        for payload in self.backend.payloads():
+            tool_data = self._decode_payload(payload)
+            if tool_data is not None:
+                yield tool_data
 
-        if self.table is None:
-            raise RuntimeError("La tabla LanceDB no está lista")
+    async def iter_tools(self) -> AsyncIterator[Dict[str, Any]]:
+        """Recorrer las herramientas almacenadas sin cargarlas todas en memoria.
 
-        raw_results = (
-            self.table.to_pandas()
-            if hasattr(self.table, "to_pandas")
-            else self.table.to_df()
-        )
+        El backend lee la tabla por lotes y los payloads se decodifican en el
+        pool de hilos, ``ITER_CHUNK_SIZE`` herramientas cada vez.
+        """
 
-        iterable = (
-            raw_results.iterrows()
-            if hasattr(raw_results, "iterrows")
-            else enumerate(raw_results)
-        )
+        await self._ensure_ready()
 
-        tools: List[Dict[str, Any]] = []
-        for _, row in iterable:
-            payload = (
-                row.get("raw_data") or row.get("data") if hasattr(row, "get") else row
+        tools = self._decode_payloads()
+        while True:
+            chunk = await self._offload(
+                lambda: list(itertools.islice(tools, ITER_CHUNK_SIZE))
             )
-            if isinstance(payload, str):
-                try:
-                    tool_data = json.loads(payload)
-                except json.JSONDecodeError:
-                    continue
-            elif isinstance(payload, dict):
-                tool_data = payload
-            else:
-                continue
-
-            tools.append(self._normalize_tool(tool_data))
+            if not chunk:
+                return
+            for tool_data in chunk:
+                yield tool_data
 
-        return tools
+    async def get_all_tools(self) -> List[Dict[str, Any]]:
+        return [tool_data async for tool_data in self.iter_tools()]
 
     async def get_tool_by_id(self, tool_id: str) -> Optional[Dict[str, Any]]:
         await self._ensure_ready()
 
-        if self.table is None:
-            raise RuntimeError("La tabla LanceDB no está lista")
-
-        search = self.table.search().where(f"id = '{tool_id}'").limit(1)
-
-        if hasattr(search, "to_pandas"):
-            results = search.to_pandas()
-        elif hasattr(search, "to_df"):
-            results = search.to_df()
-        else:
-            results = []
+        payload = await self._offload(self.backend.get, tool_id)
+        if payload is None:
+            return None
+        return self._decode_payload(payload)
 
-        try:
-            has_rows = len(results) > 0  # type: ignore[arg-type]
-        except TypeError:
-            has_rows = False
+    async def delete_tool(self, tool_id: str) -> bool:
+        await self._ensure_ready()
 
-        if not has_rows:
-            return None
+        return self.backend.delete(tool_id)
 
-        row = results.iloc[0] if hasattr(results, "iloc") else results[0]
-        payload = row.get("raw_data") or row.get("data") if hasattr(row, "get") else row
-        if isinstance(payload, str):
-            try:
-                data = json.loads(payload)
-            except json.JSONDecodeError:
-                return None
-        elif isinstance(payload, dict):
-            data = payload
-        else:
-            return None
+    async def build_index(self, *, wait: bool = True) -> bool:
+        """Forzar la construcción del índice ANN sin esperar al umbral de filas.
 
-        return self._normalize_tool(data)
+        Con ``wait=False`` la construcción sigue en un hilo de fondo; el
+        backend NumPy siempre busca de forma exacta y devuelve ``False``.
+        """
 
-    async def delete_tool(self, tool_id: str) -> bool:
         await self._ensure_ready()
 
-        if self.table is None:
-            raise RuntimeError("La tabla LanceDB no está lista")
+        return self.backend.build_index(wait=wait)
 
-        deleted = self.table.delete(f"id = '{tool_id}'")
+    def index_status(self) -> Dict[str, Any]:
+        """Tipo de índice ANN, filas indexadas y escrituras desde su construcción."""
 
-        try:
-            return bool(deleted)
-        except TypeError:
-            return False
+        return self.backend.index_status()
 
     # Métodos síncronos delegando a las versiones asíncronas -----------------
-    def create_from_tools_sync(self, tools: Sequence[Any]) -> bool:
-        return self._run_blocking(self.create_from_tools(tools))
+    def create_from_tools_sync(
+        self,
+        tools: Sequence[Any],
+        *,
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> bool:
+        return self._run_blocking(
+            self.create_from_tools(tools, batch_size=batch_size, progress=progress)
+        )
+
+    async def _fetch_catalog_tools(
+        self,
+        storage: Any,
+        servers: List[str],
+        tool_ids: List[str],
+        current: Dict[str, Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """Descriptores de ``tool_ids`` en su servidor activo y su ``version_hash``."""
+
+        tools: List[Dict[str, Any]] = []
+        hashes: Dict[str, str] = {}
+        for start in range(0, len(tool_ids), CATALOG_SYNC_CHUNK):
+            records = await self._offload(
+                storage.fetch_records,
+                server_urls=servers or None,
+                tool_ids=tool_ids[start : start + CATALOG_SYNC_CHUNK],
+            )
+            for record in records:
+                row = current[record["tool_id"]]
+                if record["source"] == row["source"]:
+                    descriptor = dict(record["descriptor"])
+                    descriptor.setdefault("tool_id", record["tool_id"])
+                    tools.append(descriptor)
+                    hashes[record["tool_id"]] = row["version_hash"]
+        return tools, hashes
 
     def add_tool_sync(self, tool: Any) -> bool:
         return self._run_blocking(self.add_tool(tool))
@@ -516,6 +1120,36 @@ class ATDFVectorStore:
     def add_tools_sync(self, tools: Iterable[Any]) -> int:
         return self._run_blocking(self.add_tools(tools))
 
+    def upsert_tools_sync(
+        self,
+        tools: Iterable[Any],
+        *,
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        return self._run_blocking(
+            self.upsert_tools(tools, batch_size=batch_size, progress=progress)
+        )
+
+    def sync_from_catalog_sync(
+        self,
+        storage: Any,
+        *,
+        server_urls: Optional[Sequence[str]] = None,
+        full: bool = False,
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        return self._run_blocking(
+            self.sync_from_catalog(
+                storage,
+                server_urls=server_urls,
+                full=full,
+                batch_size=batch_size,
+                progress=progress,
+            )
+        )
+
     def search_tools_sync(
         self,
         query: str,
@@ -533,17 +1167,52 @@ class ATDFVectorStore:
     def get_all_tools_sync(self) -> List[Dict[str, Any]]:
         return self._run_blocking(self.get_all_tools())
 
+    def iter_tools_sync(self) -> Iterator[Dict[str, Any]]:
+        self._run_blocking(self._ensure_ready())
+        return self._decode_payloads()
+
     def count_tools_sync(self) -> int:
         return self._run_blocking(self.count_tools())
 
     def get_tool_by_id_sync(self, tool_id: str) -> Optional[Dict[str, Any]]:
         return self._run_blocking(self.get_tool_by_id(tool_id))
 
+    def build_index_sync(self, *, wait: bool = True) -> bool:
+        return self._run_blocking(self.build_index(wait=wait))
+
     def delete_tool_sync(self, tool_id: str) -> bool:
         return self._run_blocking(self.delete_tool(tool_id))
 
+    def flush(self) -> None:
+        """Persistir las escrituras pendientes del backend.
+
+        ``create_from_tools``, ``sync_from_catalog`` y ``close`` lo llaman; tras
+        ``upsert_tools`` o ``delete_tool`` sueltos hay que llamarlo (o cerrar el
+        almacén) para que los cambios sobrevivan al proceso.
+        """
+
+        self.backend.flush()
+
+    def query_cache_stats(self) -> Dict[str, float]:
+        """Tamaño y tasa de aciertos de la LRU de embeddings de consultas."""
+
+        return self.query_cache.stats()
+
     # ------------------------------------------------------------------
     # Limpieza
+    def close(self) -> None:
+        """Persistir las escrituras pendientes y liberar el pool de hilos."""
+
+        self.flush()
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
     def __del__(self) -> None:  # pragma: no cover - destructor defensivo
-        if self._is_temp and self._temp_dir is not None:
-            self._temp_dir.cleanup()
+        executor = getattr(self, "_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=False)
+        temp_dir = getattr(self, "_temp_dir", None)
+        if getattr(self, "_is_temp", False) and temp_dir is not None:
+            temp_dir.cleanup()
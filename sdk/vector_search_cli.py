@@ -11,6 +11,7 @@ Uso:
     python sdk/vector_search_cli.py index --tools-dir ./tools
     python sdk/vector_search_cli.py search "enviar un correo electrónico"
     python sdk/vector_search_cli.py search "find weather information" --limit 3 --lang en
+    python sdk/vector_search_cli.py sync --catalog ./selector.db
 """
 
 import argparse
@@ -22,6 +23,8 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
+from sdk.core.utils import iter_tools_from_directory
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -32,6 +35,8 @@ logger = logging.getLogger("atdf-vector-cli")
 try:
     from sdk.atdf_sdk import ATDFTool, ATDFToolbox
     from sdk.vector_search import ATDFVectorStore
+    from sdk.vector_search.embeddings import EMBEDDING_PROVIDERS
+    from sdk.vector_search.vector_store import VECTOR_BACKENDS
 
     HAS_VECTOR_DEPENDENCIES = True
 except ImportError as e:
@@ -41,14 +46,20 @@ except ImportError as e:
         "pip install lancedb sentence-transformers"
     )
     HAS_VECTOR_DEPENDENCIES = False
+    VECTOR_BACKENDS = ("auto", "lancedb", "numpy")
+    EMBEDDING_PROVIDERS = ("sentence-transformers", "hashing", "tfidf", "onnx")
 
 
-def load_tools_from_directory(tools_dir: str) -> List[Dict[str, Any]]:
+def load_tools_from_directory(tools_dir: str, workers: int = 0) -> List[Dict[str, Any]]:
     """
     Cargar herramientas ATDF desde un directorio.
 
+    Los archivos JSON del directorio y sus subdirectorios se leen de forma
+    incremental con ``iter_tools_from_directory``.
+
     Args:
         tools_dir: Ruta al directorio con archivos JSON de herramientas
+        workers: Hilos para leer los archivos en paralelo (0 para no usarlos)
 
     Returns:
         Lista de diccionarios con datos de herramientas
@@ -60,32 +71,49 @@ def load_tools_from_directory(tools_dir: str) -> List[Dict[str, Any]]:
         logger.error(f"El directorio {tools_dir} no existe o no es un directorio")
         return []
 
-    # Buscar archivos JSON en el directorio y subdirectorios
-    json_files = list(tools_path.glob("**/*.json"))
-    logger.info(f"Se encontraron {len(json_files)} archivos JSON en {tools_dir}")
-
-    for json_file in json_files:
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                tool_data = json.load(f)
-
-                # Verificar que el archivo tiene la estructura mínima de una herramienta ATDF
-                if all(key in tool_data for key in ["tool_id", "description"]):
-                    tools.append(tool_data)
-                    logger.debug(f"Cargada herramienta: {tool_data['tool_id']}")
-                else:
-                    logger.warning(
-                        f"El archivo {json_file} no tiene la estructura "
-                        "mínima de una herramienta ATDF"
-                    )
-        except json.JSONDecodeError:
-            logger.error(f"Error al decodificar el archivo JSON: {json_file}")
-        except Exception as e:
-            logger.error(f"Error al procesar el archivo {json_file}: {e}")
+    for json_file, tool_data in iter_tools_from_directory(
+        tools_path,
+        recursive=True,
+        workers=workers,
+        extensions=(".json",),
+        with_paths=True,
+    ):
+        # Verificar que la herramienta tiene la estructura mínima de ATDF
+        if all(key in tool_data for key in ["tool_id", "description"]):
+            tools.append(tool_data)
+            logger.debug(f"Cargada herramienta: {tool_data['tool_id']}")
+        else:
+            logger.warning(
+                f"El archivo {json_file} no tiene la estructura "
+                "mínima de una herramienta ATDF"
+            )
 
     return tools
 
 
+def load_tools_file(tools_file: str) -> List[Dict[str, Any]]:
+    """
+    Cargar la lista de herramientas de un archivo JSON.
+
+    Args:
+        tools_file: Ruta al archivo
+
+    Returns:
+        Lista de herramientas (vacía si el archivo no es válido)
+    """
+    try:
+        with open(tools_file, "r", encoding="utf-8") as f:
+            file_tools = json.load(f)
+    except Exception as e:
+        logger.error(f"Error al cargar herramientas desde {tools_file}: {e}")
+        return []
+    if not isinstance(file_tools, list):
+        logger.error(f"El archivo {tools_file} no contiene una lista de herramientas")
+        return []
+    logger.info(f"Se cargaron {len(file_tools)} herramientas desde {tools_file}")
+    return file_tools
+
+
 async def index_tools(args) -> None:
     """
     Indexar herramientas en la base de datos vectorial.
@@ -101,45 +129,54 @@ async def index_tools(args) -> None:
     tools_data = []
 
     if args.tools_dir:
-        tools_data = load_tools_from_directory(args.tools_dir)
+        tools_data = load_tools_from_directory(args.tools_dir, workers=args.workers)
         logger.info(
             f"Se cargaron {len(tools_data)} herramientas desde {args.tools_dir}"
         )
 
     if args.tools_file:
-        try:
-            with open(args.tools_file, "r", encoding="utf-8") as f:
-                file_tools = json.load(f)
-                if isinstance(file_tools, list):
-                    tools_data.extend(file_tools)
-                    logger.info(
-                        f"Se cargaron {len(file_tools)} herramientas desde {args.tools_file}"
-                    )
-                else:
-                    logger.error(
-                        f"El archivo {args.tools_file} no contiene una lista de herramientas"
-                    )
-        except Exception as e:
-            logger.error(f"Error al cargar herramientas desde {args.tools_file}: {e}")
+        tools_data.extend(load_tools_file(args.tools_file))
 
     if not tools_data:
         logger.error("No se encontraron herramientas para indexar")
         return
 
-    # Convertir a objetos ATDFTool
-    atdf_tools = [ATDFTool(tool_data) for tool_data in tools_data]
+    # Convertir a objetos ATDFTool; en modo multivector se indexan los
+    # diccionarios originales para conservar localization y how_to_use
+    atdf_tools = (
+        tools_data
+        if args.multi_vector
+        else [ATDFTool(tool_data) for tool_data in tools_data]
+    )
 
     # Inicializar y crear vector store
-    vector_store = ATDFVectorStore(db_path=args.db_path, model_name=args.model)
+    vector_store = ATDFVectorStore(
+        db_path=args.db_path,
+        model_name=args.model,
+        batch_size=args.batch_size,
+        backend=args.backend,
+        embedding_provider=args.embedding_provider,
+        multi_vector=args.multi_vector,
+    )
 
     logger.info(f"Inicializando almacén vectorial en {args.db_path}...")
     await vector_store.initialize()
 
+    def report_progress(done: int, total: int) -> None:
+        logger.info(f"Embeddings generados: {done}/{total}")
+
     logger.info(f"Indexando {len(atdf_tools)} herramientas...")
-    success = await vector_store.create_from_tools(atdf_tools)
+    success = await vector_store.create_from_tools(atdf_tools, progress=report_progress)
 
     if success:
         logger.info("✅ Indexación completada con éxito")
+        if vector_store.embedding_cache is not None:
+            stats = vector_store.embedding_cache.stats()
+            logger.info(
+                f"Caché de embeddings: {stats['hits']} aciertos, "
+                f"{stats['misses']} fallos, {stats['entries']} entradas "
+                f"({stats['size_bytes'] / 1024:.1f} KiB)"
+            )
     else:
         logger.error("❌ Error durante la indexación")
 
@@ -164,7 +201,13 @@ async def search_tools(args) -> None:
         return
 
     # Inicializar vector store
-    vector_store = ATDFVectorStore(db_path=args.db_path, model_name=args.model)
+    vector_store = ATDFVectorStore(
+        db_path=args.db_path,
+        model_name=args.model,
+        backend=args.backend,
+        embedding_provider=args.embedding_provider,
+        multi_vector=args.multi_vector,
+    )
 
     logger.info(f"Inicializando almacén vectorial en {args.db_path}...")
     await vector_store.initialize()
@@ -220,6 +263,50 @@ async def search_tools(args) -> None:
     print("\n" + "-" * 80)
 
 
+async def sync_catalog(args) -> None:
+    """
+    Sincronizar la base vectorial con el catálogo SQLite del selector.
+
+    Args:
+        args: Argumentos de línea de comandos
+    """
+    if not HAS_VECTOR_DEPENDENCIES:
+        logger.error("Dependencias de búsqueda vectorial no instaladas")
+        return
+
+    if not os.path.exists(args.catalog):
+        logger.error(f"El catálogo {args.catalog} no existe")
+        return
+
+    from selector.storage import CatalogStorage
+
+    storage = CatalogStorage(Path(args.catalog))
+    vector_store = ATDFVectorStore(
+        db_path=args.db_path,
+        model_name=args.model,
+        batch_size=args.batch_size,
+        backend=args.backend,
+        embedding_provider=args.embedding_provider,
+        multi_vector=args.multi_vector,
+    )
+
+    logger.info(f"Inicializando almacén vectorial en {args.db_path}...")
+    await vector_store.initialize()
+
+    try:
+        stats = await vector_store.sync_from_catalog(
+            storage, server_urls=args.servers, full=args.full
+        )
+    finally:
+        storage.close()
+        vector_store.close()
+
+    print(
+        f"✅ Revisión {stats['watermark']}: {stats['upserted']} actualizadas, "
+        f"{stats['deleted']} eliminadas, {stats['unchanged']} sin cambios"
+    )
+
+
 async def manage_db(args) -> None:
     """
     Administrar la base de datos vectorial.
@@ -237,7 +324,12 @@ async def manage_db(args) -> None:
             return
 
         # Inicializar vector store
-        vector_store = ATDFVectorStore(db_path=args.db_path, model_name=args.model)
+        vector_store = ATDFVectorStore(
+            db_path=args.db_path,
+            model_name=args.model,
+            backend=args.backend,
+            embedding_provider=args.embedding_provider,
+        )
 
         await vector_store.initialize()
 
@@ -295,12 +387,47 @@ def main():
     index_parser.add_argument(
         "--tools-file", help="Archivo JSON con lista de herramientas ATDF"
     )
+    index_parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Hilos para leer los archivos de --tools-dir en paralelo",
+    )
     index_parser.add_argument(
         "--db-path", default="./vector_db", help="Ruta para la base de datos vectorial"
     )
+    index_parser.add_argument(
+        "--backend",
+        choices=VECTOR_BACKENDS,
+        default="auto",
+        help="Backend de almacenamiento vectorial (auto: LanceDB si está instalado)",
+    )
+    index_parser.add_argument(
+        "--embedding-provider",
+        choices=EMBEDDING_PROVIDERS,
+        default="sentence-transformers",
+        help=(
+            "Proveedor de embeddings (hashing y tfidf no necesitan modelos; "
+            "onnx usa --model como ruta al modelo)"
+        ),
+    )
     index_parser.add_argument(
         "--model", default="all-MiniLM-L6-v2", help="Modelo de embeddings a utilizar"
     )
+    index_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=64,
+        help="Número de herramientas codificadas por lote de embeddings",
+    )
+    index_parser.add_argument(
+        "--multi-vector",
+        action="store_true",
+        help=(
+            "Un vector por campo (descripción, cuándo usar, parámetros) y por "
+            "idioma de localization"
+        ),
+    )
 
     # Comando: search
     search_parser = subparsers.add_parser(
@@ -320,15 +447,85 @@ def main():
     search_parser.add_argument(
         "--db-path", default="./vector_db", help="Ruta de la base de datos vectorial"
     )
+    search_parser.add_argument(
+        "--backend",
+        choices=VECTOR_BACKENDS,
+        default="auto",
+        help="Backend de almacenamiento vectorial (auto: LanceDB si está instalado)",
+    )
+    search_parser.add_argument(
+        "--embedding-provider",
+        choices=EMBEDDING_PROVIDERS,
+        default="sentence-transformers",
+        help=(
+            "Proveedor de embeddings (hashing y tfidf no necesitan modelos; "
+            "onnx usa --model como ruta al modelo)"
+        ),
+    )
     search_parser.add_argument(
         "--model", default="all-MiniLM-L6-v2", help="Modelo de embeddings a utilizar"
     )
+    search_parser.add_argument(
+        "--multi-vector",
+        action="store_true",
+        help="La base se indexó con --multi-vector (pide más filas por herramienta)",
+    )
     search_parser.add_argument(
         "--detail",
         action="store_true",
         help="Mostrar detalles completos de las herramientas",
     )
 
+    # Comando: sync
+    sync_parser = subparsers.add_parser(
+        "sync", help="Sincronizar con el catálogo SQLite del selector"
+    )
+    sync_parser.add_argument(
+        "--catalog",
+        required=True,
+        help="Base SQLite del catálogo (la de selector --storage)",
+    )
+    sync_parser.add_argument(
+        "--servers", nargs="*", help="Sincronizar solo estos servidores (URL)"
+    )
+    sync_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Comparar el catálogo completo en lugar de los cambios desde la marca",
+    )
+    sync_parser.add_argument(
+        "--db-path", default="./vector_db", help="Ruta de la base de datos vectorial"
+    )
+    sync_parser.add_argument(
+        "--backend",
+        choices=VECTOR_BACKENDS,
+        default="auto",
+        help="Backend de almacenamiento vectorial (auto: LanceDB si está instalado)",
+    )
+    sync_parser.add_argument(
+        "--embedding-provider",
+        choices=EMBEDDING_PROVIDERS,
+        default="sentence-transformers",
+        help=(
+            "Proveedor de embeddings (hashing y tfidf no necesitan modelos; "
+            "onnx usa --model como ruta al modelo)"
+        ),
+    )
+    sync_parser.add_argument(
+        "--model", default="all-MiniLM-L6-v2", help="Modelo de embeddings a utilizar"
+    )
+    sync_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=64,
+        help="Número de herramientas codificadas por lote de embeddings",
+    )
+    sync_parser.add_argument(
+        "--multi-vector",
+        action="store_true",
+        help="La base se indexó con --multi-vector",
+    )
+
     # Comando: db
     db_parser = subparsers.add_parser(
         "db", help="Administrar la base de datos vectorial"
@@ -342,6 +539,21 @@ def main():
     db_parser.add_argument(
         "--db-path", default="./vector_db", help="Ruta de la base de datos vectorial"
     )
+    db_parser.add_argument(
+        "--backend",
+        choices=VECTOR_BACKENDS,
+        default="auto",
+        help="Backend de almacenamiento vectorial (auto: LanceDB si está instalado)",
+    )
+    db_parser.add_argument(
+        "--embedding-provider",
+        choices=EMBEDDING_PROVIDERS,
+        default="sentence-transformers",
+        help=(
+            "Proveedor de embeddings (hashing y tfidf no necesitan modelos; "
+            "onnx usa --model como ruta al modelo)"
+        ),
+    )
     db_parser.add_argument(
         "--model", default="all-MiniLM-L6-v2", help="Modelo de embeddings a utilizar"
     )
@@ -364,6 +576,8 @@ def main():
             asyncio.run(index_tools(args))
         elif args.command == "search":
             asyncio.run(search_tools(args))
+        elif args.command == "sync":
+            asyncio.run(sync_catalog(args))
         elif args.command == "db":
             asyncio.run(manage_db(args))
     except KeyboardInterrupt:
@@ -1,13 +1,20 @@
 """Utilities for ATDF tool selection and catalog management."""
 
 from .catalog import ATDFToolRecord, ToolCatalog
-from .ranker import RankedTool, ToolRanker
+from .index import CatalogIndex
+from .ranker import RANKING_MODES, RankedTool, ToolRanker
+from .retrieval import BM25Index, HashingEmbedder, VectorIndex
 from .storage import CatalogStorage
 
 __all__ = [
     "ATDFToolRecord",
     "ToolCatalog",
+    "CatalogIndex",
     "RankedTool",
     "ToolRanker",
+    "RANKING_MODES",
+    "BM25Index",
+    "VectorIndex",
+    "HashingEmbedder",
     "CatalogStorage",
 ]
@@ -4,23 +4,57 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import List, Literal, Optional
+from typing import Any, List, Literal, Optional
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
+from sdk.core import json_codec
+
 from .catalog import ToolCatalog
-from .ranker import ToolRanker
-from .storage import CatalogStorage
+from .ranker import RANKING_MODES, ToolRanker
+from .storage import (
+    DEFAULT_FEEDBACK_HALF_LIFE_HOURS,
+    DEFAULT_FEEDBACK_WINDOW_MINUTES,
+    CatalogStorage,
+)
 
 DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / "schema" / "examples"
 DB_PATH = os.environ.get("ATDF_SELECTOR_DB")
-
-_storage = CatalogStorage(Path(DB_PATH)) if DB_PATH else None
+FEEDBACK_HALF_LIFE_HOURS = float(
+    os.environ.get("ATDF_FEEDBACK_HALF_LIFE_HOURS", DEFAULT_FEEDBACK_HALF_LIFE_HOURS)
+)
+FEEDBACK_WINDOW_MINUTES = int(
+    os.environ.get("ATDF_FEEDBACK_WINDOW_MINUTES", DEFAULT_FEEDBACK_WINDOW_MINUTES)
+)
+DEFAULT_RANKING_MODE = os.environ.get("ATDF_RANKING_MODE", "heuristic")
+
+_storage = (
+    CatalogStorage(
+        Path(DB_PATH),
+        feedback_half_life_hours=FEEDBACK_HALF_LIFE_HOURS,
+        feedback_window_minutes=FEEDBACK_WINDOW_MINUTES,
+    )
+    if DB_PATH
+    else None
+)
 _catalog = ToolCatalog(storage=_storage)
 _ranker = ToolRanker(_catalog)
 
-app = FastAPI(title="ATDF Tool Selector", version="0.2.0")
+
+class CodecJSONResponse(JSONResponse):
+    """JSON response rendered with the active ``sdk.core.json_codec`` codec."""
+
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps_bytes(content)
+
+
+app = FastAPI(
+    title="ATDF Tool Selector",
+    version="0.2.0",
+    default_response_class=CodecJSONResponse,
+)
 
 
 class RecommendRequest(BaseModel):
@@ -40,6 +74,10 @@ class RecommendRequest(BaseModel):
     allowed_tools: Optional[List[str]] = Field(
         None, description="Restrict ranking to specific tool identifiers"
     )
+    mode: str = Field(
+        DEFAULT_RANKING_MODE,
+        description=f"Ranking mode: one of {', '.join(RANKING_MODES)}",
+    )
 
 
 class FeedbackRequest(BaseModel):
@@ -65,7 +103,7 @@ class ReloadRequest(BaseModel):
 @app.on_event("startup")
 async def load_initial_catalog() -> None:
     if _storage and _storage.bootstrap_records():
-        _catalog.list_tools()
+        _catalog.snapshot()
         return
 
     sources = os.environ.get("ATDF_CATALOG_DIR")
@@ -80,6 +118,8 @@ async def load_initial_catalog() -> None:
     mcp_endpoint = os.environ.get("ATDF_MCP_TOOLS_URL")
     if mcp_endpoint:
         _catalog.load_from_mcp(mcp_endpoint)
+    # Build the index (and the ranker's vectors) before the first request
+    _catalog.snapshot()
 
 
 @app.on_event("shutdown")
@@ -121,6 +161,7 @@ def recommend_tools(payload: RecommendRequest) -> RecommendResponse:
             preferred_language=payload.language,
             sources=payload.servers,
             tool_ids=payload.allowed_tools,
+            mode=payload.mode,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -131,8 +172,7 @@ def recommend_tools(payload: RecommendRequest) -> RecommendResponse:
 
 @app.post("/catalog/reload", tags=["catalog"])
 def reload_catalog(request: ReloadRequest) -> dict:
-    _catalog.tools.clear()
-    _catalog.errors.clear()
+    _catalog.clear()
 
     loaded = 0
     if request.directory:
@@ -144,6 +184,7 @@ def reload_catalog(request: ReloadRequest) -> dict:
         loaded += _catalog.load_from_mcp(request.mcp_endpoint)
     if not request.directory and not request.mcp_endpoint and DEFAULT_DATA_DIR.exists():
         loaded += _catalog.load_directory(DEFAULT_DATA_DIR)
+    _catalog.snapshot()
 
     return {
         "tool_count": len(_catalog.list_tools()),
@@ -164,6 +205,5 @@ def submit_feedback(payload: FeedbackRequest) -> dict:
         outcome=payload.outcome,
         detail=payload.detail,
     )
-    summary = _catalog.storage.feedback_summary() if _catalog.storage else {}
-    key = f"{payload.server}::{payload.tool_id}"
-    return {"status": "recorded", "stats": summary.get(key, {"success": 0, "error": 0})}
+    stats = _catalog.storage.feedback_stats(payload.server, payload.tool_id)
+    return {"status": "recorded", "stats": stats}
@@ -13,6 +13,10 @@ from urllib.request import Request, urlopen
 
 import jsonschema
 
+from sdk.core import json_codec
+
+from .index import CatalogIndex
+from .retrieval import Embedder
 from .storage import CatalogStorage
 
 LOGGER = logging.getLogger(__name__)
@@ -59,6 +63,10 @@ class ToolCatalog:
         self._enhanced_schema = self._load_schema("enhanced_atdf_schema.json")
         self._tools: Dict[str, ATDFToolRecord] = {}
         self._errors: List[str] = []
+        self._revision = 0
+        self._index: Optional[CatalogIndex] = None
+        self._index_revision: Optional[tuple] = None
+        self._embedders: Dict[str, Embedder] = {}
         self.storage = storage
         if self.storage:
             self._bootstrap_from_storage()
@@ -74,6 +82,38 @@ class ToolCatalog:
     def errors(self) -> List[str]:
         return self._errors
 
+    def clear(self) -> None:
+        """Drop every in-memory record and pending error."""
+        self._tools.clear()
+        self._errors.clear()
+        self._revision += 1
+
+    def snapshot(self) -> CatalogIndex:
+        """Return a partitioned index of the active tools.
+
+        The index is rebuilt only when the catalog (or its storage) changed
+        since the previous call, so repeated rankings share one snapshot.
+        """
+        revision = (
+            self._revision,
+            self.storage.revision() if self.storage else None,
+        )
+        if self._index is None or self._index_revision != revision:
+            self._index = CatalogIndex(
+                self.list_tools(), embedders=list(self._embedders.values())
+            )
+            self._index_revision = revision
+        return self._index
+
+    def register_embedder(self, embedder: Embedder) -> None:
+        """Build ``embedder``'s vectors with every snapshot from now on.
+
+        The current snapshot, if any, is warmed immediately.
+        """
+        self._embedders[embedder.name] = embedder
+        if self._index is not None:
+            self._index.vectors(embedder)
+
     def add_tool(
         self,
         descriptor: Dict[str, object],
@@ -93,6 +133,7 @@ class ToolCatalog:
         if key in self._tools:
             LOGGER.info("Replacing existing descriptor for key=%s", key)
         self._tools[key] = record
+        self._revision += 1
 
         if self.storage and server_id is not None:
             self.storage.upsert_tool(
@@ -162,7 +203,7 @@ class ToolCatalog:
             with urlopen(
                 request, timeout=timeout
             ) as response:  # nosec B310 - controlled URL
-                payload = json.loads(response.read().decode("utf-8"))
+                payload = json_codec.loads(response.read())
         except (HTTPError, URLError, json.JSONDecodeError) as exc:
             message = f"Failed to load tools from MCP endpoint {url}: {exc}"
             LOGGER.warning(message)
@@ -240,7 +281,7 @@ class ToolCatalog:
             records = [record for record in records if record.tool_id in tool_id_set]
         return sorted(records, key=lambda record: (record.source, record.tool_id))
 
-    def feedback_summary(self) -> Dict[str, Dict[str, int]]:
+    def feedback_summary(self) -> Dict[str, Dict[str, float]]:
         if not self.storage:
             return {}
         return self.storage.feedback_summary()
@@ -282,7 +323,7 @@ class ToolCatalog:
                 import yaml  # Lazy import to avoid mandatory dependency
 
                 return yaml.safe_load(text)
-            return json.loads(text)
+            return json_codec.loads(text)
         except Exception as exc:  # pragma: no cover - defensive logging
             message = f"Failed to read descriptor {path}: {exc}"
             LOGGER.warning(message)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import json
+from datetime import timedelta
 from pathlib import Path
 from textwrap import shorten
 from typing import Iterable, List, Optional
@@ -58,6 +59,15 @@ def build_parser() -> argparse.ArgumentParser:
         nargs="*",
         help="Filter catalog listing by specific tool identifiers.",
     )
+    parser.add_argument(
+        "--compact-feedback",
+        type=float,
+        metavar="DAYS",
+        help=(
+            "Fold feedback events into the decayed aggregates and prune raw "
+            "rows older than DAYS (requires --storage)."
+        ),
+    )
     return parser
 
 
@@ -99,8 +109,19 @@ def main(argv: Optional[List[str]] = None) -> int:
     args = parser.parse_args(argv)
 
     storage = CatalogStorage(Path(args.storage)) if args.storage else None
+    if args.compact_feedback is not None and not storage:
+        parser.error("--compact-feedback requires --storage")
     catalog = ToolCatalog(storage=storage)
 
+    if storage and args.compact_feedback is not None:
+        result = storage.compact_feedback(
+            older_than=timedelta(days=args.compact_feedback)
+        )
+        print(
+            f"Feedback compacted: {result['folded']} folded, "
+            f"{result['pruned']} pruned"
+        )
+
     loaded = 0
     if args.dir:
         loaded += catalog.load_directory(
@@ -0,0 +1,150 @@
+"""Partitioned in-memory index over a snapshot of the tool catalog."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .retrieval import BM25Index, Embedder, VectorIndex, document_text
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .catalog import ATDFToolRecord
+
+
+class CatalogIndex:
+    """Immutable snapshot of catalog records partitioned by source and language.
+
+    Records keep the catalog ordering (``source``, ``tool_id``). Each source,
+    language and tool identifier maps to a sorted array of record positions, so
+    filtered queries only touch the partitions they name. Language membership
+    is exposed as NumPy boolean masks because the ranker checks it for every
+    candidate. BM25 postings are built lazily on first use; embedding
+    matrices are built with the snapshot for every embedder in ``embedders``
+    (and lazily for any other). Both are shared by every query against the
+    snapshot.
+    """
+
+    def __init__(
+        self,
+        records: Sequence[ATDFToolRecord],
+        embedders: Sequence[Embedder] = (),
+    ) -> None:
+        self.records: List[ATDFToolRecord] = list(records)
+        self.tool_id_text: List[str] = []
+        self.searchable_text: List[str] = []
+        self.tag_text: List[str] = []
+
+        sources: Dict[str, List[int]] = {}
+        languages: Dict[str, List[int]] = {}
+        tool_ids: Dict[str, List[int]] = {}
+        for position, record in enumerate(self.records):
+            sources.setdefault(record.source.lower(), []).append(position)
+            for language in record.languages:
+                languages.setdefault(language.lower(), []).append(position)
+            tool_ids.setdefault(record.tool_id, []).append(position)
+
+            self.tool_id_text.append(record.tool_id.lower())
+            self.searchable_text.append(
+                " ".join(
+                    filter(
+                        None,
+                        [record.tool_id, record.description, record.when_to_use or ""],
+                    )
+                ).lower()
+            )
+            self.tag_text.append(" ".join(record.tags).lower())
+
+        self._source_partitions = _as_partitions(sources)
+        self._language_partitions = _as_partitions(languages)
+        self._tool_partitions = _as_partitions(tool_ids)
+        self._language_masks: Dict[str, np.ndarray] = {}
+        self._documents: Optional[List[str]] = None
+        self._lexical: Optional[BM25Index] = None
+        self._vectors: Dict[str, VectorIndex] = {}
+        for embedder in embedders:
+            self.vectors(embedder)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def sources(self) -> List[str]:
+        return sorted(self._source_partitions)
+
+    @property
+    def languages(self) -> List[str]:
+        return sorted(self._language_partitions)
+
+    def select(
+        self,
+        *,
+        sources: Optional[Sequence[str]] = None,
+        tool_ids: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """Return the sorted record positions matching the given filters."""
+        if not sources and not tool_ids:
+            return np.arange(len(self.records), dtype=np.int32)
+
+        selected: Optional[np.ndarray] = None
+        if sources:
+            selected = self._union(
+                self._source_partitions, {value.lower() for value in sources}
+            )
+        if tool_ids:
+            by_tool = self._union(self._tool_partitions, set(tool_ids))
+            selected = (
+                by_tool
+                if selected is None
+                else np.intersect1d(selected, by_tool, assume_unique=True)
+            )
+        return selected
+
+    def language_mask(self, language: str) -> np.ndarray:
+        """Boolean mask of records offering a language starting with ``language``."""
+        prefix = language.lower()
+        mask = self._language_masks.get(prefix)
+        if mask is None:
+            mask = np.zeros(len(self.records), dtype=bool)
+            for key, positions in self._language_partitions.items():
+                if key.startswith(prefix):
+                    mask[positions] = True
+            self._language_masks[prefix] = mask
+        return mask
+
+    @property
+    def documents(self) -> List[str]:
+        """Full retrieval text of each record, localizations included."""
+        if self._documents is None:
+            self._documents = [document_text(record) for record in self.records]
+        return self._documents
+
+    def lexical(self) -> BM25Index:
+        """BM25 postings for the snapshot, built on first use."""
+        if self._lexical is None:
+            self._lexical = BM25Index(self.documents)
+        return self._lexical
+
+    def vectors(self, embedder: Embedder) -> VectorIndex:
+        """Embedding matrix for ``embedder``, built on first use."""
+        index = self._vectors.get(embedder.name)
+        if index is None:
+            index = VectorIndex(self.documents, embedder)
+            self._vectors[embedder.name] = index
+        return index
+
+    @staticmethod
+    def _union(partitions: Dict[str, np.ndarray], keys: set) -> np.ndarray:
+        parts = [partitions[key] for key in keys if key in partitions]
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        if len(parts) == 1:
+            return parts[0]
+        return np.unique(np.concatenate(parts))
+
+
+def _as_partitions(groups: Dict[str, List[int]]) -> Dict[str, np.ndarray]:
+    return {key: np.asarray(value, dtype=np.int32) for key, value in groups.items()}
+
+
+__all__ = ["CatalogIndex"]
@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+import heapq
 import math
-import re
 from dataclasses import dataclass, field
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .catalog import ATDFToolRecord, ToolCatalog
+from .index import CatalogIndex
+from .retrieval import Embedder, HashingEmbedder, reciprocal_rank_fusion, tokenize
+
+RANKING_MODES = ("heuristic", "bm25", "vector", "hybrid")
 
-_TOKEN_PATTERN = re.compile(r"[\w-]+", re.UNICODE)
+# Language and feedback adjustments are expressed in heuristic points; fused
+# and cosine scores live roughly in [0, 2], so the adjustments are scaled down.
+_ADJUSTMENT_SCALE = {"heuristic": 1.0, "bm25": 1.0, "vector": 0.1, "hybrid": 0.1}
 
 
 @dataclass(order=True)
@@ -37,10 +45,35 @@ class RankedTool:
 
 
 class ToolRanker:
-    """Simple heuristic-based ranker for ATDF tools."""
+    """Rank catalog tools for a query with one of several retrieval modes.
+
+    ``heuristic`` is the original token-matching score. ``bm25`` and
+    ``vector`` rank with the snapshot's BM25 postings and embedding matrix.
+    ``hybrid`` takes a BM25 candidate pool, topped up when the lexical pass
+    finds too few tools with the nearest tools among a bounded probe of the
+    vector index (:meth:`VectorIndex.probe`, at most about ``probe_rows``
+    rows), reorders the pool by embedding similarity and fuses both rankings
+    with reciprocal-rank fusion. Language preference and feedback
+    adjustments apply on top in every mode.
+
+    The ranker registers its embedder with the catalog, so embedding
+    matrices are built together with each catalog snapshot rather than by
+    the first query that needs them.
+    """
 
-    def __init__(self, catalog: ToolCatalog) -> None:
+    def __init__(
+        self,
+        catalog: ToolCatalog,
+        *,
+        embedder: Optional[Embedder] = None,
+        candidate_pool: int = 50,
+        rrf_k: int = 60,
+    ) -> None:
         self.catalog = catalog
+        self.embedder = embedder or HashingEmbedder()
+        self.candidate_pool = candidate_pool
+        self.rrf_k = rrf_k
+        catalog.register_embedder(self.embedder)
 
     def rank(
         self,
@@ -49,35 +82,136 @@ class ToolRanker:
         preferred_language: Optional[str] = None,
         sources: Optional[Sequence[str]] = None,
         tool_ids: Optional[Sequence[str]] = None,
+        mode: str = "heuristic",
     ) -> List[RankedTool]:
         query = (query or "").strip()
         if not query:
             raise ValueError("Query cannot be empty when ranking tools")
+        if mode not in RANKING_MODES:
+            raise ValueError(
+                f"Unknown ranking mode '{mode}'; "
+                f"expected one of {', '.join(RANKING_MODES)}"
+            )
 
         tokens = self._tokenize(query)
-        results: List[RankedTool] = []
+        index = self.catalog.snapshot()
+        positions = index.select(sources=sources, tool_ids=tool_ids)
+        language_mask = (
+            index.language_mask(preferred_language) if preferred_language else None
+        )
         feedback = getattr(self.catalog, "feedback_summary", lambda: {})()
 
-        for record in self.catalog.list_tools(sources=sources, tool_ids=tool_ids):
-            score, reasons = self._score_record(record, tokens, preferred_language)
+        if mode == "heuristic":
+            candidates = [
+                (position,)
+                + self._score_record(
+                    index, position, tokens, preferred_language, language_mask
+                )
+                for position in positions.tolist()
+            ]
+        else:
+            candidates = self._retrieve(mode, index, positions, query, top_n)
+            if language_mask is not None:
+                candidates = [
+                    (
+                        position,
+                        score
+                        + _ADJUSTMENT_SCALE[mode]
+                        * self._language_adjustment(
+                            bool(language_mask[position]), preferred_language, reasons
+                        ),
+                        reasons,
+                    )
+                    for position, score, reasons in candidates
+                ]
+
+        scale = _ADJUSTMENT_SCALE[mode]
+        results: List[RankedTool] = []
+        for position, score, reasons in candidates:
+            record = index.records[position]
             key = f"{record.source}::{record.tool_id}"
             stats = feedback.get(key) if feedback else None
             if stats:
-                success = int(stats.get("success", 0) or 0)
-                error = int(stats.get("error", 0) or 0)
-                if success:
-                    score += min(success, 3) * 0.5
-                    reasons.append(f"historical successes: {success}")
-                if error:
-                    score -= min(error, 3) * 0.75
-                    reasons.append(f"historical errors: {error}")
+                score += scale * self._feedback_adjustment(stats, reasons)
             if score <= 0:
                 continue
             results.append(RankedTool(score=score, record=record, reasons=reasons))
 
+        if top_n > 0:
+            return heapq.nlargest(top_n, results)
         results.sort(reverse=True)
+        return results
+
+    # ------------------------------------------------------------------
+    # Retrieval modes
+    # ------------------------------------------------------------------
+    def _retrieve(
+        self,
+        mode: str,
+        index: CatalogIndex,
+        positions: np.ndarray,
+        query: str,
+        top_n: int,
+    ) -> List[Tuple[int, float, List[str]]]:
+        """Return ``(position, base score, reasons)`` for the mode's candidates."""
         if top_n > 0:
-            return results[:top_n]
+            pool = max(self.candidate_pool, top_n)
+        else:
+            pool = len(positions)
+
+        if mode == "bm25":
+            found, scores = index.lexical().search(query, positions, pool)
+            return [
+                (position, float(score), [f"bm25 score {score:.3f}"])
+                for position, score in zip(found.tolist(), scores.tolist())
+            ]
+
+        vectors = index.vectors(self.embedder)
+        query_vector = vectors.embed_query(query)
+        if mode == "vector":
+            found, scores = vectors.search(query_vector, positions, pool)
+            return [
+                (position, float(score), [f"semantic similarity {score:.3f}"])
+                for position, score in zip(found.tolist(), scores.tolist())
+            ]
+
+        lexical, lexical_scores = index.lexical().search(query, positions, pool)
+        candidates = lexical
+        if len(lexical) < pool:
+            probed = vectors.probe(query_vector, positions)
+            semantic, _ = vectors.search(query_vector, probed, pool - len(lexical))
+            candidates = np.union1d(lexical, semantic).astype(np.int32)
+        similarities = vectors.similarities(query_vector, candidates)
+        order = np.argsort(-similarities, kind="stable")
+        semantic_ranking = [
+            int(candidates[i]) for i in order.tolist() if similarities[i] > 0
+        ]
+        fused = reciprocal_rank_fusion(
+            [lexical.tolist(), semantic_ranking], k=self.rrf_k
+        )
+
+        lexical_rank: Dict[int, Tuple[int, float]] = {
+            position: (rank, score)
+            for rank, (position, score) in enumerate(
+                zip(lexical.tolist(), lexical_scores.tolist()), start=1
+            )
+        }
+        semantic_rank = {
+            position: rank for rank, position in enumerate(semantic_ranking, start=1)
+        }
+        similarity_of = dict(zip(candidates.tolist(), similarities.tolist()))
+        results: List[Tuple[int, float, List[str]]] = []
+        for position, score in fused.items():
+            reasons: List[str] = []
+            if position in lexical_rank:
+                rank, bm25 = lexical_rank[position]
+                reasons.append(f"bm25 rank {rank} (score {bm25:.3f})")
+            if position in semantic_rank:
+                reasons.append(
+                    f"semantic rank {semantic_rank[position]} "
+                    f"(similarity {similarity_of[position]:.3f})"
+                )
+            results.append((position, score, reasons))
         return results
 
     # ------------------------------------------------------------------
@@ -85,20 +219,22 @@ class ToolRanker:
     # ------------------------------------------------------------------
     def _score_record(
         self,
-        record: ATDFToolRecord,
+        index: CatalogIndex,
+        position: int,
         tokens: Sequence[str],
         preferred_language: Optional[str],
+        language_mask: Optional[np.ndarray],
     ) -> Tuple[float, List[str]]:
+        record = index.records[position]
         score = 0.0
         reasons: List[str] = []
-        searchable_text = " ".join(
-            filter(None, [record.tool_id, record.description, record.when_to_use or ""])
-        ).lower()
-        tag_text = " ".join(record.tags).lower()
+        tool_id_text = index.tool_id_text[position]
+        searchable_text = index.searchable_text[position]
+        tag_text = index.tag_text[position]
 
         for token in tokens:
             token_score = 0.0
-            if token in record.tool_id.lower():
+            if token in tool_id_text:
                 token_score += 3.0
                 reasons.append(f"token '{token}' matched tool_id")
             if token in searchable_text:
@@ -109,16 +245,10 @@ class ToolRanker:
                 reasons.append(f"token '{token}' matched tag")
             score += token_score
 
-        if preferred_language:
-            preferred_language = preferred_language.lower()
-            if any(
-                lang.lower().startswith(preferred_language) for lang in record.languages
-            ):
-                score += 1.5
-                reasons.append(f"preferred language '{preferred_language}' available")
-            else:
-                score -= 1.0
-                reasons.append(f"language '{preferred_language}' not available")
+        if preferred_language and language_mask is not None:
+            score += self._language_adjustment(
+                bool(language_mask[position]), preferred_language, reasons
+            )
 
         # Minor boost for tools with explicit usage guidance
         if record.when_to_use:
@@ -129,9 +259,50 @@ class ToolRanker:
 
         return score, reasons
 
+    @staticmethod
+    def _language_adjustment(
+        available: bool, preferred_language: str, reasons: List[str]
+    ) -> float:
+        preferred_language = preferred_language.lower()
+        if available:
+            reasons.append(f"preferred language '{preferred_language}' available")
+            return 1.5
+        reasons.append(f"language '{preferred_language}' not available")
+        return -1.0
+
+    @staticmethod
+    def _feedback_adjustment(stats: dict, reasons: List[str]) -> float:
+        """Translate decayed feedback statistics into a score delta.
+
+        Older events weigh exponentially less (see ``CatalogStorage``), and a
+        tool whose recent window is dominated by failures gets an extra penalty.
+        """
+        adjustment = 0.0
+        success = int(stats.get("success", 0) or 0)
+        error = int(stats.get("error", 0) or 0)
+        success_weight = float(stats.get("success_weight", success) or 0.0)
+        error_weight = float(stats.get("error_weight", error) or 0.0)
+        if success_weight > 0:
+            adjustment += min(success_weight, 3.0) * 0.5
+            reasons.append(
+                f"historical successes: {success} (weight {success_weight:.2f})"
+            )
+        if error_weight > 0:
+            adjustment -= min(error_weight, 3.0) * 0.75
+            reasons.append(f"historical errors: {error} (weight {error_weight:.2f})")
+
+        recent_success = int(stats.get("recent_success", 0) or 0)
+        recent_error = int(stats.get("recent_error", 0) or 0)
+        if recent_error > recent_success:
+            adjustment -= 0.5
+            reasons.append(
+                f"recent errors: {recent_error} vs {recent_success} successes"
+            )
+        return adjustment
+
     @staticmethod
     def _tokenize(text: str) -> List[str]:
-        return [match.group(0).lower() for match in _TOKEN_PATTERN.finditer(text)]
+        return tokenize(text)
 
 
-__all__ = ["ToolRanker", "RankedTool"]
+__all__ = ["ToolRanker", "RankedTool", "RANKING_MODES"]
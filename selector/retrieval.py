@@ -0,0 +1,236 @@
+"""Lexical (BM25) and dense retrieval structures built over a catalog snapshot."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from sdk.core.hashing import HashingEmbedder
+from sdk.core.lexical_index import LexicalIndex, bm25_idf, index_terms, tokenize
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .catalog import ATDFToolRecord
+
+# Rows a bounded semantic probe may scan; larger matrices are split into cells.
+DEFAULT_PROBE_ROWS = 4096
+_KMEANS_ITERATIONS = 4
+_ASSIGN_CHUNK = 8192
+
+
+class Embedder(Protocol):
+    """Minimal interface expected from text embedders used by the selector."""
+
+    name: str
+    dimensions: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return one L2-normalized float32 row per text."""
+
+
+def document_text(record: ATDFToolRecord) -> str:
+    """Text indexed for a record: identifiers, descriptions, tags and localizations."""
+    parts: List[str] = [
+        record.tool_id.replace("_", " "),
+        record.description,
+        record.when_to_use or "",
+        " ".join(record.tags),
+    ]
+    localization = record.raw_descriptor.get("localization")
+    if isinstance(localization, dict):
+        for entry in localization.values():
+            if isinstance(entry, dict):
+                parts.append(str(entry.get("description") or ""))
+                parts.append(str(entry.get("when_to_use") or ""))
+    return " ".join(part for part in parts if part)
+
+
+class BM25Index(LexicalIndex):
+    """Okapi BM25 over the snapshot documents.
+
+    Postings, tokenizer (``index_terms``) and idf are the SDK's
+    :class:`~sdk.core.lexical_index.LexicalIndex`, so the selector and the SDK
+    rank lexically in exactly the same way. Snapshots never change, so each
+    queried term's postings are also frozen into arrays for dense scoring.
+    """
+
+    def __init__(
+        self, documents: Sequence[str], *, k1: float = 1.2, b: float = 0.75
+    ) -> None:
+        super().__init__(k1=k1, b=b)
+        for text in documents:
+            self.add(text)
+        self.size = len(self)
+        lengths = np.asarray(self._lengths, dtype=np.float32)
+        average = (self._total_length / self.size if self.size else 0.0) or 1.0
+        self._norms = k1 * (1.0 - b + b * lengths / average)
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray, float]] = {}
+
+    def _term_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray, float]]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            counts = self._postings.get(term)
+            if not counts:
+                return None
+            positions = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+            freqs = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            arrays = (positions, freqs, bm25_idf(len(counts), self.size))
+            self._arrays[term] = arrays
+        return arrays
+
+    def scores(self, query: str) -> np.ndarray:
+        """Dense BM25 score vector (one entry per snapshot record)."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(index_terms(query)):
+            arrays = self._term_arrays(term)
+            if arrays is None:
+                continue
+            positions, freqs, idf = arrays
+            scores[positions] += (
+                idf * freqs * (self.k1 + 1.0) / (freqs + self._norms[positions])
+            )
+        return scores
+
+    def search(  # type: ignore[override]
+        self, query: str, positions: np.ndarray, limit: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Best ``limit`` matching positions (score > 0) among ``positions``."""
+        return _top_k(positions, self.scores(query)[positions], limit)
+
+
+class VectorIndex:
+    """Contiguous matrix of normalized embeddings, one row per snapshot record.
+
+    When the matrix has more than ``probe_rows`` rows it is also split into
+    about ``sqrt(rows)`` cells with a few rounds of spherical k-means, so
+    :meth:`probe` can return a bounded set of likely neighbours without
+    scanning every row. :meth:`search` is always exact.
+    """
+
+    def __init__(
+        self,
+        documents: Sequence[str],
+        embedder: Embedder,
+        *,
+        probe_rows: int = DEFAULT_PROBE_ROWS,
+    ) -> None:
+        self.embedder = embedder
+        self.probe_rows = probe_rows
+        self.matrix = np.ascontiguousarray(
+            (
+                embedder.embed(list(documents))
+                if documents
+                else np.zeros((0, embedder.dimensions))
+            ),
+            dtype=np.float32,
+        )
+        self._centroids: Optional[np.ndarray] = None
+        self._cells: List[np.ndarray] = []
+        if self.matrix.shape[0] > probe_rows:
+            self._build_cells()
+
+    def _build_cells(self) -> None:
+        rows = self.matrix.shape[0]
+        cells = max(2, int(math.sqrt(rows)))
+        rng = np.random.default_rng(0)
+        sample = self.matrix[
+            np.sort(rng.choice(rows, size=min(rows, cells * 16), replace=False))
+        ]
+        centroids = sample[rng.choice(len(sample), size=cells, replace=False)]
+        for _ in range(_KMEANS_ITERATIONS):
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, np.argmax(sample @ centroids.T, axis=1), sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Cells left without members keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        assignment = np.concatenate(
+            [
+                np.argmax(chunk @ centroids.T, axis=1)
+                for chunk in np.array_split(
+                    self.matrix, max(1, math.ceil(rows / _ASSIGN_CHUNK))
+                )
+            ]
+        )
+        order = np.argsort(assignment, kind="stable").astype(np.int32)
+        counts = np.bincount(assignment, minlength=cells)
+        self._centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self._cells = np.split(order, np.cumsum(counts)[:-1])
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return np.asarray(self.embedder.embed([query])[0], dtype=np.float32)
+
+    def similarities(self, vector: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """Cosine similarity between ``vector`` and the rows at ``positions``."""
+        if not len(positions):
+            return np.zeros(0, dtype=np.float32)
+        if len(positions) == self.matrix.shape[0]:
+            return self.matrix @ vector
+        return self.matrix[positions] @ vector
+
+    def probe(self, vector: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """Sorted subset of ``positions`` likely to be closest to ``vector``.
+
+        Selections of at most ``probe_rows`` positions are returned whole.
+        Larger ones are reduced to the members of the cells nearest to
+        ``vector``, visited in order until about ``probe_rows`` are collected.
+        The result is a bounded candidate pool, not an exact top-k.
+        """
+        if len(positions) <= self.probe_rows or self._centroids is None:
+            return positions
+        allowed: Optional[np.ndarray] = None
+        if len(positions) != self.matrix.shape[0]:
+            allowed = np.zeros(self.matrix.shape[0], dtype=bool)
+            allowed[positions] = True
+        picked: List[np.ndarray] = []
+        collected = 0
+        for cell in np.argsort(-(self._centroids @ vector)).tolist():
+            members = self._cells[cell]
+            if allowed is not None:
+                members = members[allowed[members]]
+            picked.append(members)
+            collected += len(members)
+            if collected >= self.probe_rows:
+                break
+        return np.sort(np.concatenate(picked))
+
+    def search(
+        self, vector: np.ndarray, positions: np.ndarray, limit: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Best ``limit`` positions (similarity > 0) among ``positions``."""
+        return _top_k(positions, self.similarities(vector, positions), limit)
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[int]], k: int = 60
+) -> Dict[int, float]:
+    """Fuse ranked position lists; scores are scaled so rank 1 contributes 1.0."""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, position in enumerate(ranking, start=1):
+            fused[position] = fused.get(position, 0.0) + (k + 1) / (k + rank)
+    return fused
+
+
+def _top_k(
+    positions: np.ndarray, scores: np.ndarray, limit: Optional[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    keep = scores > 0
+    positions, scores = positions[keep], scores[keep]
+    if limit is not None and 0 < limit < len(scores):
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        positions, scores = positions[best], scores[best]
+    order = np.argsort(-scores, kind="stable")
+    return positions[order], scores[order]
+
+
+__all__ = [
+    "Embedder",
+    "HashingEmbedder",
+    "BM25Index",
+    "VectorIndex",
+    "document_text",
+    "reciprocal_rank_fusion",
+    "tokenize",
+]
@@ -1,23 +1,47 @@
 ﻿from __future__ import annotations
 
 import hashlib
-import json
 import sqlite3
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sdk.core import json_codec
+
+DEFAULT_FEEDBACK_HALF_LIFE_HOURS = 24.0 * 7
+DEFAULT_FEEDBACK_WINDOW_MINUTES = 60
+_SQLITE_TIMESTAMP = "%Y-%m-%d %H:%M:%S"
 
 
 class CatalogStorage:
-    """SQLite-backed persistence for ATDF tool catalogs."""
+    """SQLite-backed persistence for ATDF tool catalogs.
+
+    Feedback is kept twice: raw events in ``feedback`` (used for rolling-window
+    statistics and pruned by :meth:`compact_feedback`) and one exponentially
+    decayed aggregate per ``(server, tool)`` in ``feedback_stats``, updated in
+    constant time whenever an event is recorded.
+    """
 
-    def __init__(self, db_path: Path) -> None:
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        feedback_half_life_hours: float = DEFAULT_FEEDBACK_HALF_LIFE_HOURS,
+        feedback_window_minutes: int = DEFAULT_FEEDBACK_WINDOW_MINUTES,
+    ) -> None:
+        if feedback_half_life_hours <= 0:
+            raise ValueError("feedback_half_life_hours must be positive")
         self.db_path = Path(db_path)
         if not self.db_path.parent.exists():
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.feedback_half_life = feedback_half_life_hours * 3600.0
+        self.feedback_window_minutes = max(0, int(feedback_window_minutes))
         self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        self._tool_writes = 0
         self._initialize_schema()
+        self._fold_pending_feedback()
 
     # ------------------------------------------------------------------
     # Schema management
@@ -51,6 +75,7 @@ class CatalogStorage:
                 tags TEXT,
                 active INTEGER DEFAULT 1,
                 updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                revision INTEGER DEFAULT 0,
                 FOREIGN KEY(server_id) REFERENCES servers(id) ON DELETE CASCADE,
                 UNIQUE(server_id, tool_id)
             );
@@ -62,25 +87,51 @@ class CatalogStorage:
                 outcome TEXT NOT NULL CHECK(outcome IN ('success','error')),
                 detail TEXT,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                folded INTEGER DEFAULT 0,
                 FOREIGN KEY(server_id) REFERENCES servers(id) ON DELETE CASCADE
             );
 
-            CREATE TABLE IF NOT EXISTS feedback (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+            CREATE TABLE IF NOT EXISTS feedback_stats (
                 server_id INTEGER NOT NULL,
                 tool_id TEXT NOT NULL,
-                outcome TEXT NOT NULL CHECK(outcome IN ('success','error')),
-                detail TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                success_count INTEGER DEFAULT 0,
+                error_count INTEGER DEFAULT 0,
+                success_weight REAL DEFAULT 0,
+                error_weight REAL DEFAULT 0,
+                decayed_at REAL NOT NULL,
+                PRIMARY KEY (server_id, tool_id),
                 FOREIGN KEY(server_id) REFERENCES servers(id) ON DELETE CASCADE
             );
+
+            CREATE INDEX IF NOT EXISTS idx_feedback_created_at
+                ON feedback(created_at);
             """
         )
+        # Databases created before decayed aggregates existed lack the
+        # ``folded`` marker; their rows are folded on first open.
+        columns = {row["name"] for row in cur.execute("PRAGMA table_info(feedback)")}
+        if "folded" not in columns:
+            cur.execute("ALTER TABLE feedback ADD COLUMN folded INTEGER DEFAULT 0")
+        # Same for the per-row change counter read by incremental consumers;
+        # existing rows start at revision 0 and are picked up by a full diff.
+        columns = {row["name"] for row in cur.execute("PRAGMA table_info(tools)")}
+        if "revision" not in columns:
+            cur.execute("ALTER TABLE tools ADD COLUMN revision INTEGER DEFAULT 0")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tools_revision ON tools(revision)")
         self._conn.commit()
 
     def close(self) -> None:
         self._conn.close()
 
+    def revision(self) -> Tuple[int, int]:
+        """Cheap change marker for cached snapshots of the ``tools`` table.
+
+        Combines the local tool write counter with SQLite's ``data_version``,
+        which changes whenever another connection commits.
+        """
+        row = self._conn.execute("PRAGMA data_version").fetchone()
+        return self._tool_writes, int(row[0])
+
     # ------------------------------------------------------------------
     # Server helpers
     # ------------------------------------------------------------------
@@ -146,16 +197,30 @@ class CatalogStorage:
         languages: Sequence[str],
         tags: Sequence[str],
     ) -> str:
-        descriptor_json = json.dumps(descriptor, sort_keys=True, ensure_ascii=False)
+        # The hash is taken over the canonical text, which does not depend on
+        # the JSON codec in use; the other columns take the fast codec.
+        descriptor_json = json_codec.canonical_dumps(descriptor)
         version_hash = hashlib.sha256(descriptor_json.encode("utf-8")).hexdigest()
 
+        # Re-upserting an unchanged, active descriptor keeps its revision, so
+        # a catalog refresh only advances the rows that actually changed.
         self._conn.execute(
             """
             INSERT INTO tools (
                 server_id, tool_id, version_hash, descriptor,
-                description, when_to_use, languages, tags, active, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, CURRENT_TIMESTAMP)
+                description, when_to_use, languages, tags, active, updated_at,
+                revision
+            ) VALUES (
+                ?, ?, ?, ?, ?, ?, ?, ?, 1, CURRENT_TIMESTAMP,
+                (SELECT COALESCE(MAX(revision), 0) + 1 FROM tools)
+            )
             ON CONFLICT(server_id, tool_id) DO UPDATE SET
+                revision = CASE
+                    WHEN tools.active = 1
+                        AND tools.version_hash = excluded.version_hash
+                    THEN tools.revision
+                    ELSE excluded.revision
+                END,
                 version_hash = excluded.version_hash,
                 descriptor = excluded.descriptor,
                 description = excluded.description,
@@ -172,23 +237,84 @@ class CatalogStorage:
                 descriptor_json,
                 description,
                 when_to_use,
-                json.dumps(list(languages), ensure_ascii=False),
-                json.dumps(list(tags), ensure_ascii=False),
+                json_codec.dumps(list(languages)),
+                json_codec.dumps(list(tags)),
             ),
         )
         self._conn.commit()
+        self._tool_writes += 1
         return version_hash
 
     def mark_inactive(self, server_id: int, active_tool_ids: Iterable[str]) -> None:
         active_set = set(active_tool_ids)
         placeholders = ",".join("?" for _ in active_set)
         params: List[object] = [server_id]
-        query = "UPDATE tools SET active = 0 WHERE server_id = ? AND active = 1"
+        query = (
+            "UPDATE tools SET active = 0, updated_at = CURRENT_TIMESTAMP, "
+            "revision = (SELECT COALESCE(MAX(revision), 0) + 1 FROM tools) "
+            "WHERE server_id = ? AND active = 1"
+        )
         if active_set:
             query += f" AND tool_id NOT IN ({placeholders})"
             params.extend(active_set)
         self._conn.execute(query, params)
         self._conn.commit()
+        self._tool_writes += 1
+
+    def catalog_revision(self) -> int:
+        """Highest tool revision; grows with every effective tool change.
+
+        Unlike :meth:`revision` it is stored in the database, so it can be
+        persisted by consumers as a watermark for :meth:`fetch_versions`.
+        """
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(revision), 0) FROM tools"
+        ).fetchone()
+        return int(row[0])
+
+    def fetch_versions(
+        self,
+        *,
+        since_revision: Optional[int] = None,
+        server_urls: Optional[Sequence[str]] = None,
+        tool_ids: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, object]]:
+        """Version hash, state and revision of tools, without their descriptors.
+
+        Inactive rows are included so consumers can tell deactivations apart
+        from unchanged tools. With ``since_revision`` only rows changed after
+        that watermark are returned.
+        """
+        query = (
+            "SELECT t.tool_id, t.version_hash, t.active, t.revision, "
+            "s.url AS source "
+            "FROM tools t JOIN servers s ON s.id = t.server_id "
+            "WHERE 1 = 1"
+        )
+        params: List[object] = []
+        if since_revision is not None:
+            query += " AND t.revision > ?"
+            params.append(int(since_revision))
+        if server_urls:
+            placeholders = ",".join("?" for _ in server_urls)
+            query += f" AND s.url IN ({placeholders})"
+            params.extend(server_urls)
+        if tool_ids:
+            placeholders = ",".join("?" for _ in tool_ids)
+            query += f" AND t.tool_id IN ({placeholders})"
+            params.extend(tool_ids)
+        query += " ORDER BY s.url, t.tool_id"
+
+        return [
+            {
+                "tool_id": row["tool_id"],
+                "version_hash": row["version_hash"],
+                "active": bool(row["active"]),
+                "revision": int(row["revision"] or 0),
+                "source": row["source"],
+            }
+            for row in self._conn.execute(query, params)
+        ]
 
     def fetch_records(
         self,
@@ -216,9 +342,9 @@ class CatalogStorage:
         cursor = self._conn.execute(query, params)
         records: List[Dict[str, object]] = []
         for row in cursor.fetchall():
-            descriptor = json.loads(row["descriptor"])
-            languages = json.loads(row["languages"]) if row["languages"] else []
-            tags = json.loads(row["tags"]) if row["tags"] else []
+            descriptor = json_codec.loads(row["descriptor"])
+            languages = json_codec.loads(row["languages"]) if row["languages"] else []
+            tags = json_codec.loads(row["tags"]) if row["tags"] else []
             records.append(
                 {
                     "tool_id": row["tool_id"],
@@ -244,29 +370,216 @@ class CatalogStorage:
         if outcome not in {"success", "error"}:
             raise ValueError("outcome must be 'success' or 'error'")
         server_id = self.register_server(server_url)
+        now = time.time()
         self._conn.execute(
-            "INSERT INTO feedback (server_id, tool_id, outcome, detail) VALUES (?, ?, ?, ?)",
-            (server_id, tool_id, outcome, detail),
+            "INSERT INTO feedback "
+            "(server_id, tool_id, outcome, detail, created_at, folded) "
+            "VALUES (?, ?, ?, ?, ?, 1)",
+            (server_id, tool_id, outcome, detail, _format_timestamp(now)),
         )
+        self._apply_feedback_event(server_id, tool_id, outcome, now)
         self._conn.commit()
 
-    def feedback_summary(self) -> Dict[str, Dict[str, int]]:
+    def feedback_summary(self) -> Dict[str, Dict[str, float]]:
+        """Return decayed and rolling-window feedback statistics per tool.
+
+        Keys follow the catalog convention ``"<server_url>::<tool_id>"``. Each
+        entry holds lifetime counts (``success``/``error``), counts decayed to
+        the current time (``success_weight``/``error_weight``) and the counts
+        observed within the rolling window (``recent_success``/``recent_error``).
+        """
+        now = time.time()
+        summary: Dict[str, Dict[str, float]] = {}
+        cur = self._conn.execute(
+            "SELECT s.url AS server_url, f.tool_id, f.success_count, f.error_count, "
+            "       f.success_weight, f.error_weight, f.decayed_at "
+            "FROM feedback_stats f JOIN servers s ON s.id = f.server_id"
+        )
+        for row in cur.fetchall():
+            key = f"{row['server_url']}::{row['tool_id']}"
+            summary[key] = self._stats_payload(row, now)
+
+        for key, (recent_success, recent_error) in self._window_counts(now).items():
+            stats = summary.setdefault(key, self._empty_stats())
+            stats["recent_success"] = recent_success
+            stats["recent_error"] = recent_error
+        return summary
+
+    def feedback_stats(self, server_url: str, tool_id: str) -> Dict[str, float]:
+        """Return the statistics of a single ``(server, tool)`` pair."""
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT f.success_count, f.error_count, f.success_weight, "
+            "       f.error_weight, f.decayed_at "
+            "FROM feedback_stats f JOIN servers s ON s.id = f.server_id "
+            "WHERE s.url = ? AND f.tool_id = ?",
+            (server_url, tool_id),
+        ).fetchone()
+        stats = self._stats_payload(row, now) if row else self._empty_stats()
+        recent = self._window_counts(now, server_url=server_url, tool_id=tool_id)
+        recent_success, recent_error = recent.get(f"{server_url}::{tool_id}", (0, 0))
+        stats["recent_success"] = recent_success
+        stats["recent_error"] = recent_error
+        return stats
+
+    def compact_feedback(self, *, older_than: timedelta) -> Dict[str, int]:
+        """Fold pending feedback into the aggregates and prune old raw rows.
+
+        Rows newer than the rolling window are always kept so that window
+        statistics remain exact. Returns the number of folded and pruned rows.
+        """
+        window = timedelta(minutes=self.feedback_window_minutes)
+        horizon = max(older_than, window)
+        cutoff = _format_timestamp(time.time() - horizon.total_seconds())
+
+        folded = self._fold_pending_feedback(commit=False)
+        cur = self._conn.execute(
+            "DELETE FROM feedback WHERE folded = 1 AND created_at < ?", (cutoff,)
+        )
+        self._conn.commit()
+        return {"folded": folded, "pruned": int(cur.rowcount or 0)}
+
+    # ------------------------------------------------------------------
+    # Feedback internals
+    # ------------------------------------------------------------------
+    def _apply_feedback_event(
+        self, server_id: int, tool_id: str, outcome: str, event_time: float
+    ) -> None:
+        row = self._conn.execute(
+            "SELECT success_count, error_count, success_weight, error_weight, "
+            "decayed_at "
+            "FROM feedback_stats WHERE server_id = ? AND tool_id = ?",
+            (server_id, tool_id),
+        ).fetchone()
+        if row is None:
+            success_count = error_count = 0
+            success_weight = error_weight = 0.0
+            decayed_at = event_time
+        else:
+            success_count = int(row["success_count"] or 0)
+            error_count = int(row["error_count"] or 0)
+            success_weight = float(row["success_weight"] or 0.0)
+            error_weight = float(row["error_weight"] or 0.0)
+            decayed_at = float(row["decayed_at"])
+
+        if event_time >= decayed_at:
+            factor = self._decay_factor(event_time - decayed_at)
+            success_weight *= factor
+            error_weight *= factor
+            decayed_at = event_time
+            increment = 1.0
+        else:
+            # Late (folded) events only contribute their already-decayed weight.
+            increment = self._decay_factor(decayed_at - event_time)
+
+        if outcome == "success":
+            success_count += 1
+            success_weight += increment
+        else:
+            error_count += 1
+            error_weight += increment
+
+        self._conn.execute(
+            """
+            INSERT INTO feedback_stats (
+                server_id, tool_id, success_count, error_count,
+                success_weight, error_weight, decayed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(server_id, tool_id) DO UPDATE SET
+                success_count = excluded.success_count,
+                error_count = excluded.error_count,
+                success_weight = excluded.success_weight,
+                error_weight = excluded.error_weight,
+                decayed_at = excluded.decayed_at
+            """,
+            (
+                server_id,
+                tool_id,
+                success_count,
+                error_count,
+                success_weight,
+                error_weight,
+                decayed_at,
+            ),
+        )
+
+    def _fold_pending_feedback(self, *, commit: bool = True) -> int:
+        rows = self._conn.execute(
+            "SELECT id, server_id, tool_id, outcome, created_at "
+            "FROM feedback WHERE folded = 0 ORDER BY created_at, id"
+        ).fetchall()
+        for row in rows:
+            self._apply_feedback_event(
+                int(row["server_id"]),
+                row["tool_id"],
+                row["outcome"],
+                _parse_timestamp(row["created_at"]),
+            )
+        if rows:
+            self._conn.executemany(
+                "UPDATE feedback SET folded = 1 WHERE id = ?",
+                [(row["id"],) for row in rows],
+            )
+        if commit:
+            self._conn.commit()
+        return len(rows)
+
+    def _window_counts(
+        self,
+        now: float,
+        *,
+        server_url: Optional[str] = None,
+        tool_id: Optional[str] = None,
+    ) -> Dict[str, Tuple[int, int]]:
+        if not self.feedback_window_minutes:
+            return {}
+        since = _format_timestamp(now - self.feedback_window_minutes * 60)
         query = (
             "SELECT s.url AS server_url, f.tool_id, "
             "       SUM(CASE WHEN f.outcome = 'success' THEN 1 ELSE 0 END) AS success_count, "
             "       SUM(CASE WHEN f.outcome = 'error' THEN 1 ELSE 0 END) AS error_count "
             "FROM feedback f JOIN servers s ON s.id = f.server_id "
-            "GROUP BY s.url, f.tool_id"
+            "WHERE f.created_at >= ?"
         )
-        cur = self._conn.execute(query)
-        summary: Dict[str, Dict[str, int]] = {}
-        for row in cur.fetchall():
-            key = f"{row['server_url']}::{row['tool_id']}"
-            summary[key] = {
-                "success": int(row["success_count"] or 0),
-                "error": int(row["error_count"] or 0),
-            }
-        return summary
+        params: List[object] = [since]
+        if server_url is not None and tool_id is not None:
+            query += " AND s.url = ? AND f.tool_id = ?"
+            params.extend([server_url, tool_id])
+        query += " GROUP BY s.url, f.tool_id"
+        return {
+            f"{row['server_url']}::{row['tool_id']}": (
+                int(row["success_count"] or 0),
+                int(row["error_count"] or 0),
+            )
+            for row in self._conn.execute(query, params).fetchall()
+        }
+
+    def _stats_payload(self, row: sqlite3.Row, now: float) -> Dict[str, float]:
+        factor = self._decay_factor(now - float(row["decayed_at"]))
+        return {
+            "success": int(row["success_count"] or 0),
+            "error": int(row["error_count"] or 0),
+            "success_weight": float(row["success_weight"] or 0.0) * factor,
+            "error_weight": float(row["error_weight"] or 0.0) * factor,
+            "recent_success": 0,
+            "recent_error": 0,
+        }
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, float]:
+        return {
+            "success": 0,
+            "error": 0,
+            "success_weight": 0.0,
+            "error_weight": 0.0,
+            "recent_success": 0,
+            "recent_error": 0,
+        }
+
+    def _decay_factor(self, elapsed: float) -> float:
+        if elapsed <= 0:
+            return 1.0
+        return 0.5 ** (elapsed / self.feedback_half_life)
 
     # ------------------------------------------------------------------
 
@@ -275,3 +588,17 @@ class CatalogStorage:
     # ------------------------------------------------------------------
     def bootstrap_records(self) -> List[Dict[str, object]]:
         return self.fetch_records()
+
+
+def _format_timestamp(epoch: float) -> str:
+    """Format an epoch as the UTC text SQLite uses for ``CURRENT_TIMESTAMP``."""
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime(_SQLITE_TIMESTAMP)
+
+
+def _parse_timestamp(value: Optional[str]) -> float:
+    if not value:
+        return time.time()
+    parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
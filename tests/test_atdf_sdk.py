@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Pruebas unitarias de ``ATDFSDK`` y ``ATDFToolbox`` sin búsqueda vectorial.
+
+Cubren la carga e indexación por lotes del SDK, los índices por id, etiqueta
+y categoría, la carga por bloques de directorios y la búsqueda léxica de la
+caja de herramientas. El almacén vectorial se sustituye por un mock.
+
+Para ejecutar estas pruebas específicas:
+    python -m unittest tests.test_atdf_sdk
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from sdk.atdf_sdk import ATDFSDK, ATDFTool, ATDFToolbox
+from sdk.core.facets import tool_facets
+from sdk.core.utils import iter_tools_from_directory
+
+SAMPLE_TOOLS = [
+    {
+        "tool_id": "test_tool_1",
+        "description": "Una herramienta para enviar correos electrónicos",
+        "when_to_use": (
+            "Cuando necesites enviar un mensaje a alguien por correo electrónico"
+        ),
+        "metadata": {"tags": ["comunicación", "correo", "mensaje"]},
+    },
+    {
+        "tool_id": "test_tool_2",
+        "description": "Una herramienta para buscar información en internet",
+        "when_to_use": "Cuando necesites buscar información actualizada en la web",
+        "metadata": {"tags": ["búsqueda", "información", "internet"]},
+    },
+    {
+        "tool_id": "test_tool_3",
+        "description": "Una herramienta para traducir texto entre idiomas",
+        "when_to_use": "Cuando necesites traducir un texto de un idioma a otro",
+        "metadata": {"tags": ["traducción", "idioma", "lenguaje"]},
+    },
+]
+
+
+class TestATDFSDKIndexing(unittest.TestCase):
+    """Pruebas de la indexación por lotes del SDK"""
+
+    def setUp(self):
+        self.tools_dir = tempfile.mkdtemp()
+        for tool_data in SAMPLE_TOOLS:
+            path = os.path.join(self.tools_dir, f"{tool_data['tool_id']}.json")
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump(tool_data, handle)
+
+    def tearDown(self):
+        shutil.rmtree(self.tools_dir)
+
+    def _make_sdk(self, **kwargs):
+        sdk = ATDFSDK(auto_load=False, **kwargs)
+        sdk.vector_store = mock.MagicMock()
+        sdk.vector_store.search_tools_sync.return_value = []
+        return sdk
+
+    def test_directory_load_indexes_in_a_single_batch(self):
+        """Cargar un directorio hace una sola llamada a upsert_tools"""
+        sdk = self._make_sdk(index_batch_size=16)
+
+        loaded = sdk.load_tools_from_directory(self.tools_dir)
+
+        self.assertEqual(len(loaded), 3)
+        sdk.vector_store.upsert_tools_sync.assert_called_once()
+        args, kwargs = sdk.vector_store.upsert_tools_sync.call_args
+        self.assertEqual(len(args[0]), 3)
+        self.assertEqual(kwargs["batch_size"], 16)
+        sdk.vector_store.add_tool_sync.assert_not_called()
+
+    def test_lazy_indexing_defers_until_first_search(self):
+        """Con lazy_indexing la indexación ocurre en la primera búsqueda"""
+        sdk = self._make_sdk(lazy_indexing=True)
+        sdk.load_tools_from_directory(self.tools_dir)
+        sdk.vector_store.upsert_tools_sync.assert_not_called()
+
+        sdk.search_tools("enviar correo")
+        sdk.search_tools("traducir")
+
+        sdk.vector_store.upsert_tools_sync.assert_called_once()
+        self.assertEqual(sdk.vector_store.search_tools_sync.call_count, 2)
+
+    def test_lookups_use_indexes_and_replace_duplicates(self):
+        """Búsquedas por id, etiqueta y categoría sin recorrer la lista"""
+        sdk = self._make_sdk()
+        sdk.load_tools_from_directory(self.tools_dir)
+
+        self.assertEqual(sdk.get_tool_by_id("test_tool_2").id, "test_tool_2")
+        self.assertEqual(
+            [tool.id for tool in sdk.get_tools_by_tag("Internet")], ["test_tool_2"]
+        )
+        sdk.vector_store.get_tool_by_id_sync.return_value = None
+        self.assertIsNone(sdk.get_tool_by_id("missing"))
+
+        # Un id repetido reemplaza a la herramienta en su posición original
+        sdk.create_tool(
+            name="correo",
+            id="test_tool_1",
+            description="Enviar correos con adjuntos",
+            category="Comunicación",
+            tags=["correo"],
+        )
+        self.assertEqual(
+            [tool.id for tool in sdk.get_all_tools()],
+            ["test_tool_1", "test_tool_2", "test_tool_3"],
+        )
+        self.assertEqual(sdk.get_tool_by_id("test_tool_1").name, "correo")
+        self.assertEqual(sdk.get_tools_by_tag("mensaje"), [])
+        self.assertEqual(
+            [tool.id for tool in sdk.get_tools_by_category("comunicación")],
+            ["test_tool_1"],
+        )
+        self.assertEqual(
+            sdk.filter_tools(
+                lambda tool: "adjuntos" in tool.description,
+                tags=["correo", "idioma"],
+            ),
+            [sdk.get_tool_by_id("test_tool_1")],
+        )
+
+        # ``tools`` es de solo lectura: los cambios pasan por add_tool/remove_tool
+        with self.assertRaises(AttributeError):
+            sdk.tools.append(ATDFTool(id="clima", name="clima", description="x"))
+        sdk.add_tool(
+            ATDFTool(id="clima", name="clima", description="Consultar el clima")
+        )
+        self.assertEqual(sdk.get_tool_by_id("clima").name, "clima")
+
+        # Quitar una herramienta desplaza posiciones y rehace los índices
+        self.assertTrue(sdk.remove_tool("test_tool_1"))
+        self.assertFalse(sdk.remove_tool("test_tool_1"))
+        self.assertIsNone(sdk.get_tool_by_id("test_tool_1"))
+        self.assertEqual(sdk.get_tools_by_tag("correo"), [])
+        sdk.add_tool({"tool_id": "mapa", "description": "Ver un mapa", "tags": ["geo"]})
+        self.assertEqual(sdk.get_tool_by_id("mapa").description, "Ver un mapa")
+        self.assertEqual([tool.id for tool in sdk.get_tools_by_tag("geo")], ["mapa"])
+        self.assertEqual(sdk.tools[-1].id, "mapa")
+
+    def test_streaming_directory_load(self):
+        """iter_tools_from_directory entrega las herramientas según las lee"""
+        nested = os.path.join(self.tools_dir, "extra", "profundo")
+        os.makedirs(nested)
+        with open(os.path.join(nested, "clima.yaml"), "w", encoding="utf-8") as f:
+            f.write("tool_id: clima\ndescription: Consultar el clima\n")
+        with open(os.path.join(self.tools_dir, "roto.json"), "w") as f:
+            f.write("{no es json")
+
+        flat = [tool["tool_id"] for tool in iter_tools_from_directory(self.tools_dir)]
+        self.assertEqual(flat, ["test_tool_1", "test_tool_2", "test_tool_3"])
+        for workers in (0, 2):
+            stream = iter_tools_from_directory(
+                self.tools_dir, recursive=True, workers=workers
+            )
+            self.assertEqual([tool["tool_id"] for tool in stream], flat + ["clima"])
+        paths = iter_tools_from_directory(
+            self.tools_dir, recursive=True, with_paths=True
+        )
+        self.assertEqual(
+            [(path.name, tool["tool_id"]) for path, tool in paths][-1],
+            ("clima.yaml", "clima"),
+        )
+
+        # El SDK registra e indexa cada bloque antes de leer el siguiente
+        sdk = self._make_sdk()
+        chunks = sdk.iter_tools_from_directory(
+            self.tools_dir, recursive=True, chunk_size=3
+        )
+        self.assertEqual(len(next(chunks)), 3)
+        self.assertEqual(len(sdk.get_all_tools()), 3)
+        self.assertEqual(sdk.vector_store.upsert_tools_sync.call_count, 1)
+        self.assertEqual([tool.id for tool in next(chunks)], ["clima"])
+        self.assertEqual(sdk.vector_store.upsert_tools_sync.call_count, 2)
+        self.assertIsNone(next(chunks, None))
+
+
+class TestATDFToolboxSearch(unittest.TestCase):
+    """Pruebas de la búsqueda léxica de ATDFToolbox"""
+
+    def setUp(self):
+        self.toolbox = ATDFToolbox()
+        for tool_data in SAMPLE_TOOLS:
+            self.toolbox.add_tool(tool_data)
+
+    def test_lexical_search_ranks_multi_word_queries(self):
+        """La búsqueda sin vectores puntúa por términos en lugar de subcadenas"""
+
+        results = self.toolbox.find_tools_by_text(
+            "Traducción de textos a otro idioma", limit=2
+        )
+        self.assertEqual(results[0][0].tool_id, "test_tool_3")
+        self.assertGreater(results[0][1], 0.0)
+        self.assertEqual(results, sorted(results, key=lambda item: -item[1]))
+
+        # Sin coincidencias ya no se devuelven herramientas al azar
+        self.assertEqual(self.toolbox.find_tools_by_text("zzz qqq"), [])
+
+        # Las herramientas añadidas con add_tool se indexan al momento
+        self.toolbox.add_tool(
+            ATDFTool(
+                name="weather_lookup",
+                description="Consultar el clima de una ciudad",
+                tags=["meteorología"],
+            )
+        )
+        tool = self.toolbox.select_tool_for_task("meteorologia ciudades")
+        self.assertEqual(tool.name, "weather_lookup")
+
+        # Quitar una herramienta rehace el índice en la siguiente búsqueda
+        self.assertTrue(self.toolbox.remove_tool("test_tool_3"))
+        self.assertFalse(self.toolbox.remove_tool("test_tool_3"))
+        tool = self.toolbox.select_tool_for_task("meteorologia ciudades")
+        self.assertEqual(tool.name, "weather_lookup")
+        self.assertNotIn(
+            "test_tool_3",
+            [tool.tool_id for tool, _ in self.toolbox.find_tools_by_text("traducir")],
+        )
+
+
+class TestToolFacets(unittest.TestCase):
+    """Pruebas de la extracción compartida de etiquetas y categoría"""
+
+    def test_dicts_and_models_share_facets(self):
+        """Diccionarios y ATDFTool dan las mismas etiquetas y categoría"""
+        data = {
+            "tool_id": "mapa",
+            "description": "Ver un mapa",
+            "tags": ["Geo", " mapas "],
+            "metadata": {"tags": ["geo", "rutas"], "category": "Viajes"},
+        }
+        expected = (["geo", "mapas", "rutas"], "viajes")
+
+        self.assertEqual(tool_facets(data), expected)
+        self.assertEqual(tool_facets(ATDFTool(dict(data))), expected)
+        self.assertEqual(
+            tool_facets({"category": "Web", "tags": "Uno"}), (["uno"], "web")
+        )
+        self.assertEqual(tool_facets({"metadata": None}), ([], ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
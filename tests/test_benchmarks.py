@@ -0,0 +1,123 @@
+"""Smoke tests for the benchmark package (tiny sizes only)."""
+
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import (  # noqa: E402
+    ann_bench,
+    compare,
+    json_codec_bench,
+    quantization_bench,
+    relevance,
+    selector_bench,
+)
+from benchmarks.common import percentile  # noqa: E402
+from benchmarks.synthetic import iter_descriptors  # noqa: E402
+
+
+def test_synthetic_descriptors_are_deterministic():
+    first = list(iter_descriptors(20, seed=3))
+    second = list(iter_descriptors(20, seed=3))
+    assert first == second
+    assert len({item["tool_id"] for item in first}) == 20
+
+
+def test_percentile_uses_nearest_rank():
+    samples = [float(value) for value in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+
+def test_selector_benchmark_writes_comparable_json(tmp_path):
+    output = tmp_path / "selector.json"
+    exit_code = selector_bench.main(
+        [
+            "--sizes",
+            "24",
+            "--queries",
+            "4",
+            "--repeat",
+            "1",
+            "--requests",
+            "4",
+            "--skip-memory",
+            "--workdir",
+            str(tmp_path),
+            "--output",
+            str(output),
+        ]
+    )
+    assert exit_code == 0
+
+    payload = json.loads(output.read_text(encoding="utf-8"))
+    assert payload["meta"]["benchmark"] == "selector"
+    result = payload["results"][0]
+    assert result["tools_loaded"] == 24
+    assert result["rank"]["samples"] == 4
+    assert result["endpoint"]["failures"] == 0
+
+    rows = compare.compare(payload, payload, threshold=5.0)
+    assert rows and not any(row["regression"] for row in rows)
+
+
+def test_relevance_metrics_and_harness():
+    label = relevance.LabeledQuery(query="q", expected=["b", "c"])
+    assert relevance.reciprocal_rank(label, ["a", "b", "c"]) == 0.5
+    assert relevance.ndcg(label, ["b", "c"], k=5, relevant=2) == 1.0
+    assert relevance.ndcg(label, ["a"], k=5, relevant=2) == 0.0
+
+    payload = relevance.run(relevance.build_parser().parse_args(["--repeat", "1"]))
+    result = payload["results"][0]
+    assert result["mode"] == "heuristic"
+    assert result["queries"] > 0
+    assert 0.0 < result["mrr"] <= 1.0
+    assert result["latency"]["samples"] == result["queries"]
+
+
+def test_ann_benchmark_reports_exact_baseline(tmp_path):
+    args = ann_bench.build_parser().parse_args(
+        ["--sizes", "200", "--dim", "16", "--queries", "5", "--k", "5"]
+    )
+    args.workdir = str(tmp_path)
+    payload = ann_bench.run(args)
+    exact = [entry for entry in payload["results"] if entry["backend"] == "numpy"]
+    assert exact[0]["mode"] == "exact"
+    assert exact[0]["recall_at_5"] == 1.0
+    assert exact[0]["latency"]["samples"] == 5
+
+
+def test_quantization_benchmark_compares_precisions(tmp_path):
+    args = quantization_bench.build_parser().parse_args(
+        ["--sizes", "300", "--dim", "32", "--queries", "5", "--k", "5"]
+    )
+    args.workdir = str(tmp_path)
+    results = {
+        (entry["precision"], entry["config"]): entry
+        for entry in quantization_bench.run(args)["results"]
+    }
+    baseline = results[("float32", "rescore_factor=0")]
+    int8 = results[("int8", "rescore_factor=4")]
+    assert baseline["recall_at_5"] == 1.0
+    assert results[("float16", "rescore_factor=0")]["memory_bytes"] * 2 == (
+        baseline["memory_bytes"]
+    )
+    assert int8["memory_bytes"] < baseline["memory_bytes"] / 3
+    assert int8["recall_at_5"] >= 0.9
+
+
+def test_json_codec_benchmark_round_trips(tmp_path):
+    args = json_codec_bench.build_parser().parse_args(
+        ["--sizes", "30", "--repeat", "1", "--workdir", str(tmp_path)]
+    )
+    results = json_codec_bench.run(args)["results"]
+    assert {entry["operation"] for entry in results} == {
+        *json_codec_bench.OPERATIONS,
+        "canonical",
+    }
+    assert all(entry["identical"] for entry in results)
@@ -0,0 +1,162 @@
+"""Tests for time-decayed feedback aggregates in the selector storage."""
+
+import sqlite3
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from selector import storage as storage_module  # noqa: E402
+from selector.catalog import ToolCatalog  # noqa: E402
+from selector.ranker import ToolRanker  # noqa: E402
+from selector.storage import CatalogStorage  # noqa: E402
+
+SERVER = "http://localhost:8001/tools"
+HOUR = 3600.0
+
+
+class FakeClock:
+    def __init__(self, start: float = 1_700_000_000.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(storage_module.time, "time", fake)
+    return fake
+
+
+def make_descriptor(tool_id, description):
+    return {
+        "tool_id": tool_id,
+        "description": description,
+        "when_to_use": f"Use {tool_id} for tests",
+        "how_to_use": {
+            "inputs": [{"name": "text", "type": "string", "description": "Text"}],
+            "outputs": {"success": "ok", "failure": []},
+        },
+    }
+
+
+def test_feedback_weights_decay_with_half_life(tmp_path, clock):
+    storage = CatalogStorage(tmp_path / "selector.db", feedback_half_life_hours=1)
+    storage.record_feedback(server_url=SERVER, tool_id="search", outcome="error")
+    storage.record_feedback(server_url=SERVER, tool_id="search", outcome="error")
+
+    stats = storage.feedback_stats(SERVER, "search")
+    assert stats["error"] == 2
+    assert stats["error_weight"] == pytest.approx(2.0)
+
+    clock.advance(2 * HOUR)
+    stats = storage.feedback_summary()[f"{SERVER}::search"]
+    assert stats["error"] == 2
+    assert stats["error_weight"] == pytest.approx(0.5)
+    assert stats["recent_error"] == 0
+    storage.close()
+
+
+def test_rolling_window_counts_recent_events_only(tmp_path, clock):
+    storage = CatalogStorage(tmp_path / "selector.db", feedback_window_minutes=30)
+    storage.record_feedback(server_url=SERVER, tool_id="search", outcome="success")
+    clock.advance(HOUR)
+    storage.record_feedback(server_url=SERVER, tool_id="search", outcome="error")
+
+    stats = storage.feedback_stats(SERVER, "search")
+    assert stats["recent_success"] == 0
+    assert stats["recent_error"] == 1
+    assert stats["success"] == 1
+    storage.close()
+
+
+def test_legacy_rows_are_folded_on_open(tmp_path, clock):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(
+        """
+        CREATE TABLE servers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            name TEXT
+        );
+        CREATE TABLE feedback (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            server_id INTEGER NOT NULL,
+            tool_id TEXT NOT NULL,
+            outcome TEXT NOT NULL,
+            detail TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        """
+    )
+    conn.execute("INSERT INTO servers (url) VALUES (?)", (SERVER,))
+    conn.execute(
+        "INSERT INTO feedback (server_id, tool_id, outcome, created_at) "
+        "VALUES (1, 'search', 'success', ?)",
+        (storage_module._format_timestamp(clock.now - 2 * HOUR),),
+    )
+    conn.commit()
+    conn.close()
+
+    storage = CatalogStorage(db_path, feedback_half_life_hours=1)
+    stats = storage.feedback_stats(SERVER, "search")
+    assert stats["success"] == 1
+    assert stats["success_weight"] == pytest.approx(0.25)
+    storage.close()
+
+
+def test_compaction_prunes_old_rows_but_keeps_aggregates(tmp_path, clock):
+    storage = CatalogStorage(tmp_path / "selector.db", feedback_window_minutes=10)
+    for _ in range(3):
+        storage.record_feedback(server_url=SERVER, tool_id="search", outcome="error")
+    clock.advance(3 * 24 * HOUR)
+    storage.record_feedback(server_url=SERVER, tool_id="search", outcome="success")
+
+    result = storage.compact_feedback(older_than=timedelta(days=1))
+    assert result == {"folded": 0, "pruned": 3}
+
+    stats = storage.feedback_stats(SERVER, "search")
+    assert stats["error"] == 3
+    assert stats["success"] == 1
+    assert stats["recent_success"] == 1
+    storage.close()
+
+
+def test_ranker_forgets_stale_failures(tmp_path, clock):
+    storage = CatalogStorage(tmp_path / "selector.db", feedback_half_life_hours=1)
+    catalog = ToolCatalog(storage=storage)
+    server_id = storage.register_server(SERVER)
+    for tool_id in ("search_stale", "search_fresh"):
+        catalog.add_tool(
+            make_descriptor(tool_id, "Search documents"),
+            source=SERVER,
+            server_id=server_id,
+        )
+
+    for _ in range(3):
+        storage.record_feedback(
+            server_url=SERVER, tool_id="search_stale", outcome="error"
+        )
+    clock.advance(24 * HOUR)
+    for _ in range(3):
+        storage.record_feedback(
+            server_url=SERVER, tool_id="search_fresh", outcome="error"
+        )
+
+    ranked = ToolRanker(catalog).rank("search documents", top_n=2)
+    assert [item.record.tool_id for item in ranked] == [
+        "search_stale",
+        "search_fresh",
+    ]
+    storage.close()
@@ -0,0 +1,151 @@
+"""Tests for the BM25, vector and hybrid selector ranking modes."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx  # noqa: E402
+
+from selector import api  # noqa: E402
+from selector.catalog import ToolCatalog  # noqa: E402
+from selector.ranker import RANKING_MODES, ToolRanker  # noqa: E402
+from sdk.core.lexical_index import LexicalIndex  # noqa: E402
+from selector.retrieval import (  # noqa: E402
+    BM25Index,
+    HashingEmbedder,
+    VectorIndex,
+    reciprocal_rank_fusion,
+)
+
+EXAMPLES_DIR = PROJECT_ROOT / "schema" / "examples"
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    catalog = ToolCatalog()
+    catalog.load_directory(EXAMPLES_DIR)
+    return catalog
+
+
+@pytest.mark.parametrize("mode", RANKING_MODES)
+def test_every_mode_finds_the_translator(catalog, mode):
+    ranked = ToolRanker(catalog).rank(
+        "translate text between languages", top_n=3, mode=mode
+    )
+    assert ranked
+    assert ranked[0].record.tool_id == "text_translator_v1"
+
+
+def test_vector_mode_matches_inflected_localized_text(catalog):
+    ranked = ToolRanker(catalog).rank(
+        "agujero pared", top_n=2, preferred_language="es", mode="vector"
+    )
+    assert ranked[0].record.tool_id in {"hole_maker_v1", "enhanced_hole_maker_v1"}
+    assert any("semantic similarity" in reason for reason in ranked[0].reasons)
+
+
+def test_hybrid_reuses_snapshot_structures_and_filters(catalog):
+    ranker = ToolRanker(catalog, embedder=HashingEmbedder(128))
+    source = str(EXAMPLES_DIR / "paint_brush.json")
+    ranked = ranker.rank("paint brush", top_n=5, sources=[source], mode="hybrid")
+    assert [item.record.source for item in ranked] == [source]
+    assert any(reason.startswith("bm25 rank") for reason in ranked[0].reasons)
+
+    index = catalog.snapshot()
+    lexical, vectors = index.lexical(), index.vectors(ranker.embedder)
+    ranker.rank("drill a hole", mode="hybrid")
+    assert index.lexical() is lexical
+    assert index.vectors(ranker.embedder) is vectors
+
+
+@pytest.mark.parametrize("mode", ["vector", "hybrid"])
+def test_dense_modes_handle_empty_catalog_and_selection(catalog, mode):
+    assert ToolRanker(ToolCatalog()).rank("paint brush", mode=mode) == []
+    assert ToolRanker(catalog).rank("paint brush", sources=["missing"], mode=mode) == []
+
+
+def test_vectors_are_built_with_the_snapshot(catalog):
+    ranker = ToolRanker(catalog, embedder=HashingEmbedder(64))
+    index = catalog.snapshot()
+    assert ranker.embedder.name in index._vectors
+
+    fresh = ToolCatalog()
+    warmed = ToolRanker(fresh, embedder=HashingEmbedder(32))
+    fresh.load_directory(EXAMPLES_DIR)
+    assert warmed.embedder.name in fresh.snapshot()._vectors
+
+
+def test_vector_probe_is_bounded_and_finds_nearest():
+    documents = [f"tool{i} alpha{i % 97} beta{i % 13}" for i in range(600)]
+    vectors = VectorIndex(documents, HashingEmbedder(64), probe_rows=50)
+    positions = np.arange(600, dtype=np.int32)
+    query = vectors.embed_query("tool42 alpha42 beta3")
+
+    probed = vectors.probe(query, positions)
+    assert 0 < len(probed) < 200
+    assert set(probed) <= set(positions)
+    assert 42 in vectors.search(query, probed, 5)[0]
+
+    subset = positions[::2]
+    assert set(vectors.probe(query, subset)) <= set(subset)
+    small = positions[:40]
+    assert vectors.probe(query, small) is small
+
+
+def test_bm25_scores_match_the_sdk_lexical_index():
+    documents = [
+        "Enviar correos electrónicos",
+        "send_email via SMTP",
+        "Traducir un texto entre idiomas",
+        "correo",
+    ]
+    lexical = LexicalIndex()
+    for text in documents:
+        lexical.add(text)
+    bm25 = BM25Index(documents)
+
+    expected = lexical.search("correo electronico send")
+    assert [position for position, _ in expected] == [0, 1, 3]
+    scores = bm25.scores("correo electronico send")
+    for position, score in expected:
+        assert scores[position] == pytest.approx(score, rel=1e-5)
+    found, _ = bm25.search("correo electronico send", np.arange(4), 2)
+    assert found.tolist() == [0, 1]
+
+
+def test_reciprocal_rank_fusion_and_unknown_mode(catalog):
+    fused = reciprocal_rank_fusion([[1, 2], [2, 3]], k=60)
+    assert fused[2] > fused[1] > fused[3]
+    assert fused[1] == pytest.approx(1.0)
+
+    with pytest.raises(ValueError):
+        ToolRanker(catalog).rank("paint", mode="unknown")
+
+
+def test_recommend_endpoint_accepts_mode(catalog):
+    previous = (api._catalog, api._ranker)
+    api._catalog, api._ranker = catalog, ToolRanker(catalog)
+
+    async def call(payload):
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            return await client.request("POST", "/recommend", json=payload)
+
+    try:
+        response = asyncio.run(call({"query": "paint brush", "mode": "hybrid"}))
+        assert response.status_code == 200
+        assert response.json()["results"][0]["tool_id"] == "paint_brush_v1"
+
+        response = asyncio.run(call({"query": "paint brush", "mode": "bogus"}))
+        assert response.status_code == 400
+    finally:
+        api._catalog, api._ranker = previous
@@ -0,0 +1,171 @@
+"""Tests for the partitioned catalog index used by the selector ranker."""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sdk.core import json_codec  # noqa: E402
+from selector.catalog import ToolCatalog  # noqa: E402
+from selector.index import CatalogIndex  # noqa: E402
+from selector.ranker import ToolRanker  # noqa: E402
+from selector.storage import CatalogStorage  # noqa: E402
+
+
+def make_descriptor(tool_id, description, languages=None):
+    descriptor = {
+        "tool_id": tool_id,
+        "description": description,
+        "when_to_use": f"Use {tool_id} when needed",
+        "how_to_use": {
+            "inputs": [{"name": "text", "type": "string", "description": "Text"}],
+            "outputs": {"success": "ok", "failure": []},
+        },
+    }
+    if languages:
+        descriptor["schema_version"] = "2.0.0"
+        descriptor["localization"] = {
+            lang: {"description": description, "when_to_use": "When needed"}
+            for lang in languages
+        }
+    return descriptor
+
+
+def build_catalog(storage=None):
+    catalog = ToolCatalog(storage=storage)
+    entries = [
+        ("server-a", "hotel_booking", "Book a hotel room", ["en", "es"]),
+        ("server-a", "flight_booking", "Book a flight", ["en"]),
+        ("server-b", "hotel_search", "Search hotels", ["pt-BR"]),
+        ("server-b", "translator", "Translate text", None),
+    ]
+    for source, tool_id, description, languages in entries:
+        server_id = storage.register_server(source) if storage else None
+        catalog.add_tool(
+            make_descriptor(tool_id, description, languages),
+            source=source,
+            server_id=server_id,
+        )
+    return catalog
+
+
+def test_select_intersects_source_and_tool_partitions():
+    index = build_catalog().snapshot()
+
+    by_source = index.select(sources=["SERVER-B"])
+    assert [index.records[pos].tool_id for pos in by_source] == [
+        "hotel_search",
+        "translator",
+    ]
+
+    both = index.select(
+        sources=["server-a", "server-b"], tool_ids=["hotel_booking", "translator"]
+    )
+    assert [index.records[pos].tool_id for pos in both] == [
+        "hotel_booking",
+        "translator",
+    ]
+    assert len(index.select(sources=["unknown"])) == 0
+
+
+def test_language_mask_matches_prefixes():
+    index = build_catalog().snapshot()
+    tool_ids = [record.tool_id for record in index.records]
+
+    pt_mask = index.language_mask("pt")
+    assert [tool_ids[pos] for pos in pt_mask.nonzero()[0]] == ["hotel_search"]
+    assert index.language_mask("EN").sum() == 2
+
+
+def test_snapshot_is_reused_until_catalog_changes(tmp_path):
+    storage = CatalogStorage(tmp_path / "selector.db")
+    catalog = build_catalog(storage)
+
+    first = catalog.snapshot()
+    assert catalog.snapshot() is first
+    assert isinstance(first, CatalogIndex)
+
+    server_id = storage.register_server("server-c")
+    catalog.add_tool(
+        make_descriptor("weather", "Weather forecast"),
+        source="server-c",
+        server_id=server_id,
+    )
+    second = catalog.snapshot()
+    assert second is not first
+    assert len(second) == 5
+    storage.close()
+
+
+def test_ranker_only_scores_filtered_partitions():
+    catalog = build_catalog()
+    ranker = ToolRanker(catalog)
+
+    results = ranker.rank("hotel", top_n=5, sources=["server-b"])
+    assert results[0].record.tool_id == "hotel_search"
+    assert {item.record.source for item in results} == {"server-b"}
+
+    results = ranker.rank("hotel", top_n=5, preferred_language="es")
+    assert results[0].record.tool_id == "hotel_booking"
+    assert "preferred language 'es' available" in results[0].reasons
+
+
+def test_revision_feed_only_advances_on_effective_changes(tmp_path):
+    storage = CatalogStorage(tmp_path / "selector.db")
+    catalog = build_catalog(storage)
+    watermark = storage.catalog_revision()
+    assert watermark == 4
+    assert len(storage.fetch_versions()) == 4
+
+    # Reloading identical descriptors keeps every row behind the watermark
+    build_catalog(storage)
+    assert storage.catalog_revision() == watermark
+    assert storage.fetch_versions(since_revision=watermark) == []
+
+    server_id = storage.register_server("server-b")
+    catalog.add_tool(
+        make_descriptor("translator", "Translate text between languages"),
+        source="server-b",
+        server_id=server_id,
+    )
+    storage.mark_inactive(server_id, ["translator"])
+    changed = storage.fetch_versions(since_revision=watermark)
+    assert [(row["tool_id"], row["active"]) for row in changed] == [
+        ("hotel_search", False),
+        ("translator", True),
+    ]
+    assert storage.catalog_revision() == watermark + 2
+    storage.close()
+
+
+def test_version_hash_and_records_do_not_depend_on_json_codec(tmp_path):
+    descriptor = make_descriptor("translator", "Traduce textos: español ↔ english")
+    descriptor["metadata"] = {"limits": {"max_chars": 2**70, "ratio": 1e16}}
+    hashes, records = [], []
+    for name in json_codec.available_codecs():
+        previous = json_codec.set_codec(name)
+        try:
+            storage = CatalogStorage(tmp_path / f"{name}.db")
+            server_id = storage.register_server("server-a")
+            hashes.append(
+                storage.upsert_tool(
+                    server_id,
+                    "translator",
+                    descriptor,
+                    description=descriptor["description"],
+                    when_to_use=descriptor["when_to_use"],
+                    languages=["es", "en"],
+                    tags=["traducción"],
+                )
+            )
+            records.append(storage.fetch_records())
+            storage.close()
+        finally:
+            json_codec.set_codec(previous)
+
+    assert len(set(hashes)) == 1
+    assert records[0][0]["descriptor"] == descriptor
+    assert records[0][0]["tags"] == ["traducción"]
+    assert all(result == records[0] for result in records)
@@ -9,11 +9,14 @@ Para ejecutar estas pruebas específicas:
     python -m unittest tests.test_vector_search
 """
 
+import asyncio
+import copy
 import json
 import os
 import shutil
 import sys
 import tempfile
+import threading
 import unittest
 from unittest import mock
 
@@ -26,6 +29,19 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 from sdk.atdf_sdk import ATDFTool, ATDFToolbox
 from sdk.vector_search import ATDFVectorStore
 from sdk.vector_search import vector_store as vector_store_module
+from sdk.vector_search.backends import (
+    AnnIndexConfig,
+    LanceDBBackend,
+    NumpyBackend,
+    SearchFilter,
+)
+from sdk.vector_search.embedding_cache import EmbeddingCache
+from sdk.vector_search.embeddings import (
+    HashingProvider,
+    SentenceTransformerProvider,
+    TfidfSvdProvider,
+)
+from selector.retrieval import HashingEmbedder
 
 # Variable global para detectar si las dependencias están instaladas
 VECTOR_DEPENDENCIES_AVAILABLE = False
@@ -39,7 +55,9 @@ except ImportError:
 
 if not VECTOR_DEPENDENCIES_AVAILABLE:
     if getattr(vector_store_module, "lancedb", None) is None:
-        vector_store_module.lancedb = types.SimpleNamespace(connect=lambda *a, **k: None)
+        vector_store_module.lancedb = types.SimpleNamespace(
+            connect=lambda *a, **k: None
+        )
     elif not hasattr(vector_store_module.lancedb, "connect"):
         vector_store_module.lancedb.connect = lambda *a, **k: None  # type: ignore[attr-defined]
     if getattr(vector_store_module, "sentence_transformers", None) is None:
@@ -54,6 +72,19 @@ if not VECTOR_DEPENDENCIES_AVAILABLE:
     vector_store_module.VECTOR_SEARCH_AVAILABLE = True
     VECTOR_DEPENDENCIES_AVAILABLE = True
 
+
+class FakeArrowTable:
+    """Tabla Arrow mínima (``column_names`` y ``column(i).to_pylist()``)."""
+
+    def __init__(self, **columns):
+        self.columns = columns
+        self.column_names = list(columns)
+
+    def column(self, index):
+        values = self.columns[self.column_names[index]]
+        return types.SimpleNamespace(to_pylist=lambda: list(values))
+
+
 # Herramientas de ejemplo para las pruebas
 SAMPLE_TOOLS = [
     {
@@ -198,7 +229,9 @@ class TestATDFVectorStore(unittest.TestCase):
         vector_store.initialized = True
         vector_store.db = mock_db
         vector_store.embedding_dim = 4
-        vector_store._embed_text = mock.AsyncMock(return_value=self.embedding)
+        vector_store._embed_texts = mock.AsyncMock(
+            return_value=np.tile(self.embedding, (len(self.tools), 1))
+        )
 
         # Ejecutar
         result = vector_store.create_from_tools_sync(self.tools)
@@ -208,6 +241,32 @@ class TestATDFVectorStore(unittest.TestCase):
         mock_db.create_table.assert_called_once()
         # Verificar que el primer argumento es el nombre de la tabla
         self.assertEqual(mock_db.create_table.call_args[0][0], "tools")
+        self.assertEqual(len(mock_db.create_table.call_args[1]["data"]), 3)
+
+    @mock.patch("sdk.vector_search.vector_store.lancedb.connect")
+    def test_create_from_tools_encodes_in_batches(self, mock_connect):
+        """Probar que la indexación codifica por lotes e informa el progreso"""
+        mock_db = mock.MagicMock()
+        mock_connect.return_value = mock_db
+        self.mock_model_instance.encode.side_effect = lambda texts, **kwargs: np.tile(
+            self.embedding, (len(texts), 1)
+        )
+
+        vector_store = ATDFVectorStore(db_path=self.db_path, batch_size=2)
+        vector_store.initialized = True
+        vector_store.db = mock_db
+        progress = []
+
+        result = vector_store.create_from_tools_sync(
+            self.tools, progress=lambda done, total: progress.append((done, total))
+        )
+
+        self.assertTrue(result)
+        self.assertEqual(self.mock_model_instance.encode.call_count, 2)
+        self.assertEqual(progress, [(2, 3), (3, 3)])
+        mock_db.create_table.assert_called_once()
+        self.assertEqual(vector_store.last_index_stats["tools"], 3)
+        self.assertEqual(vector_store.last_index_stats["batches"], 2)
 
     @mock.patch("sdk.vector_search.vector_store.lancedb.connect")
     def test_add_tool(self, mock_connect):
@@ -240,6 +299,31 @@ class TestATDFVectorStore(unittest.TestCase):
         self.assertTrue(result)
         mock_table.add.assert_called_once()
 
+    def test_upsert_tools_uses_constant_table_operations(self):
+        """Probar que upsert_tools hace un delete y un add para todo el lote"""
+        mock_table = mock.MagicMock()
+        self.mock_model_instance.encode.side_effect = lambda texts, **kwargs: np.tile(
+            self.embedding, (len(texts), 1)
+        )
+
+        vector_store = ATDFVectorStore(db_path=self.db_path, use_cache=False)
+        vector_store.initialized = True
+        vector_store.db = mock.MagicMock()
+        vector_store.table = mock_table
+
+        duplicated = self.tools + [ATDFTool(dict(SAMPLE_TOOLS[0], description="Nueva"))]
+        count = vector_store.upsert_tools_sync(duplicated)
+
+        self.assertEqual(count, 3)
+        mock_table.delete.assert_called_once_with(
+            "parent_id IN ('test_tool_1', 'test_tool_2', 'test_tool_3')"
+        )
+        mock_table.add.assert_called_once()
+        records = mock_table.add.call_args[0][0]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]["description"], "Nueva")
+        mock_table.search.assert_not_called()
+
     @mock.patch("sdk.vector_search.vector_store.lancedb.connect")
     def test_search_tools(self, mock_connect):
         """Probar la búsqueda de herramientas"""
@@ -254,15 +338,13 @@ class TestATDFVectorStore(unittest.TestCase):
         mock_table.search.return_value = mock_search
         mock_search.limit.return_value = mock_search
         mock_search.where.return_value = mock_search
+        mock_search.select.return_value = mock_search
 
-        # Simular los resultados como un DataFrame
-        results_data = {
-            "id": ["test_tool_1", "test_tool_2"],
-            "score": [0.9, 0.7],
-            "data": [json.dumps(SAMPLE_TOOLS[0]), json.dumps(SAMPLE_TOOLS[1])],
-        }
-        mock_results = pd.DataFrame(results_data)
-        mock_search.to_df.return_value = mock_results
+        # Simular los resultados como una tabla Arrow
+        mock_search.to_arrow.return_value = FakeArrowTable(
+            raw_data=[json.dumps(SAMPLE_TOOLS[0]), json.dumps(SAMPLE_TOOLS[1])],
+            _distance=[0.2, 0.6],
+        )
 
         # Crear y configurar almacén vectorial
         vector_store = ATDFVectorStore(db_path=self.db_path)
@@ -281,9 +363,40 @@ class TestATDFVectorStore(unittest.TestCase):
         self.assertEqual(len(results), 2)
         self.assertEqual(results[0]["tool_id"], "test_tool_1")
         self.assertEqual(results[1]["tool_id"], "test_tool_2")
+        self.assertAlmostEqual(results[0]["score"], 0.9)
         mock_table.search.assert_called_once()
+        mock_search.select.assert_called_once_with(["raw_data", "parent_id", "field"])
+        mock_search.to_df.assert_not_called()
         mock_search.limit.assert_called_once_with(2)
-        mock_search.where.assert_called_once()
+        mock_search.where.assert_called_once_with(
+            "array_has_any(languages, ['es', 'und'])", prefilter=True
+        )
+
+    def test_query_embeddings_are_cached_across_apis(self):
+        """Probar que las consultas repetidas no vuelven a generar embeddings"""
+        mock_table = mock.MagicMock()
+        mock_search = mock.MagicMock()
+        mock_table.search.return_value = mock_search
+        mock_search.limit.return_value = mock_search
+        mock_search.select.return_value = mock_search
+        mock_search.to_arrow.return_value = FakeArrowTable(
+            raw_data=[json.dumps(SAMPLE_TOOLS[0])], _distance=[0.2]
+        )
+
+        vector_store = ATDFVectorStore(db_path=self.db_path, query_cache_size=8)
+        vector_store.initialized = True
+        vector_store.table = mock_table
+        vector_store._embed_text = mock.AsyncMock(return_value=self.embedding)
+
+        vector_store.search_tools_sync("Enviar  correo")
+        vector_store.search_tools_sync("enviar correo")
+        vector_store.find_best_tool_sync("ENVIAR CORREO")
+
+        vector_store._embed_text.assert_awaited_once()
+        stats = vector_store.query_cache_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["size"], 1)
+        self.assertAlmostEqual(stats["hit_rate"], 0.6667)
 
     @mock.patch("sdk.vector_search.vector_store.lancedb.connect")
     def test_find_best_tool(self, mock_connect):
@@ -325,6 +438,671 @@ class TestATDFVectorStore(unittest.TestCase):
         count = vector_store.count_tools_sync()
         self.assertEqual(count, 3)
 
+    @mock.patch("sdk.vector_search.vector_store.lancedb.connect")
+    def test_iter_tools_streams_payload_batches(self, mock_connect):
+        """Recorrer la tabla por lotes Arrow sin materializarla en pandas."""
+        mock_db = mock.MagicMock()
+        mock_connect.return_value = mock_db
+        mock_table = mock.MagicMock()
+        mock_db.open_table.return_value = mock_table
+        payloads = [json.dumps(tool) for tool in SAMPLE_TOOLS]
+        mock_table.to_lance.return_value.to_batches.return_value = iter(
+            [
+                FakeArrowTable(raw_data=payloads[:2]),
+                FakeArrowTable(raw_data=payloads[2:]),
+            ]
+        )
+
+        vector_store = ATDFVectorStore(db_path=self.db_path)
+        vector_store.initialized = True
+        vector_store.db = mock_db
+        vector_store.table = mock_table
+
+        tools = list(vector_store.iter_tools_sync())
+        self.assertEqual(
+            [tool["tool_id"] for tool in tools],
+            [tool["tool_id"] for tool in SAMPLE_TOOLS],
+        )
+        mock_table.to_lance.return_value.to_batches.assert_called_once_with(
+            columns=["raw_data"], filter="id = parent_id", batch_size=1024
+        )
+        mock_table.to_pandas.assert_not_called()
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Pruebas para la caché persistente de embeddings"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_roundtrip_persists_between_instances(self):
+        """Los vectores guardados se recuperan desde disco en otra instancia"""
+        cache = EmbeddingCache(self.test_dir, "modelo/prueba", 3)
+        vectors = np.array([[1, 0, 0], [0, 1, 0]], dtype=np.float32)
+        cache.store(["uno", "dos"], vectors)
+        cache.flush()
+
+        reopened = EmbeddingCache(self.test_dir, "modelo/prueba", 3)
+        found, missing = reopened.lookup(["dos", "tres", "uno"])
+        self.assertEqual(missing, [1])
+        np.testing.assert_array_equal(found[0], vectors[1])
+        np.testing.assert_array_equal(found[2], vectors[0])
+        self.assertEqual(reopened.stats()["hit_rate"], round(2 / 3, 4))
+
+        # Otro modelo o dimensión no comparte entradas
+        other = EmbeddingCache(self.test_dir, "otro-modelo", 3)
+        self.assertEqual(other.lookup(["uno"])[1], [0])
+
+    def test_evicts_least_recently_used_entries(self):
+        """Al superar el límite se descartan las entradas más antiguas"""
+        cache = EmbeddingCache(self.test_dir, "modelo", 2, max_entries=2)
+        cache.store(["a", "b"], np.ones((2, 2), dtype=np.float32))
+        cache.lookup(["a"])
+        cache.store(["c"], np.zeros((1, 2), dtype=np.float32))
+
+        _, missing = cache.lookup(["a", "b", "c"])
+        self.assertEqual(missing, [1])
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertGreater(stats["size_bytes"], 0)
+
+    @mock.patch(
+        "sdk.vector_search.vector_store.sentence_transformers.SentenceTransformer"
+    )
+    def test_reindexing_unchanged_tools_skips_the_model(self, mock_model):
+        """Reindexar un catálogo sin cambios no invoca al modelo"""
+        model = mock_model.return_value
+        model.get_sentence_embedding_dimension.return_value = 4
+        model.encode.side_effect = lambda texts, **kwargs: np.ones(
+            (len(texts), 4), dtype=np.float32
+        )
+        tools = [ATDFTool(tool_data) for tool_data in SAMPLE_TOOLS]
+
+        for _ in range(2):
+            vector_store = ATDFVectorStore(db_path=self.test_dir)
+            vector_store.initialized = True
+            vector_store.db = mock.MagicMock()
+            self.assertTrue(vector_store.create_from_tools_sync(tools))
+
+        self.assertEqual(model.encode.call_count, 1)
+        self.assertEqual(vector_store.embedding_cache.stats()["hits"], 3)
+
+
+class TestNumpyBackend(unittest.TestCase):
+    """Pruebas para el backend vectorial en NumPy puro"""
+
+    KEYWORDS = ("correo", "internet", "traducir", "clima")
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        # Se borra el último, después de que ``close`` guarde cada almacén
+        self.addCleanup(shutil.rmtree, self.test_dir)
+        patcher = mock.patch(
+            "sdk.vector_search.vector_store.sentence_transformers.SentenceTransformer"
+        )
+        model = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        model.get_sentence_embedding_dimension.return_value = len(self.KEYWORDS)
+        model.encode.side_effect = self._encode
+
+    def _encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        rows = [
+            [float(keyword in text.lower()) + 0.01 for keyword in self.KEYWORDS]
+            for text in ([texts] if single else texts)
+        ]
+        matrix = np.array(rows, dtype=np.float32)
+        return matrix[0] if single else matrix
+
+    def _make_store(self):
+        store = ATDFVectorStore(db_path=self.test_dir, backend="numpy")
+        self.assertTrue(store.initialize_sync())
+        return store
+
+    def test_search_persists_and_updates_without_lancedb(self):
+        """Indexa, busca, reabre desde disco, actualiza y elimina herramientas"""
+        store = self._make_store()
+        tools = [ATDFTool(tool_data) for tool_data in SAMPLE_TOOLS]
+        self.assertTrue(store.create_from_tools_sync(tools))
+
+        results = store.search_tools_sync("traducir un texto", {"limit": 2})
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["tool_id"], "test_tool_3")
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+        reopened = self._make_store()
+        self.assertEqual(reopened.count_tools_sync(), 3)
+        tool = reopened.get_tool_by_id_sync("test_tool_1")
+        self.assertEqual(tool["description"], SAMPLE_TOOLS[0]["description"])
+
+        updated = dict(SAMPLE_TOOLS[1], description="Consultar el clima actual")
+        self.assertEqual(reopened.upsert_tools_sync([updated]), 1)
+        self.assertTrue(reopened.delete_tool_sync("test_tool_3"))
+        self.assertFalse(reopened.delete_tool_sync("test_tool_3"))
+
+        best = reopened.find_best_tool_sync("clima")
+        self.assertEqual(best["tool_id"], "test_tool_2")
+        self.assertEqual(
+            sorted(item["tool_id"] for item in reopened.get_all_tools_sync()),
+            ["test_tool_1", "test_tool_2"],
+        )
+
+    def test_structured_filters_are_applied_before_top_k(self):
+        """Idioma, categoría y etiquetas se filtran antes de elegir el top-k"""
+        store = self._make_store()
+        tools = [dict(tool) for tool in SAMPLE_TOOLS]
+        tools[0].update(category="Comunicación", language="es")
+        tools[1].update(category="web", language="en")
+        tools.append(
+            dict(
+                SAMPLE_TOOLS[0],
+                id="test_tool_4",
+                tool_id="test_tool_4",
+                category="comunicación",
+            )
+        )
+        self.assertTrue(store.create_from_tools_sync(tools))
+
+        results = store.search_tools_sync(
+            "traducir", {"category": "comunicación", "limit": 2}
+        )
+        self.assertEqual(
+            sorted(item["tool_id"] for item in results), ["test_tool_1", "test_tool_4"]
+        )
+
+        results = store.search_tools_sync("correo", {"language": "en", "limit": 5})
+        self.assertNotIn("test_tool_1", [item["tool_id"] for item in results])
+        self.assertEqual(len(results), 3)  # sin idioma declarado también coinciden
+
+        results = store.search_tools_sync(
+            "correo", {"tags": ["traducción", "internet"], "limit": 1}
+        )
+        self.assertEqual(len(results), 1)
+        self.assertIn(results[0]["tool_id"], {"test_tool_2", "test_tool_3"})
+
+        clause = SearchFilter(category="Web", tags=["a'b"], where="id != 'x'").to_sql()
+        self.assertEqual(
+            clause,
+            "category IN ('web') AND array_has_any(tags, ['a''b']) AND (id != 'x')",
+        )
+
+    def test_multi_vector_matches_localized_fields(self):
+        """Cada campo e idioma tiene su vector y la búsqueda agrupa por herramienta"""
+        store = ATDFVectorStore(
+            db_path=self.test_dir, backend="numpy", multi_vector=True
+        )
+        self.addCleanup(store.close)
+        tools = [
+            {
+                "tool_id": "send_email",
+                "description": "Send an email",
+                "when_to_use": "When a message must reach someone",
+                "localization": {"es": {"description": "Enviar un correo"}},
+            },
+            {
+                "tool_id": "weather",
+                "description": "Weather forecast",
+                "localization": {
+                    "es": {"description": "Pronóstico del clima"},
+                    "pt": {"when_to_use": "Para consultar o clima"},
+                },
+            },
+        ]
+        self.assertTrue(store.create_from_tools_sync(tools))
+        self.assertEqual(store.last_index_stats["vectors"], 6)
+        self.assertEqual(store.count_tools_sync(), 2)
+
+        results = store.search_tools_sync("correo", {"limit": 5})
+        self.assertEqual(
+            [item["tool_id"] for item in results], ["send_email", "weather"]
+        )
+        self.assertGreater(results[0]["score"], 0.9)
+        best = store.find_best_tool_sync("o clima")
+        self.assertEqual(best["tool_id"], "weather")
+
+        self.assertEqual(store.upsert_tools_sync([dict(tools[0], localization={})]), 1)
+        self.assertLess(store.search_tools_sync("correo")[0]["score"], 0.9)
+        self.assertTrue(store.delete_tool_sync("weather"))
+        self.assertEqual(
+            [item["tool_id"] for item in store.get_all_tools_sync()], ["send_email"]
+        )
+
+    def test_quantized_storage_rescores_and_reopens(self):
+        """Los vectores int8 se guardan con escala por fila y se reordenan en float32"""
+        store = ATDFVectorStore(
+            db_path=self.test_dir, backend="numpy", precision="int8"
+        )
+        self.addCleanup(store.close)
+        store.create_from_tools_sync(SAMPLE_TOOLS)
+        backend = store.backend
+        self.assertEqual(backend._codes.dtype, np.int8)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.test_dir, "tools.vectors.int8.npy"))
+        )
+
+        results = store.search_tools_sync("traducir", {"limit": 1})
+        self.assertEqual(results[0]["tool_id"], "test_tool_3")
+        self.assertAlmostEqual(results[0]["score"], 1.0, places=5)
+
+        compact = ATDFVectorStore(
+            db_path=self.test_dir,
+            backend="numpy",
+            precision="float16",
+            rescore_factor=0,
+        )
+        self.addCleanup(compact.close)
+        self.assertEqual(compact.count_tools_sync(), 3)
+        self.assertIsNone(compact.backend._matrix)
+        self.assertEqual(compact.backend._codes.dtype, np.float16)
+        self.assertEqual(
+            compact.search_tools_sync("clima internet")[0]["tool_id"], "test_tool_2"
+        )
+        compact.delete_tool_sync("test_tool_2")
+        self.assertEqual(compact.count_tools_sync(), 2)
+
+        with self.assertRaises(ValueError):
+            LanceDBBackend("unused", "tools", connector=mock.Mock(), precision="int8")
+
+    def test_writes_reuse_rows_and_save_on_flush(self):
+        """Las escrituras no copian la matriz y solo flush() guarda a disco"""
+        backend = NumpyBackend(
+            self.test_dir, "bulk", precision="int8", rescore_factor=0
+        )
+        backend.connect()
+        backend.ensure_table(8)
+        rng = np.random.default_rng(0)
+
+        def record(index, version=1):
+            return {
+                "id": f"t{index}",
+                "vector": rng.standard_normal(8),
+                "raw_data": f'{{"id": "t{index}", "v": {version}}}',
+                "tags": ["mail"] if index % 2 else [],
+            }
+
+        backend.create([record(index) for index in range(8)])
+        backend.flush()
+        kept = np.array(backend._codes[[2, 3]])
+        deleted = np.array(backend._codes[0], dtype=np.float32)
+
+        with mock.patch.object(backend, "_save", wraps=backend._save) as save:
+            self.assertEqual(backend.delete_many(["t0", "otra"]), 1)
+            self.assertEqual(backend.delete_many(["t0"]), 0)
+            # Mismas filas y facetas: se sobrescribe en su sitio
+            backend.replace([record(1, version=2)])
+            self.assertEqual(backend._primary["t1"], 1)
+            backend.replace([record(8)])
+            codes = backend._codes
+            backend.replace([record(9)])
+            self.assertIs(backend._codes, codes)
+            save.assert_not_called()
+
+            self.assertEqual(backend.count(), 9)
+            self.assertEqual(json.loads(backend.get("t1"))["v"], 2)
+            self.assertIsNone(backend.get("t0"))
+            for filters in (None, SearchFilter(tags=["mail"])):
+                ids = [
+                    json.loads(row["payload"])["id"]
+                    for row in backend.search(deleted, 20, filters)
+                ]
+                self.assertNotIn("t0", ids)
+            self.assertEqual(
+                len(backend.search(deleted, 20, SearchFilter(tags=["mail"]))), 5
+            )
+
+            backend.flush()
+            backend.flush()
+        save.assert_called_once()
+        np.testing.assert_array_equal(backend._codes[1:3], kept)
+
+        reopened = NumpyBackend(self.test_dir, "bulk", precision="int8")
+        reopened.ensure_table(8)
+        self.assertEqual(reopened.count(), 9)
+        self.assertEqual(json.loads(reopened.get("t1"))["v"], 2)
+
+    def test_deletes_compact_past_the_threshold(self):
+        """Con demasiadas filas borradas la matriz se compacta sin recuantizar"""
+        backend = NumpyBackend(None, "bulk", precision="int8", rescore_factor=0)
+        backend.ensure_table(8)
+        rng = np.random.default_rng(1)
+        backend.create(
+            [
+                {"id": f"t{index}", "vector": rng.standard_normal(8), "raw_data": "{}"}
+                for index in range(5)
+            ]
+        )
+        kept = np.array(backend._codes[[1, 3]])
+        self.assertEqual(backend.delete_many(["t0", "t2", "t4"]), 3)
+        self.assertEqual(backend._dead, 0)
+        np.testing.assert_array_equal(backend._codes, kept)
+        self.assertEqual(sorted(backend.version_hashes()), ["t1", "t3"])
+
+    def test_sync_from_catalog_reembeds_only_changed_tools(self):
+        """La sincronización con el catálogo solo vectoriza los hashes nuevos"""
+        from selector.storage import CatalogStorage
+
+        storage = CatalogStorage(os.path.join(self.test_dir, "catalog.db"))
+        self.addCleanup(storage.close)
+        server_id = storage.register_server("file://tools")
+
+        def publish(tool):
+            storage.upsert_tool(
+                server_id,
+                tool["tool_id"],
+                tool,
+                description=tool["description"],
+                when_to_use=tool["when_to_use"],
+                languages=[],
+                tags=[],
+            )
+
+        tools = [copy.deepcopy(tool) for tool in SAMPLE_TOOLS]
+        for tool in tools:
+            tool.pop("id", None)
+            publish(tool)
+
+        store = ATDFVectorStore(db_path=self.test_dir, backend="numpy")
+        self.addCleanup(store.close)
+        stats = store.sync_from_catalog_sync(storage)
+        self.assertEqual((stats["upserted"], stats["deleted"]), (3, 0))
+        self.assertEqual(store.count_tools_sync(), 3)
+        # Los hashes se guardan en la tabla; los metadatos solo llevan la marca
+        hashes = store.backend.version_hashes()
+        self.assertEqual(sorted(hashes), ["test_tool_1", "test_tool_2", "test_tool_3"])
+        self.assertTrue(all(hashes.values()))
+        state = store.backend.read_metadata()["catalog_sync"]
+        self.assertEqual(sorted(state), ["servers", "synced_at", "watermark"])
+        # Una herramienta añadida fuera del catálogo no se borra al sincronizar
+        store.add_tool_sync({"tool_id": "manual", "description": "Añadida a mano"})
+        self.assertEqual(store.backend.version_hashes(["manual"]), {"manual": ""})
+        store.flush()
+
+        # Sin cambios en el catálogo no se lee ni se vectoriza nada
+        with mock.patch.object(storage, "fetch_versions") as fetch_versions:
+            stats = store.sync_from_catalog_sync(storage)
+        fetch_versions.assert_not_called()
+        self.assertEqual((stats["upserted"], stats["unchanged"]), (0, 4))
+
+        tools[1]["description"] = "Una herramienta para consultar el clima"
+        for tool in tools:
+            publish(tool)
+        storage.mark_inactive(server_id, ["test_tool_1", "test_tool_2"])
+
+        reopened = ATDFVectorStore(db_path=self.test_dir, backend="numpy")
+        self.addCleanup(reopened.close)
+        with mock.patch.object(
+            reopened, "upsert_tools", wraps=reopened.upsert_tools
+        ) as upsert:
+            stats = reopened.sync_from_catalog_sync(storage)
+        self.assertEqual(
+            [tool["tool_id"] for tool in upsert.call_args.args[0]], ["test_tool_2"]
+        )
+        self.assertEqual((stats["upserted"], stats["deleted"]), (1, 1))
+        self.assertEqual(stats["watermark"], storage.catalog_revision())
+        self.assertIsNone(reopened.get_tool_by_id_sync("test_tool_3"))
+        best = reopened.find_best_tool_sync("clima")
+        self.assertEqual(best["tool_id"], "test_tool_2")
+
+        stats = reopened.sync_from_catalog_sync(storage, full=True)
+        self.assertEqual((stats["upserted"], stats["deleted"]), (0, 0))
+        self.assertIsNotNone(reopened.get_tool_by_id_sync("manual"))
+
+    def test_sync_api_runs_on_one_background_loop(self):
+        """Los métodos *_sync reutilizan un bucle de fondo, incluso dentro de otro"""
+        store = self._make_store()
+        store.create_from_tools_sync(SAMPLE_TOOLS)
+        threads = []
+        original = store.count_tools
+
+        async def count_tools():
+            threads.append(threading.current_thread())
+            return await original()
+
+        store.count_tools = count_tools
+
+        async def caller():
+            loop = asyncio.get_running_loop()
+            self.assertEqual(store.count_tools_sync(), 3)
+            self.assertIs(asyncio.get_running_loop(), loop)
+
+        asyncio.run(caller())
+        self.assertEqual(store.count_tools_sync(), 3)
+        self.assertEqual(len(threads), 2)
+        self.assertIs(threads[0], threads[1])
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_concurrent_queries_are_encoded_in_one_batch(self):
+        """Las consultas simultáneas se codifican juntas fuera del bucle de eventos"""
+        store = ATDFVectorStore(
+            db_path=self.test_dir, backend="numpy", query_batch_window=0.05
+        )
+        self.addCleanup(store.close)
+        store.create_from_tools_sync(SAMPLE_TOOLS)
+        model = store.model
+        model.encode.reset_mock()
+        queries = ["enviar correo", "buscar en internet", "traducir", "traducir"]
+
+        async def serve():
+            return await asyncio.gather(
+                *(store.search_tools(query, {"limit": 1}) for query in queries)
+            )
+
+        results = asyncio.run(serve())
+        self.assertEqual(
+            [items[0]["tool_id"] for items in results],
+            ["test_tool_1", "test_tool_2", "test_tool_3", "test_tool_3"],
+        )
+        model.encode.assert_called_once()
+        self.assertEqual(len(model.encode.call_args.args[0]), 3)
+        self.assertEqual(store.query_batcher.queries, 4)
+
+    def test_rejects_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            ATDFVectorStore(db_path=self.test_dir, backend="faiss")
+
+
+class TestEmbeddingProviders(unittest.TestCase):
+    """Pruebas para los proveedores de embeddings ligeros"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_tfidf_provider_persists_fit_and_records_metadata(self):
+        """El ajuste TF-IDF se reutiliza al reabrir y bloquea otros proveedores"""
+        store = ATDFVectorStore(
+            db_path=self.test_dir,
+            backend="numpy",
+            embedding_provider="tfidf",
+            provider_options={"dimension": 8},
+        )
+        tools = [ATDFTool(tool_data) for tool_data in SAMPLE_TOOLS]
+        self.assertTrue(store.create_from_tools_sync(tools))
+        self.assertEqual(store.embedding_dim, 3)  # acotada por el tamaño del catálogo
+        self.assertIsNone(store.model)
+
+        reopened = ATDFVectorStore(
+            db_path=self.test_dir, backend="numpy", embedding_provider="tfidf"
+        )
+        best = reopened.find_best_tool_sync("traducir texto entre idiomas")
+        self.assertEqual(best["tool_id"], "test_tool_3")
+        self.assertEqual(reopened.embedding_name, store.embedding_name)
+        metadata = reopened.backend.read_metadata()
+        self.assertEqual(metadata["provider"], "tfidf")
+        self.assertEqual(metadata["dimension"], 3)
+
+        mismatched = ATDFVectorStore(
+            db_path=self.test_dir, backend="numpy", embedding_provider="hashing"
+        )
+        with self.assertRaises(ValueError):
+            mismatched.search_tools_sync("correo")
+
+    def test_providers_return_unit_rows(self):
+        """Los proveedores devuelven filas L2-normalizadas"""
+        texts = ["enviar un correo", "enviar correos", "traducir un texto"]
+        tfidf = TfidfSvdProvider(dimension=2)
+        with self.assertRaises(RuntimeError):
+            tfidf.encode(texts)
+        tfidf.fit(texts)
+
+        for provider in (HashingProvider(64), tfidf):
+            matrix = provider.embed(texts)
+            self.assertEqual(matrix.shape, (3, provider.dimension))
+            np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0, rtol=1e-5)
+
+        hashing = HashingProvider(256).embed(texts)
+        self.assertGreater(hashing[0] @ hashing[1], hashing[0] @ hashing[2])
+        # Mismos vectores que el embedder del selector
+        np.testing.assert_array_equal(hashing, HashingEmbedder(256).embed(texts))
+
+    def test_sentence_transformer_rows_are_normalized(self):
+        """Los vectores de sentence-transformers también se L2-normalizan"""
+        model = mock.MagicMock()
+        model.get_sentence_embedding_dimension.return_value = 2
+        model.encode.return_value = np.array([[3.0, 4.0], [0.0, 0.0]])
+        provider = SentenceTransformerProvider("modelo", lambda name: model)
+
+        matrix = provider.encode(["a", "b"])
+        self.assertEqual(matrix.dtype, np.float32)
+        np.testing.assert_allclose(matrix, [[0.6, 0.8], [0.0, 0.0]], rtol=1e-6)
+
+
+class TestAnnIndexLifecycle(unittest.TestCase):
+    """Pruebas para la gestión del índice ANN de LanceDB"""
+
+    def _backend(self, **config):
+        db = mock.MagicMock()
+        table = db.create_table.return_value
+        table.count_rows.return_value = 0
+        backend = LanceDBBackend(
+            "unused", "tools", connector=lambda path: db, ann=AnnIndexConfig(**config)
+        )
+        backend.connect()
+        return backend, table
+
+    @staticmethod
+    def _records(count, start=0):
+        return [
+            {
+                "id": f"t{index}",
+                "vector": np.ones(16, dtype=np.float32),
+                "raw_data": "{}",
+            }
+            for index in range(start, start + count)
+        ]
+
+    def test_metadata_lives_in_the_table_schema(self):
+        """Los metadatos se guardan en el esquema de la tabla, sin archivos aparte"""
+        backend, table = self._backend()
+        table.schema.metadata = {b"atdf": b'{"provider": "hashing"}'}
+        backend.db.table_names.return_value = ["tools"]
+        backend.db.open_table.return_value = table
+        self.assertEqual(backend.read_metadata(), {"provider": "hashing"})
+
+        backend.create(self._records(1))
+        backend.write_metadata({"provider": "tfidf"})
+        replace = table.to_lance.return_value.replace_schema_metadata
+        # La tabla sobrescrita por create recupera los metadatos conocidos
+        self.assertEqual(replace.call_count, 2)
+        stored = replace.call_args.args[0]["atdf"]
+        self.assertEqual(json.loads(stored), {"provider": "tfidf"})
+        self.assertEqual(backend.read_metadata(), {"provider": "tfidf"})
+        # Reescribir los mismos metadatos no crea otra versión de la tabla
+        backend.write_metadata({"provider": "tfidf"})
+        self.assertEqual(replace.call_count, 2)
+
+    def test_version_hashes_are_read_from_primary_rows(self):
+        """version_hashes lee solo las columnas parent_id y version_hash"""
+        backend, table = self._backend()
+        backend.create(self._records(1))
+        self.assertEqual(backend.version_hashes([]), {})
+        table.count_rows.return_value = 2
+        query = table.search.return_value.where.return_value
+        query.select.return_value.limit.return_value.to_arrow.return_value = (
+            FakeArrowTable(parent_id=["a", "b"], version_hash=["h1", None])
+        )
+
+        self.assertEqual(backend.version_hashes(["a", "b"]), {"a": "h1", "b": ""})
+        table.search.return_value.where.assert_called_once_with(
+            "id = parent_id AND parent_id IN ('a', 'b')"
+        )
+        query.select.assert_called_once_with(["parent_id", "version_hash"])
+        query.select.return_value.limit.assert_called_once_with(2)
+
+    def test_builds_above_threshold_and_rebuilds_after_writes(self):
+        """El índice se crea al superar el umbral y se reconstruye tras N escrituras"""
+        backend, table = self._backend(min_rows=3, rebuild_after=4, background=False)
+        backend.create(self._records(2))
+        table.create_index.assert_not_called()
+
+        table.count_rows.return_value = 3
+        backend.replace(self._records(1, start=2))
+        table.create_index.assert_called_once()
+        params = table.create_index.call_args.kwargs
+        self.assertEqual(params["index_type"], "IVF_PQ")
+        self.assertEqual(params["num_sub_vectors"], 2)
+        self.assertEqual(backend.index_status()["indexed_rows"], 3)
+
+        backend.replace(self._records(3, start=3))
+        self.assertEqual(table.create_index.call_count, 1)
+        backend.replace(self._records(1, start=6))
+        self.assertEqual(table.create_index.call_count, 2)
+        self.assertEqual(backend.index_status()["writes_since_index"], 0)
+
+    def test_background_build_and_query_parameters(self):
+        """El índice se construye en segundo plano y las consultas aceptan nprobes"""
+        backend, table = self._backend(
+            index_type="HNSW", min_rows=1, nprobes=20, background=True
+        )
+        table.count_rows.return_value = 5
+        backend.create(self._records(5))
+        backend.wait_for_index(timeout=5)
+        self.assertEqual(
+            table.create_index.call_args.kwargs["index_type"], "IVF_HNSW_SQ"
+        )
+        self.assertFalse(backend.index_status()["building"])
+
+        search = table.search.return_value.limit.return_value
+        search.nprobes.return_value = search
+        search.refine_factor.return_value = search
+        search.select.return_value = search
+        search.to_arrow.return_value = FakeArrowTable(raw_data=[], _distance=[])
+        self.assertEqual(
+            backend.search(np.ones(16, dtype=np.float32), 3, refine_factor=10), []
+        )
+        search.nprobes.assert_called_once_with(20)
+        search.refine_factor.assert_called_once_with(10)
+
+        with self.assertRaises(ValueError):
+            AnnIndexConfig(index_type="FLAT")
+
+    def test_delete_reports_whether_rows_matched(self):
+        """delete cuenta las filas antes de borrar: Table.delete devuelve None"""
+        backend, table = self._backend()
+        backend.create(self._records(1))
+        table.delete.reset_mock()
+        table.delete.return_value = None
+
+        table.count_rows.return_value = 2
+        self.assertTrue(backend.delete("t0"))
+        table.count_rows.assert_called_with("parent_id = 't0'")
+        table.delete.assert_called_once_with("parent_id = 't0'")
+
+        table.count_rows.return_value = 0
+        self.assertFalse(backend.delete("t0"))
+        table.delete.assert_called_once()
+
+        table.delete.reset_mock()
+        table.count_rows.return_value = 2
+        self.assertEqual(backend.delete_many(["t0", "t1", "t0"]), 2)
+        table.delete.assert_called_once_with("parent_id IN ('t0', 't1')")
+
 
 class TestVectorSearchIntegration(unittest.TestCase):
     """Pruebas de integración para la búsqueda vectorial con ATDFToolbox"""
@@ -394,7 +1172,9 @@ class TestVectorSearchIntegration(unittest.TestCase):
     def test_fallback_to_normal_search(self, mock_search_tools):
         """Probar que hay fallback a búsqueda normal si la vectorial falla"""
 
-        mock_search_tools.side_effect = RuntimeError("Error simulado en búsqueda vectorial")
+        mock_search_tools.side_effect = RuntimeError(
+            "Error simulado en búsqueda vectorial"
+        )
 
         # Crear vector store
         vector_store = ATDFVectorStore(db_path=self.db_path)